@@ -0,0 +1,437 @@
+"""
+单定时器的动画调度器
+
+每个控件各用一个 QPropertyAnimation 时，悬停、过渡效果一多就会有大量独立的定时器，
+各自在不同的时刻唤醒事件循环并触发重绘。AnimationScheduler 用一个与屏幕刷新率
+对齐的定时器驱动所有正在进行的补间：
+
+- 补间按经过的时间计算进度，不按帧数；事件循环繁忙时中间帧被跳过，动画时长不变
+- 每帧先推进所有补间的时间，再一次写入属性；与上次写入相同的值（例如取整后的
+  QRect）不再写入，同一轮定时器回调内的写入由 Qt 合并为一次重绘
+- 每帧的写入有全局时间预算（frame_budget_ms），超出时剩余的补间推迟到下一帧，
+  下一帧从被推迟的补间开始写入，不会一直饿死同一批控件
+- 所在窗口隐藏或最小化时补间暂停（时间不推进）；没有可运行的补间时定时器停止，
+  窗口重新显示时由事件过滤器唤醒
+
+支持的属性：geometry、pos、size、opacity（顶层窗口为 windowOpacity，
+子控件通过 QGraphicsOpacityEffect，动画回到 1.0 时移除效果），
+以及其他可以用 property() / setProperty() 读写的 Qt 属性。
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import shiboken6
+from PySide6.QtCore import (QElapsedTimer, QEasingCurve, QEvent, QObject, QPoint, QPointF, QRect, QRectF,
+                            QSize, QSizeF, Qt, QTimer, Signal)
+from PySide6.QtGui import QColor, QGuiApplication
+from PySide6.QtWidgets import QGraphicsOpacityEffect, QWidget
+
+
+# 调度器创建的透明度效果的 objectName，动画结束于完全不透明时移除
+_OPACITY_EFFECT_NAME = "animation_scheduler_opacity"
+
+
+def _lerp(start: float, end: float, t: float) -> float:
+    return start + (end - start) * t
+
+
+def interpolate(start: Any, end: Any, t: float) -> Any:
+    """按进度 t（0 到 1，缓动后可能略超出）插值"""
+    if isinstance(start, QRect):
+        return QRect(round(_lerp(start.x(), end.x(), t)), round(_lerp(start.y(), end.y(), t)),
+                     round(_lerp(start.width(), end.width(), t)), round(_lerp(start.height(), end.height(), t)))
+    if isinstance(start, QRectF):
+        return QRectF(_lerp(start.x(), end.x(), t), _lerp(start.y(), end.y(), t),
+                      _lerp(start.width(), end.width(), t), _lerp(start.height(), end.height(), t))
+    if isinstance(start, QPoint):
+        return QPoint(round(_lerp(start.x(), end.x(), t)), round(_lerp(start.y(), end.y(), t)))
+    if isinstance(start, QPointF):
+        return QPointF(_lerp(start.x(), end.x(), t), _lerp(start.y(), end.y(), t))
+    if isinstance(start, QSize):
+        return QSize(round(_lerp(start.width(), end.width(), t)), round(_lerp(start.height(), end.height(), t)))
+    if isinstance(start, QSizeF):
+        return QSizeF(_lerp(start.width(), end.width(), t), _lerp(start.height(), end.height(), t))
+    if isinstance(start, QColor):
+        channels = [min(255, max(0, round(_lerp(a, b, t))))
+                    for a, b in zip(start.getRgb(), end.getRgb())]
+        return QColor(*channels)
+    if isinstance(start, bool):
+        return end if t >= 1 else start
+    if isinstance(start, int) and isinstance(end, int):
+        return round(_lerp(start, end, t))
+    return _lerp(float(start), float(end), t)
+
+
+def _opacity(widget: QWidget) -> float:
+    if widget.isWindow():
+        return widget.windowOpacity()
+    effect = widget.graphicsEffect()
+    return effect.opacity() if isinstance(effect, QGraphicsOpacityEffect) else 1.0
+
+
+def _set_opacity(widget: QWidget, value: float):
+    if widget.isWindow():
+        widget.setWindowOpacity(value)
+        return
+    effect = widget.graphicsEffect()
+    if not isinstance(effect, QGraphicsOpacityEffect):
+        effect = QGraphicsOpacityEffect(widget)
+        effect.setObjectName(_OPACITY_EFFECT_NAME)
+        widget.setGraphicsEffect(effect)
+    effect.setOpacity(value)
+
+
+# 属性名 -> (读取, 写入)
+_ACCESSORS: Dict[str, Tuple[Callable[[Any], Any], Callable[[Any, Any], None]]] = {
+    "geometry": (lambda widget: widget.geometry(), lambda widget, value: widget.setGeometry(value)),
+    "pos": (lambda widget: widget.pos(), lambda widget, value: widget.move(value)),
+    "size": (lambda widget: widget.size(), lambda widget, value: widget.resize(value)),
+    "opacity": (_opacity, _set_opacity),
+}
+
+
+def _accessors(name: str):
+    accessors = _ACCESSORS.get(name)
+    if accessors is not None:
+        return accessors
+    return (lambda target: target.property(name), lambda target, value: target.setProperty(name, value))
+
+
+def easing_curve(easing: Union[str, QEasingCurve, QEasingCurve.Type, None]) -> QEasingCurve:
+    """缓动曲线：曲线对象、类型或类型名（例如 "OutCubic"）"""
+    if isinstance(easing, QEasingCurve):
+        return easing
+    if isinstance(easing, str):
+        easing = getattr(QEasingCurve.Type, easing, QEasingCurve.Type.OutCubic)
+    return QEasingCurve(easing if easing is not None else QEasingCurve.Type.OutCubic)
+
+
+class Tween:
+    """一个属性从 start 到 end 的补间"""
+
+    __slots__ = ("target", "name", "start", "end", "duration", "easing", "on_finished",
+                 "elapsed", "paused", "_setter", "_written")
+
+    def __init__(self, target: QObject, name: str, start: Any, end: Any, duration_ms: float,
+                 easing: QEasingCurve, on_finished: Optional[Callable[[], Any]] = None):
+        self.target = target
+        self.name = name
+        self.start = start
+        self.end = end
+        self.duration = max(0.0, float(duration_ms))
+        self.easing = easing
+        self.on_finished = on_finished
+        self.elapsed = 0.0
+        self.paused = False
+        self._setter = _accessors(name)[1]
+        self._written = None
+
+    @property
+    def finished(self) -> bool:
+        return self.elapsed >= self.duration
+
+    def value(self) -> Any:
+        if self.finished:
+            return self.end
+        return interpolate(self.start, self.end, self.easing.valueForProgress(self.elapsed / self.duration))
+
+    def write(self) -> bool:
+        """写入当前值，与上次写入的值相同时跳过，返回是否写入"""
+        value = self.value()
+        if value == self._written:
+            return False
+        self._setter(self.target, value)
+        self._written = value
+        return True
+
+
+class AnimationScheduler(QObject):
+    """
+    用一个定时器驱动所有补间。通过 animate() 启动，同一对象的同一属性
+    再次 animate() 时从当前值开始替换原来的补间（悬停进入 / 离开来回切换时平滑衔接）。
+    """
+
+    # 补间正常结束时：(对象, 属性名)
+    finished = Signal(QObject, str)
+
+    def __init__(self, parent: Optional[QObject] = None, frame_budget_ms: float = 8.0,
+                 interval_ms: Optional[int] = None):
+        super().__init__(parent)
+        self.frame_budget_ms = frame_budget_ms
+        self.interval_ms = interval_ms or self._refresh_interval()
+        self._tweens: Dict[Tuple[QObject, str], Tween] = {}
+        self._windows = set()
+        self._cursor = 0
+        self._clock = QElapsedTimer()
+        self._clock.start()
+        self._last_tick = 0
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(self.interval_ms)
+        self._timer.timeout.connect(self._tick)
+        # 统计
+        self.frames = 0
+        self.writes = 0
+        self.skipped_writes = 0
+        self.deferred = 0
+        self.dropped_frames = 0
+
+    @staticmethod
+    def _refresh_interval() -> int:
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 60.0
+        return max(1, round(1000 / (rate if rate > 0 else 60.0)))
+
+    def animate(self, target: QObject, name: str, end: Any, duration_ms: float = 250,
+                start: Any = None, easing: Union[str, QEasingCurve, QEasingCurve.Type, None] = None,
+                on_finished: Optional[Callable[[], Any]] = None) -> Tween:
+        """
+        启动补间
+
+        Args:
+            target: 对象（通常是控件）
+            name: 属性名，见模块说明
+            end: 目标值
+            duration_ms: 时长，0 表示立即写入
+            start: 起始值，默认为当前值
+            easing: 缓动曲线，默认 OutCubic
+            on_finished: 正常结束后调用（被替换或停止时不调用）
+
+        Returns:
+            Tween: 补间对象
+        """
+        if start is None:
+            start = _accessors(name)[0](target)
+        tween = Tween(target, name, start, end, duration_ms, easing_curve(easing), on_finished)
+        self._tweens[(target, name)] = tween
+        if tween.duration == 0:
+            self._finish(tween)
+            return tween
+        if isinstance(target, QWidget):
+            self._watch_window(target.window())
+        self._wake()
+        return tween
+
+    def stop(self, target: QObject, name: Optional[str] = None, jump_to_end: bool = False):
+        """停止对象的补间（name 为 None 时停止全部），jump_to_end 时直接写入目标值"""
+        for key in [key for key in self._tweens if key[0] is target and (name is None or key[1] == name)]:
+            tween = self._tweens.pop(key)
+            if jump_to_end and shiboken6.isValid(tween.target):
+                tween.elapsed = tween.duration
+                tween.write()
+
+    def stop_all(self):
+        """停止全部补间，不写入目标值"""
+        self._tweens.clear()
+        self._timer.stop()
+
+    def is_animating(self, target: QObject, name: Optional[str] = None) -> bool:
+        return any(key[0] is target and (name is None or key[1] == name) for key in self._tweens)
+
+    def active_count(self) -> int:
+        return len(self._tweens)
+
+    def set_frame_budget(self, budget_ms: float):
+        self.frame_budget_ms = budget_ms
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._tweens),
+            "paused": sum(1 for tween in self._tweens.values() if tween.paused),
+            "running": self._timer.isActive(),
+            "interval_ms": self.interval_ms,
+            "frames": self.frames,
+            "writes": self.writes,
+            "skipped_writes": self.skipped_writes,
+            "deferred": self.deferred,
+            "dropped_frames": self.dropped_frames,
+        }
+
+    def _watch_window(self, window: QWidget):
+        if window not in self._windows:
+            self._windows = {watched for watched in self._windows if shiboken6.isValid(watched)}
+            window.installEventFilter(self)
+            self._windows.add(window)
+
+    def _wake(self):
+        """有补间时启动定时器；重新启动时不把停止期间的时间计入补间"""
+        if self._tweens and not self._timer.isActive():
+            self._last_tick = self._clock.elapsed()
+            self._timer.start()
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() in (QEvent.Type.Show, QEvent.Type.WindowStateChange):
+            self._wake()
+        return False
+
+    @staticmethod
+    def _runnable(target: QObject, visibility: Dict[QWidget, bool]) -> bool:
+        if not isinstance(target, QWidget):
+            return True
+        window = target.window()
+        visible = visibility.get(window)
+        if visible is None:
+            visible = window.isVisible() and not window.isMinimized()
+            visibility[window] = visible
+        return visible
+
+    def _finish(self, tween: Tween):
+        if self._tweens.get((tween.target, tween.name)) is tween:
+            del self._tweens[(tween.target, tween.name)]
+        if tween.write():
+            self.writes += 1
+        if tween.name == "opacity" and tween.end >= 1.0 and isinstance(tween.target, QWidget):
+            effect = tween.target.graphicsEffect()
+            if effect is not None and effect.objectName() == _OPACITY_EFFECT_NAME:
+                tween.target.setGraphicsEffect(None)
+        if tween.on_finished is not None:
+            tween.on_finished()
+        self.finished.emit(tween.target, tween.name)
+
+    def _tick(self):
+        now = self._clock.elapsed()
+        elapsed = now - self._last_tick
+        self._last_tick = now
+        if elapsed > self.interval_ms * 1.5:
+            self.dropped_frames += int(elapsed // self.interval_ms) - 1
+        self.frames += 1
+
+        # 先推进所有补间的时间
+        visibility: Dict[QWidget, bool] = {}
+        running = []
+        for key, tween in list(self._tweens.items()):
+            if not shiboken6.isValid(tween.target):
+                del self._tweens[key]
+                continue
+            tween.paused = not self._runnable(tween.target, visibility)
+            if not tween.paused:
+                tween.elapsed += elapsed
+                running.append(tween)
+
+        if not running:
+            # 全部暂停：停止定时器，窗口重新显示时由 eventFilter 唤醒
+            self._timer.stop()
+            return
+
+        # 再在预算内写入，从上一帧被推迟的位置开始
+        start = time.perf_counter()
+        budget = self.frame_budget_ms / 1000
+        offset = self._cursor % len(running)
+        ordered = running[offset:] + running[:offset]
+        for index, tween in enumerate(ordered):
+            if index > 0 and time.perf_counter() - start > budget:
+                self.deferred += len(ordered) - index
+                self._cursor = offset + index
+                break
+            if tween.finished:
+                self._finish(tween)
+            elif tween.write():
+                self.writes += 1
+            else:
+                self.skipped_writes += 1
+        else:
+            self._cursor = 0
+
+        if not self._tweens:
+            self._timer.stop()
+
+
+_scheduler: Optional[AnimationScheduler] = None
+
+
+def scheduler() -> AnimationScheduler:
+    """共享的调度器，第一次使用时创建"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = AnimationScheduler()
+    return _scheduler
+
+
+def animate(target: QObject, name: str, end: Any, duration_ms: float = 250, **kwargs) -> Tween:
+    """使用共享调度器启动补间，参数见 AnimationScheduler.animate"""
+    return scheduler().animate(target, name, end, duration_ms, **kwargs)
+
+
+def animate_geometry(target: QWidget, x: int, y: int, width: int, height: int,
+                     duration_ms: int = 250, easing: str = "OutCubic") -> Tween:
+    """MoonBit 端使用：把控件的几何位置动画到 (x, y, width, height)"""
+    return animate(target, "geometry", QRect(x, y, width, height), duration_ms, easing=easing)
+
+
+def animate_opacity(target: QWidget, percent: int, duration_ms: int = 250, easing: str = "OutCubic") -> Tween:
+    """MoonBit 端使用：把控件的不透明度动画到 percent（0 到 100）"""
+    return animate(target, "opacity", max(0, min(100, percent)) / 100, duration_ms, easing=easing)
+
+
+def stop(target: QObject, jump_to_end: bool = False):
+    """停止对象的全部补间"""
+    scheduler().stop(target, None, jump_to_end)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from PySide6.QtCore import QEventLoop, QPropertyAnimation
+    from PySide6.QtWidgets import QApplication, QLabel
+
+    parser = argparse.ArgumentParser(description="AnimationScheduler 与逐控件 QPropertyAnimation 的对比")
+    parser.add_argument("--widgets", type=int, default=300, help="同时动画的控件数量")
+    parser.add_argument("--duration", type=int, default=1000, help="动画时长（毫秒）")
+    options = parser.parse_args()
+
+    app = QApplication([])
+
+    def run(mode, hidden=False):
+        """运行一轮动画，返回事件循环空闲等待期间的 CPU 时间和属性写入次数"""
+        window = QWidget()
+        window.resize(1000, 700)
+        writes = [0]
+
+        class Label(QLabel):
+            def moveEvent(self, event):
+                writes[0] += 1
+                super().moveEvent(event)
+
+        labels = []
+        for i in range(options.widgets):
+            label = Label(f"#{i}", window)
+            label.setGeometry((i * 37) % 900, (i * 23) % 600, 60, 24)
+            labels.append(label)
+        window.show()
+        app.processEvents()
+        if hidden:
+            window.hide()
+
+        animations = []
+        cpu_start = time.process_time()
+        for i, label in enumerate(labels):
+            end = QRect((i * 53) % 900, (i * 41) % 600, 90, 30)
+            if mode == "scheduler":
+                animate(label, "geometry", end, options.duration)
+            else:
+                animation = QPropertyAnimation(label, b"geometry", label)
+                animation.setDuration(options.duration)
+                animation.setEndValue(end)
+                animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+                animation.start()
+                animations.append(animation)
+
+        loop = QEventLoop()
+        QTimer.singleShot(options.duration + 100, loop.quit)
+        loop.exec()
+        result = {"cpu_ms": round((time.process_time() - cpu_start) * 1000), "moves": writes[0]}
+        if mode == "scheduler":
+            scheduler().stop_all()
+        window.close()
+        window.deleteLater()
+        return result
+
+    report = {}
+    for hidden in (False, True):
+        suffix = "_hidden" if hidden else ""
+        report["property_animation" + suffix] = run("property_animation", hidden)
+        report["scheduler" + suffix] = run("scheduler", hidden)
+    report["scheduler_stats"] = scheduler().stats()
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,343 @@
+"""
+asyncio 与 Qt 事件循环的集成
+
+Qt 事件循环作为主循环，asyncio 事件循环在同一线程中按需单步执行：
+- 有就绪回调时，下一轮 Qt 事件循环立即执行一步
+- 只有定时回调时，用 QTimer 在最近的到期时间唤醒
+- 循环空闲时在 Qt 槽函数中添加回调（set_result、Queue.put_nowait 等经
+  call_soon / call_at）会立即唤醒
+- I/O 通过 QSocketNotifier 监听 selector 自身的文件描述符
+  （epoll / kqueue），任何注册的 socket 就绪时都会唤醒；
+  call_soon_threadsafe 写入的自管道也由此唤醒
+
+PySide6.QtAsyncio 可用时（PySide6 6.9 需要 Python 3.12+）同样可以使用，
+这里的实现不依赖它，只依赖标准库 asyncio。
+
+用法：
+    app = QApplication(sys.argv)
+    ...
+    sys.exit(exec_async(app))
+
+槽函数可以是协程函数：
+    button.clicked.connect(async_slot(on_click))
+"""
+
+import asyncio
+import functools
+import math
+from typing import Any, Awaitable, Callable, Optional, Set
+
+from PySide6.QtCore import QObject, QSocketNotifier, QTimer
+from PySide6.QtWidgets import QApplication
+
+
+class QtAsyncioBridge(QObject):
+    # 没有 selector 文件描述符可监听时（例如 Windows Proactor），轮询 I/O 的间隔
+    POLL_INTERVAL_MS = 10
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, parent: QObject = None):
+        super().__init__(parent)
+        self.loop = loop or asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.tasks: Set[asyncio.Task] = set()
+        self.steps = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._step)
+
+        # Qt 槽函数中 set_result、Queue.put_nowait、Event.set 等经 call_soon / call_at
+        # 向循环添加回调；循环没有运行时需要唤醒，否则定时器已停止的循环不会再执行
+        self._call_soon = self.loop.call_soon
+        self._hook("call_soon")
+        self._hook("call_at")
+
+        self._notifier = None
+        selector = getattr(self.loop, "_selector", None)
+        fileno = getattr(selector, "fileno", None)
+        if fileno is not None:
+            try:
+                fd = fileno()
+            except (OSError, ValueError):
+                fd = -1
+            if fd >= 0:
+                self._notifier = QSocketNotifier(fd, QSocketNotifier.Type.Read, self)
+                self._notifier.activated.connect(self._step)
+
+        self.wake()
+
+    def _hook(self, name: str):
+        """包装循环的 name 方法：在循环之外调用时唤醒桥接"""
+        original = getattr(self.loop, name)
+
+        @functools.wraps(original)
+        def hooked(*args, **kwargs):
+            handle = original(*args, **kwargs)
+            if not self.loop.is_running():
+                self.wake()
+            return handle
+
+        setattr(self.loop, name, hooked)
+
+    def wake(self):
+        """在下一轮 Qt 事件循环中执行一步 asyncio"""
+        if not self.loop.is_closed():
+            self._timer.start(0)
+
+    def _step(self, *_):
+        loop = self.loop
+        if loop.is_closed():
+            return
+        if loop.is_running():
+            # 协程中同步调用了会处理事件的 Qt 函数（例如模态对话框）：
+            # 稍后再试，不能丢掉这一步
+            self._timer.start(self.POLL_INTERVAL_MS)
+            return
+        # 先安排 stop，run_forever 只执行一轮：就绪回调 + 一次 0 超时的 select
+        # （用原始的 call_soon，避免再次唤醒）
+        self._call_soon(loop.stop)
+        loop.run_forever()
+        self.steps += 1
+        self._schedule()
+
+    def _schedule(self):
+        loop = self.loop
+        if loop.is_closed():
+            return
+        # 读取 BaseEventLoop 的就绪队列和定时堆，决定下一次唤醒的时间
+        if loop._ready:
+            self._timer.start(0)
+            return
+        interval = None
+        scheduled = loop._scheduled
+        if scheduled:
+            delay = max(0.0, scheduled[0].when() - loop.time())
+            interval = math.ceil(delay * 1000)
+        if self._notifier is None:
+            interval = self.POLL_INTERVAL_MS if interval is None else min(interval, self.POLL_INTERVAL_MS)
+        if interval is not None:
+            self._timer.start(interval)
+        else:
+            self._timer.stop()
+
+    def create_task(self, coro: Awaitable) -> asyncio.Task:
+        """
+        在集成的循环中调度协程。
+
+        任务在完成前保持强引用；未处理的异常交给循环的异常处理器。
+        """
+        task = self.loop.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self._task_done)
+        self.wake()
+        return task
+
+    def _task_done(self, task: asyncio.Task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.loop.call_exception_handler({
+                "message": "异步槽函数中未处理的异常",
+                "exception": task.exception(),
+                "task": task,
+            })
+
+    def close(self):
+        """取消未完成的任务并关闭 asyncio 循环"""
+        self._timer.stop()
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+        loop = self.loop
+        if loop.is_closed():
+            return
+        pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+        if _bridge is self:
+            _set_bridge(None)
+
+
+_bridge: Optional[QtAsyncioBridge] = None
+
+
+def _set_bridge(bridge: Optional[QtAsyncioBridge]):
+    global _bridge
+    _bridge = bridge
+
+
+def install(app: Optional[QApplication] = None) -> QtAsyncioBridge:
+    """为 QApplication 安装 asyncio 集成（重复调用返回同一个桥接对象）"""
+    if _bridge is None:
+        app = app or QApplication.instance()
+        _set_bridge(QtAsyncioBridge(parent=app))
+    return _bridge
+
+
+def create_task(coro: Awaitable) -> asyncio.Task:
+    """在集成的循环中调度协程，必要时先安装集成"""
+    return install().create_task(coro)
+
+
+def async_slot(func: Callable[..., Awaitable]) -> Callable[..., asyncio.Task]:
+    """
+    把协程函数包装成普通槽函数，每次信号触发时创建一个任务。
+
+    信号的参数原样传给协程函数。
+    """
+    @functools.wraps(func)
+    def slot(*args: Any) -> asyncio.Task:
+        return create_task(func(*args))
+    return slot
+
+
+def connect_async(signal: Any, func: Callable[..., Awaitable]):
+    """把信号连接到协程函数"""
+    signal.connect(async_slot(func))
+
+
+def exec_async(app: Optional[QApplication] = None, main: Optional[Awaitable] = None) -> int:
+    """
+    代替 app.exec() 运行集成的事件循环。
+
+    main 是可选的启动协程。事件循环退出后取消未完成的任务并关闭 asyncio 循环，
+    返回 app.exec() 的退出码。
+    """
+    app = app or QApplication.instance()
+    bridge = install(app)
+    if main is not None:
+        bridge.create_task(main)
+    try:
+        return app.exec()
+    finally:
+        bridge.close()
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def benchmark(coroutines: int = 1000, duration: float = 3.0, probe_ms: int = 5) -> dict:
+    """
+    测量 Qt 事件分发延迟：每隔 probe_ms 投递一个 0 间隔的 QTimer，
+    记录从投递到回调执行的时间，同时有 coroutines 个协程在做
+    asyncio.sleep 轮询（模拟轮询本地服务）。
+
+    返回延迟统计（毫秒）和 asyncio 单步次数。
+    """
+    import random
+    import time
+
+    app = QApplication.instance() or QApplication([])
+    bridge = install(app)
+    latencies = []
+    polls = 0
+    stop = False
+
+    async def poller(seed):
+        nonlocal polls
+        rng = random.Random(seed)
+        while not stop:
+            await asyncio.sleep(rng.uniform(0.001, 0.02))
+            polls += 1
+
+    def probe():
+        posted = time.perf_counter()
+        QTimer.singleShot(0, lambda: latencies.append((time.perf_counter() - posted) * 1000))
+
+    async def main():
+        nonlocal stop
+        tasks = [asyncio.ensure_future(poller(i)) for i in range(coroutines)]
+        await asyncio.sleep(duration)
+        stop = True
+        await asyncio.gather(*tasks)
+        app.quit()
+
+    probe_timer = QTimer()
+    probe_timer.timeout.connect(probe)
+    probe_timer.start(probe_ms)
+    bridge.create_task(main())
+    steps_before = bridge.steps
+    app.exec()
+    probe_timer.stop()
+
+    return {
+        "coroutines": coroutines,
+        "duration_s": duration,
+        "samples": len(latencies),
+        "polls": polls,
+        "asyncio_steps": bridge.steps - steps_before,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 0.50), 3),
+            "p95": round(_percentile(latencies, 0.95), 3),
+            "p99": round(_percentile(latencies, 0.99), 3),
+            "max": round(max(latencies, default=0.0), 3),
+        },
+    }
+
+
+def self_check(timeout: float = 1.5) -> dict:
+    """
+    自检：Qt 槽函数中 set_result / put_nowait 之后，等待它们的协程必须被唤醒
+    （此时循环空闲、桥接的定时器已经停止）。
+
+    返回各项检查是否通过。
+    """
+    app = QApplication.instance() or QApplication([])
+    bridge = install(app)
+    loop = bridge.loop
+    future = loop.create_future()
+    queue: asyncio.Queue = asyncio.Queue()
+    results = {}
+
+    async def wait_future():
+        results["future_set_result_from_slot"] = await future == "ok"
+
+    async def wait_queue():
+        results["queue_put_nowait_from_slot"] = await queue.get() == "ok"
+
+    async def main():
+        await asyncio.gather(wait_future(), wait_queue())
+        app.quit()
+
+    bridge.create_task(main())
+    QTimer.singleShot(50, lambda: future.set_result("ok"))
+    QTimer.singleShot(80, lambda: queue.put_nowait("ok"))
+    deadline = QTimer()
+    deadline.setSingleShot(True)
+    deadline.timeout.connect(app.quit)
+    deadline.start(int(timeout * 1000))
+    app.exec()
+    deadline.stop()
+    for name in ("future_set_result_from_slot", "queue_put_nowait_from_slot"):
+        results.setdefault(name, False)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="asyncio 集成下的 Qt 事件分发延迟测试")
+    parser.add_argument("--coroutines", type=int, default=1000, help="并发协程数量")
+    parser.add_argument("--duration", type=float, default=3.0, help="测试时长（秒）")
+    parser.add_argument("--probe-ms", type=int, default=5, help="探测间隔（毫秒）")
+    parser.add_argument("--check", action="store_true", help="只运行自检")
+    options = parser.parse_args()
+
+    app = QApplication([])
+    checks = self_check()
+    if options.check:
+        print(json.dumps(checks, ensure_ascii=False, indent=2))
+        raise SystemExit(0 if all(checks.values()) else 1)
+    if not all(checks.values()):
+        raise SystemExit(f"自检失败：{checks}")
+    baseline = benchmark(0, options.duration, options.probe_ms)
+    loaded = benchmark(options.coroutines, options.duration, options.probe_ms)
+    print(json.dumps({"baseline": baseline, "loaded": loaded}, ensure_ascii=False, indent=2))
@@ -0,0 +1,75 @@
+"""
+批量命令执行器
+
+MoonBit 端在 batch_begin() / batch_end() 之间不再逐个调用 Python 方法，
+而是把命令追加到一个扁平列表中：
+
+    [方法名, 参数元组, 方法名, 参数元组, ...]
+
+参数元组的第 0 项为对象本身（与批量模式之外调用未绑定方法时的参数相同），
+然后通过 execute() 一次跨越 FFI 执行全部命令。方法按 (类型, 方法名)
+缓存为未绑定的函数（与 widget_factory 共用方法表），同一类控件的
+重复调用不再重复查找属性。
+"""
+
+from typing import Any, Callable, List, Optional, Tuple
+
+from widget_factory import MethodTable, factory
+
+
+class BatchExecutor:
+    # 最多保留的错误记录条数
+    MAX_ERRORS = 100
+
+    def __init__(self, methods: Optional[MethodTable] = None):
+        self.methods = factory.methods if methods is None else methods
+        self.errors: List[Tuple[int, str, str]] = []
+
+    def _method(self, target: Any, name: str) -> Callable:
+        """查找未绑定的方法，调用时把对象作为第一个参数传入。"""
+        return self.methods.method(target, name)
+
+    def execute(self, ops: List[Any]) -> int:
+        """
+        按顺序执行扁平命令列表。
+
+        单条命令失败不会中断后续命令，错误记录在 errors 中
+        （命令序号、方法名、异常描述）。
+
+        返回失败的命令数量。
+        """
+        self.errors.clear()
+        failed = 0
+        for index in range(0, len(ops) - 1, 2):
+            name, args = ops[index], ops[index + 1]
+            try:
+                self._method(args[0], name)(*args)
+            except Exception as e:
+                failed += 1
+                if len(self.errors) < self.MAX_ERRORS:
+                    self.errors.append((index // 2, name, repr(e)))
+        return failed
+
+    def execute_ops(self, ops: List[Tuple[Any, str, Tuple]]) -> int:
+        """
+        执行 (对象, 方法名, 参数元组) 形式的命令列表，供 Python 端使用。
+
+        返回失败的命令数量。
+        """
+        flat: List[Any] = []
+        for target, name, args in ops:
+            flat += (name, (target, *args))
+        return self.execute(flat)
+
+    def clear_cache(self):
+        """清空方法缓存"""
+        self.methods.clear()
+
+
+# 进程级共享的执行器，MoonBit 端通过模块函数 execute 调用
+executor = BatchExecutor()
+
+
+def execute(ops: List[Any]) -> int:
+    """执行扁平命令列表，返回失败的命令数量。"""
+    return executor.execute(ops)
@@ -0,0 +1,357 @@
+"""
+事件循环卡顿监视器
+
+三个部分：
+- 高频探测定时器：每 PROBE_INTERVAL_MS 触发一次，实际间隔超出名义间隔的部分
+  即事件循环的延迟，按桶统计直方图
+- 槽函数计时：wrap() / connect() 包装槽函数（SignalSlotManager 中创建的
+  lambda 也经过这里），记录每个槽的调用次数、总耗时和最长耗时
+- 卡顿采样：后台看门狗线程发现 GUI 线程超过阈值没有响应时，
+  抓取 GUI 线程当前的 Python 调用栈；超过阈值的槽调用和事件循环延迟
+  都会附带卡顿期间的调用栈
+
+统计结果可以导出为 JSON 或文本指标文件（Prometheus 文本格式）。
+
+通过环境变量启用：
+    MOONBIT_GUI_LAG=1                 退出时把文本报告输出到 stderr
+    MOONBIT_GUI_LAG=lag.json          定期写入 JSON
+    MOONBIT_GUI_LAG=lag.prom          定期写入文本指标文件
+    MOONBIT_GUI_LAG_THRESHOLD_MS=50   视为卡顿的阈值（毫秒）
+    MOONBIT_GUI_LAG_EXPORT_S=60       写入文件的间隔（秒）
+
+槽函数在连接时包装，监视器应该在构建界面之前安装。
+"""
+
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject, Qt, QTimer
+from PySide6.QtWidgets import QApplication
+
+
+LAG_ENV = "MOONBIT_GUI_LAG"
+THRESHOLD_ENV = "MOONBIT_GUI_LAG_THRESHOLD_MS"
+EXPORT_ENV = "MOONBIT_GUI_LAG_EXPORT_S"
+
+# 直方图的桶上限（毫秒），最后一个桶为 +Inf
+BUCKETS_MS = (1, 2, 4, 8, 16, 33, 50, 100, 250, 500, 1000, 2500)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value_ms: float):
+        index = 0
+        for index, bound in enumerate(BUCKETS_MS):
+            if value_ms <= bound:
+                break
+        else:
+            index = len(BUCKETS_MS)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, fraction: float) -> float:
+        """按桶上限估计的分位数"""
+        if self.count == 0:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= target:
+                return float(min(bound, self.max))
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "max_ms": round(self.max, 3),
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "buckets": {str(bound): count for bound, count in zip(BUCKETS_MS + ("+Inf",), self.counts)},
+        }
+
+
+def _positional_arity(func: Callable) -> Optional[int]:
+    """
+    槽函数接受的位置参数个数，None 表示不限。
+
+    PySide6 会按槽函数的参数个数截断信号参数（例如把 clicked(bool) 连接到
+    无参数的 lambda），包装之后需要自己截断。
+    """
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    count = 0
+    for parameter in parameters:
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            return None
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+            count += 1
+    return count
+
+
+class LagMonitor(QObject):
+    # 探测定时器的名义间隔（毫秒）
+    PROBE_INTERVAL_MS = 5
+    # 保留的卡顿记录条数
+    MAX_EVENTS = 100
+
+    def __init__(self, threshold_ms: float = 50.0, report_path: Optional[str] = None,
+                 export_interval_s: float = 60.0, parent: QObject = None):
+        """
+        Args:
+            threshold_ms: 超过这个时长的槽调用和事件循环延迟记为卡顿
+            report_path: 导出路径（.json 为 JSON，其他为文本指标），None 表示退出时输出到 stderr
+            export_interval_s: 定期写入 report_path 的间隔，0 表示只在退出时写入
+        """
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.report_path = report_path
+        self.lag = Histogram()
+        self.slots: Dict[str, Histogram] = {}
+        self.slow_events = deque(maxlen=self.MAX_EVENTS)
+        self.started_at = time.time()
+
+        self._gui_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._sample = None          # (采样时间, 调用栈)
+        self._watchdog = None
+        self._running = False
+        self._finished = False
+
+        self._probe = QTimer(self)
+        self._probe.setTimerType(Qt.TimerType.PreciseTimer)
+        self._probe.setInterval(self.PROBE_INTERVAL_MS)
+        self._probe.timeout.connect(self._on_probe)
+
+        self._exporter = QTimer(self)
+        self._exporter.setInterval(int(export_interval_s * 1000))
+        self._exporter.timeout.connect(self.export)
+        self._export_enabled = report_path is not None and export_interval_s > 0
+
+    @classmethod
+    def from_environ(cls, environ=None, parent: QObject = None) -> Optional["LagMonitor"]:
+        """根据环境变量创建监视器，未启用时返回 None"""
+        environ = os.environ if environ is None else environ
+        value = environ.get(LAG_ENV, "").strip()
+        if value.lower() in ("", "0", "false", "no", "off"):
+            return None
+        report_path = None if value.lower() in ("1", "true", "yes", "on", "-") else value
+        threshold = float(environ.get(THRESHOLD_ENV, "") or 50)
+        export_interval = float(environ.get(EXPORT_ENV, "") or 60)
+        return cls(threshold, report_path, export_interval, parent)
+
+    def start(self):
+        """开始探测，并启动看门狗线程（必须在 GUI 线程中调用）"""
+        if self._running:
+            return
+        self._running = True
+        self._gui_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._probe.start()
+        if self._export_enabled:
+            self._exporter.start()
+        self._watchdog = threading.Thread(target=self._watch, name="lag-monitor", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._running = False
+        self._probe.stop()
+        self._exporter.stop()
+
+    def _on_probe(self):
+        now = time.perf_counter()
+        elapsed_ms = (now - self._heartbeat) * 1000
+        self._heartbeat = now
+        lag_ms = max(0.0, elapsed_ms - self.PROBE_INTERVAL_MS)
+        self.lag.add(lag_ms)
+        if lag_ms >= self.threshold_ms:
+            self._record("event_loop", lag_ms, now - elapsed_ms / 1000, now)
+
+    def _watch(self):
+        """看门狗：GUI 线程超过阈值没有心跳时抓取一次它的调用栈"""
+        threshold = self.threshold_ms / 1000
+        poll = max(0.005, threshold / 4)
+        sampled_heartbeat = None
+        while self._running:
+            time.sleep(poll)
+            heartbeat = self._heartbeat
+            if heartbeat == sampled_heartbeat or time.perf_counter() - heartbeat < threshold:
+                continue
+            frame = sys._current_frames().get(self._gui_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame, limit=30)
+            del frame
+            self._sample = (time.perf_counter(), "".join(stack))
+            sampled_heartbeat = heartbeat
+
+    def _record(self, name: str, duration_ms: float, start: float, end: float):
+        sample = self._sample
+        stack = sample[1] if sample is not None and start <= sample[0] <= end else None
+        self.slow_events.append({
+            "time": round(time.time(), 3),
+            "source": name,
+            "duration_ms": round(duration_ms, 3),
+            "stack": stack,
+        })
+
+    def wrap(self, slot: Callable, name: Optional[str] = None) -> Callable:
+        """包装槽函数，记录每次调用的耗时"""
+        name = name or getattr(slot, "__qualname__", None) or repr(slot)
+        histogram = self.slots.setdefault(name, Histogram())
+        arity = _positional_arity(slot)
+        threshold = self.threshold_ms
+
+        @functools.wraps(slot)
+        def timed(*args):
+            if arity is not None:
+                args = args[:arity]
+            start = time.perf_counter()
+            try:
+                return slot(*args)
+            finally:
+                end = time.perf_counter()
+                duration_ms = (end - start) * 1000
+                histogram.add(duration_ms)
+                if duration_ms >= threshold:
+                    self._record(name, duration_ms, start, end)
+        return timed
+
+    def connect(self, signal: Any, slot: Callable, name: Optional[str] = None):
+        """连接信号到计时的槽函数"""
+        signal.connect(self.wrap(slot, name))
+
+    def stats(self) -> dict:
+        return {
+            "started_at": round(self.started_at, 3),
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "threshold_ms": self.threshold_ms,
+            "event_loop_lag": self.lag.to_dict(),
+            "slots": {name: histogram.to_dict() for name, histogram in self.slots.items() if histogram.count},
+            "slow_events": list(self.slow_events),
+        }
+
+    def to_metrics(self) -> str:
+        """Prometheus 文本格式的指标"""
+        lines = [
+            "# HELP moonbit_gui_event_loop_lag_ms 事件循环延迟",
+            "# TYPE moonbit_gui_event_loop_lag_ms histogram",
+        ]
+        lines += self._histogram_lines("moonbit_gui_event_loop_lag_ms", self.lag, "")
+        lines += [
+            "# HELP moonbit_gui_slot_duration_ms 槽函数耗时",
+            "# TYPE moonbit_gui_slot_duration_ms histogram",
+        ]
+        for name, histogram in self.slots.items():
+            if histogram.count:
+                escaped = name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+                lines += self._histogram_lines("moonbit_gui_slot_duration_ms", histogram, f'slot="{escaped}"')
+        lines += [
+            "# TYPE moonbit_gui_slow_events_total counter",
+            f"moonbit_gui_slow_events_total {len(self.slow_events)}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(metric: str, histogram: Histogram, labels: str) -> List[str]:
+        prefix = f"{labels}," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(BUCKETS_MS + ("+Inf",), histogram.counts):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{metric}_sum{suffix} {histogram.total:.3f}")
+        lines.append(f"{metric}_count{suffix} {histogram.count}")
+        return lines
+
+    def to_text(self) -> str:
+        """供人阅读的摘要"""
+        lag = self.lag.to_dict()
+        lines = [
+            f"事件循环延迟: {lag['count']} 次探测  p50 {lag['p50_ms']} ms  p99 {lag['p99_ms']} ms  最大 {lag['max_ms']} ms",
+        ]
+        slowest = sorted(self.slots.items(), key=lambda item: item[1].max, reverse=True)
+        for name, histogram in slowest[:10]:
+            if histogram.count:
+                lines.append(f"  槽 {name}: {histogram.count} 次  平均 {histogram.total / histogram.count:.2f} ms"
+                             f"  最大 {histogram.max:.2f} ms")
+        for event in list(self.slow_events)[-5:]:
+            lines.append(f"卡顿 {event['duration_ms']:.1f} ms  来源 {event['source']}")
+            if event["stack"]:
+                lines.append(event["stack"].rstrip())
+        return "\n".join(lines)
+
+    def export(self, path: Optional[str] = None):
+        """写入 JSON（.json）或文本指标文件，先写临时文件再替换"""
+        path = path or self.report_path
+        if path is None:
+            print(self.to_text(), file=sys.stderr)
+            return
+        if path.endswith(".json"):
+            content = json.dumps(self.stats(), ensure_ascii=False, indent=2)
+        else:
+            content = self.to_metrics()
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def finish(self):
+        """停止探测并最后导出一次（可以重复调用，只执行一次）"""
+        if self._finished:
+            return
+        self._finished = True
+        self.stop()
+        self.export()
+
+
+_monitor: Optional[LagMonitor] = None
+
+
+def install(app: Optional[QApplication] = None, environ=None) -> Optional[LagMonitor]:
+    """
+    环境变量启用时为 QApplication 安装监视器，应用退出前导出报告。
+    重复调用返回同一个监视器。
+    """
+    global _monitor
+    if _monitor is None:
+        app = app or QApplication.instance()
+        _monitor = LagMonitor.from_environ(environ, parent=app)
+        if _monitor is not None:
+            app.aboutToQuit.connect(_monitor.finish)
+            _monitor.start()
+    return _monitor
+
+
+def monitor() -> Optional[LagMonitor]:
+    """已安装的监视器，未启用时为 None"""
+    return _monitor
+
+
+def wrap(slot: Callable, name: Optional[str] = None) -> Callable:
+    """监视器已安装时返回计时的槽函数，否则原样返回"""
+    if _monitor is None:
+        return slot
+    return _monitor.wrap(slot, name)
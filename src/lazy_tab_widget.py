@@ -0,0 +1,261 @@
+"""
+延迟构建并回收页面的标签页控件
+
+QTabWidget.addTab 要求先把页面完整构建出来，关闭的页面直接销毁。
+打开、关闭大量相似标签页的编辑器类工具中，构建和销毁占了大部分耗时。
+LazyTabWidget：
+
+- 每个标签页注册一个工厂函数，先放入一个空的容器，
+  第一次被 currentChanged 选中时才调用工厂构建页面
+- 通过 tabCloseRequested（或 close_tab）关闭的页面按类型放回有上限的池中，
+  下一个同类型的标签页直接复用，不再重新构建
+- 复用时调用标签页的 setup(page) 重新绑定数据，放回池中时调用 recycle(page) 清理状态
+
+池中的页面挂在一个隐藏的容器下，不会成为无父控件（见 leak_tracker.py）。
+"""
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QTabWidget, QVBoxLayout, QWidget
+
+
+class PagePool:
+    """按类型保存可复用的页面，每种类型最多保留 limit 个"""
+
+    def __init__(self, holder: QWidget, limit: int = 4):
+        self.holder = holder
+        self.limit = limit
+        self.reused = 0
+        self.discarded = 0
+        self._pages: Dict[Hashable, Deque[QWidget]] = {}
+
+    def take(self, page_type: Hashable) -> Optional[QWidget]:
+        pages = self._pages.get(page_type)
+        if not pages:
+            return None
+        self.reused += 1
+        return pages.pop()
+
+    def put(self, page_type: Hashable, page: QWidget) -> bool:
+        """放回池中，池已满时返回 False（由调用方销毁页面）"""
+        pages = self._pages.setdefault(page_type, deque())
+        if len(pages) >= self.limit:
+            self.discarded += 1
+            return False
+        page.hide()
+        page.setParent(self.holder)
+        pages.append(page)
+        return True
+
+    def set_limit(self, limit: int):
+        self.limit = max(0, limit)
+        for pages in self._pages.values():
+            while len(pages) > self.limit:
+                pages.popleft().deleteLater()
+                self.discarded += 1
+
+    def clear(self):
+        for pages in self._pages.values():
+            for page in pages:
+                page.deleteLater()
+        self._pages.clear()
+
+    def __len__(self) -> int:
+        return sum(len(pages) for pages in self._pages.values())
+
+    def sizes(self) -> Dict[str, int]:
+        return {str(page_type): len(pages) for page_type, pages in self._pages.items()}
+
+
+class _PageSlot(QWidget):
+    """标签页的容器：页面构建之前为空"""
+
+    def __init__(self, factory: Callable[[], QWidget], page_type: Hashable,
+                 setup: Optional[Callable[[QWidget], Any]], recycle: Optional[Callable[[QWidget], Any]],
+                 parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.factory = factory
+        self.page_type = page_type
+        self.setup = setup
+        self.recycle = recycle
+        self.page: Optional[QWidget] = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+    def attach(self, page: QWidget):
+        self.page = page
+        self.layout().addWidget(page)
+        page.show()
+
+    def detach(self) -> Optional[QWidget]:
+        page, self.page = self.page, None
+        if page is not None:
+            self.layout().removeWidget(page)
+        return page
+
+
+class LazyTabWidget(QTabWidget):
+    """
+    页面按需构建、关闭后按类型回收的标签页控件。
+    普通的 addTab / insertTab 仍然可用，这些页面不参与回收。
+    """
+
+    # 页面第一次构建（或从池中取出）后：(索引, 页面, 是否复用)
+    pageCreated = Signal(int, QWidget, bool)
+
+    def __init__(self, parent: Optional[QWidget] = None, pool_limit: int = 4, close_on_request: bool = True):
+        super().__init__(parent)
+        self.created = 0
+        self._pool_holder = QWidget(self)
+        self._pool_holder.hide()
+        self.pool = PagePool(self._pool_holder, pool_limit)
+        self.currentChanged.connect(self._on_current_changed)
+        if close_on_request:
+            self.tabCloseRequested.connect(self.close_tab)
+
+    def add_lazy_tab(self, title: str, factory: Callable[[], QWidget], page_type: Hashable = None,
+                     setup: Optional[Callable[[QWidget], Any]] = None,
+                     recycle: Optional[Callable[[QWidget], Any]] = None, index: int = -1) -> int:
+        """
+        注册一个延迟构建的标签页
+
+        Args:
+            title: 标签文本
+            factory: 无参数的工厂函数，返回页面控件
+            page_type: 回收池的类型键，默认为工厂函数本身
+            setup: 页面构建或复用后调用，用于绑定这个标签页的数据
+            recycle: 页面放回池中之前调用，用于清理状态
+            index: 插入位置，-1 表示追加到末尾
+
+        Returns:
+            int: 标签页的索引
+        """
+        slot = _PageSlot(factory, factory if page_type is None else page_type, setup, recycle)
+        index = self.insertTab(index, slot, title) if index >= 0 else self.addTab(slot, title)
+        # 信号被阻塞时 currentChanged 不会触发，插入的是当前标签页时直接构建
+        if self.currentIndex() == index:
+            self.materialize(index)
+        return index
+
+    def add_lazy_tab_tuple(self, title: str, factory: Callable[[], QWidget], page_type: str = "",
+                           setup: Optional[Callable[[QWidget], Any]] = None,
+                           recycle: Optional[Callable[[QWidget], Any]] = None) -> int:
+        """MoonBit 端使用的版本：空字符串的 page_type 表示以工厂函数为类型"""
+        return self.add_lazy_tab(title, factory, page_type or None, setup, recycle)
+
+    def materialize(self, index: int) -> Optional[QWidget]:
+        """构建（或从池中取出）指定标签页的页面并返回；普通标签页返回其控件"""
+        slot = self.widget(index)
+        if not isinstance(slot, _PageSlot):
+            return slot
+        if slot.page is not None:
+            return slot.page
+        page = self.pool.take(slot.page_type)
+        reused = page is not None
+        if page is None:
+            page = slot.factory()
+            self.created += 1
+        slot.attach(page)
+        if slot.setup is not None:
+            slot.setup(page)
+        self.pageCreated.emit(index, page, reused)
+        return page
+
+    def page(self, index: int) -> Optional[QWidget]:
+        """已经构建的页面，尚未构建时返回 None"""
+        slot = self.widget(index)
+        return slot.page if isinstance(slot, _PageSlot) else slot
+
+    def is_materialized(self, index: int) -> bool:
+        return self.page(index) is not None
+
+    def close_tab(self, index: int):
+        """关闭标签页，已构建的页面放回回收池，池已满时销毁"""
+        slot = self.widget(index)
+        if slot is None:
+            return
+        self.removeTab(index)
+        if isinstance(slot, _PageSlot):
+            page = slot.detach()
+            if page is not None:
+                if slot.recycle is not None:
+                    slot.recycle(page)
+                if not self.pool.put(slot.page_type, page):
+                    page.deleteLater()
+        slot.deleteLater()
+
+    def set_pool_limit(self, limit: int):
+        self.pool.set_limit(limit)
+
+    def clear_pool(self):
+        self.pool.clear()
+
+    def pool_size(self) -> int:
+        return len(self.pool)
+
+    def stats(self) -> dict:
+        return {
+            "tabs": self.count(),
+            "created": self.created,
+            "reused": self.pool.reused,
+            "discarded": self.pool.discarded,
+            "pooled": self.pool.sizes(),
+        }
+
+    def _on_current_changed(self, index: int):
+        if index >= 0:
+            self.materialize(index)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    from PySide6.QtCore import QEvent
+    from PySide6.QtWidgets import QApplication, QFormLayout, QLabel, QLineEdit, QPlainTextEdit
+
+    parser = argparse.ArgumentParser(description="LazyTabWidget 打开/关闭标签页测试")
+    parser.add_argument("--tabs", type=int, default=500, help="打开并关闭的标签页数量")
+    parser.add_argument("--fields", type=int, default=30, help="每个页面的表单行数")
+    options = parser.parse_args()
+
+    app = QApplication([])
+
+    def editor_page():
+        page = QWidget()
+        form = QFormLayout(page)
+        for i in range(options.fields):
+            form.addRow(QLabel(f"字段 {i}"), QLineEdit())
+        form.addRow(QPlainTextEdit())
+        return page
+
+    def bind(page):
+        page.findChild(QPlainTextEdit).setPlainText("fn main {\n  println(\"hello\")\n}\n")
+
+    def run(pool_limit):
+        tabs = LazyTabWidget(pool_limit=pool_limit)
+        tabs.resize(900, 600)
+        tabs.show()
+        app.processEvents()
+        start = time.perf_counter()
+        for i in range(options.tabs):
+            index = tabs.add_lazy_tab(f"file_{i}.mbt", editor_page, "editor", setup=bind)
+            tabs.setCurrentIndex(index)
+            app.processEvents()
+            # 保持最多 8 个打开的标签页
+            if tabs.count() > 8:
+                tabs.close_tab(0)
+                QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        elapsed = time.perf_counter() - start
+        stats = tabs.stats()
+        tabs.close()
+        tabs.deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        return {"tabs_per_second": round(options.tabs / elapsed), "created": stats["created"],
+                "reused": stats["reused"]}
+
+    print(json.dumps({"pool_0": run(0), "pool_4": run(4)}, indent=2, ensure_ascii=False))
@@ -0,0 +1,329 @@
+"""
+控件生命周期与内存泄漏诊断
+
+长时间运行、反复重建面板的程序会累积 Qt 对象和 Python 包装对象。
+启用后 LeakTracker 定期采样：
+
+- 按类名统计存活的 QObject（从 QApplication 和所有顶层控件遍历对象树），
+  以及 Python 端持有的 QObject 包装对象，其中 C++ 对象已被删除、
+  包装对象仍被引用的记为 stale
+- 对比相邻两次 tracemalloc 快照，列出内存增长最多的代码位置
+- 标记连续两次采样都处于隐藏状态的无父控件
+- 通过 watch_teardown / delete_later 登记的面板被删除后，
+  检查其子对象是否仍然存活（被移到了其他父对象下，或包装对象仍被引用）
+- 根据第一次和最近一次采样计算每小时的增长量
+
+通过环境变量启用：
+    MOONBIT_GUI_LEAKS=1              每次采样的摘要输出到 stderr
+    MOONBIT_GUI_LEAKS=leaks.jsonl    每次采样以一行 JSON 追加到文件
+    MOONBIT_GUI_LEAKS_INTERVAL=60    采样间隔（秒）
+    MOONBIT_GUI_LEAKS_FRAMES=1       tracemalloc 记录的栈深度
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import weakref
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import shiboken6
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QApplication, QDialog, QMenu, QWidget
+
+
+LEAKS_ENV = "MOONBIT_GUI_LEAKS"
+INTERVAL_ENV = "MOONBIT_GUI_LEAKS_INTERVAL"
+FRAMES_ENV = "MOONBIT_GUI_LEAKS_FRAMES"
+
+# 合法地以隐藏的顶层窗口存在的 Qt 内部类
+_IGNORED_TOP_LEVEL = {"QTipLabel", "QComboBoxPrivateContainer", "QWhatsThat", "QAbstractScrollAreaScrollBarContainer"}
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+        except ImportError:   # Windows
+            return 0.0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _describe(obj: QObject) -> str:
+    name = obj.objectName()
+    class_name = obj.metaObject().className()
+    return f"{class_name}({name})" if name else class_name
+
+
+def count_qobjects(app: Optional[QApplication] = None) -> Counter:
+    """按 C++ 类名统计从 QApplication 和顶层控件可达的 QObject"""
+    app = app or QApplication.instance()
+    counts = Counter()
+    seen = set()
+    roots = [app] + app.topLevelWidgets()
+    for root in roots:
+        for obj in [root] + root.findChildren(QObject):
+            key = shiboken6.getCppPointer(obj)[0]
+            if key in seen:
+                continue
+            seen.add(key)
+            counts[obj.metaObject().className()] += 1
+    return counts
+
+
+def count_wrappers() -> Dict[str, Any]:
+    """
+    统计 Python 端存活的 QObject 包装对象。
+
+    stale 是 C++ 对象已经删除、包装对象仍然被引用的数量，通常说明
+    某个容器或闭包持有了已经销毁的控件。
+    """
+    counts = Counter()
+    stale = Counter()
+    for obj in gc.get_objects():
+        if isinstance(obj, QObject):
+            name = type(obj).__name__
+            counts[name] += 1
+            if not shiboken6.isValid(obj):
+                stale[name] += 1
+    return {"by_class": counts, "stale": stale}
+
+
+class LeakTracker(QObject):
+    # 每个分类在报告中最多列出的条目数
+    TOP_N = 10
+
+    def __init__(self, interval_s: float = 60.0, report_path: Optional[str] = None,
+                 frames: int = 1, parent: QObject = None):
+        """
+        Args:
+            interval_s: 采样间隔（秒）
+            report_path: JSON Lines 报告路径，None 表示摘要输出到 stderr
+            frames: tracemalloc 记录的栈深度，0 表示不跟踪 Python 内存分配
+        """
+        super().__init__(parent)
+        self.report_path = report_path
+        self.samples: List[dict] = []
+        self.teardowns: List[dict] = []
+        self._first_counts: Optional[Counter] = None
+        self._previous_counts: Optional[Counter] = None
+        self._previous_hidden = set()
+        self._snapshot = None
+        self._finished = False
+
+        if frames > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(interval_s * 1000))
+        self._timer.timeout.connect(self.sample)
+
+    @classmethod
+    def from_environ(cls, environ=None, parent: QObject = None) -> Optional["LeakTracker"]:
+        """根据环境变量创建跟踪器，未启用时返回 None"""
+        environ = os.environ if environ is None else environ
+        value = environ.get(LEAKS_ENV, "").strip()
+        if value.lower() in ("", "0", "false", "no", "off"):
+            return None
+        report_path = None if value.lower() in ("1", "true", "yes", "on", "-") else value
+        interval = float(environ.get(INTERVAL_ENV, "") or 60)
+        frames = int(environ.get(FRAMES_ENV, "") or 1)
+        return cls(interval, report_path, frames, parent)
+
+    def start(self):
+        """立即采样一次作为基线，之后定期采样"""
+        self.sample()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _hidden_parentless(self, app: QApplication) -> List[str]:
+        """连续两次采样都隐藏着的无父控件"""
+        hidden = {}
+        for widget in app.topLevelWidgets():
+            if widget.isVisible() or isinstance(widget, (QMenu, QDialog)):
+                continue
+            if widget.metaObject().className() in _IGNORED_TOP_LEVEL:
+                continue
+            hidden[shiboken6.getCppPointer(widget)[0]] = _describe(widget)
+        flagged = [name for key, name in hidden.items() if key in self._previous_hidden]
+        self._previous_hidden = set(hidden)
+        return flagged
+
+    def _memory_growth(self) -> List[dict]:
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            tracemalloc.Filter(False, __file__),
+        ))
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is None:
+            return []
+        growth = []
+        for stat in snapshot.compare_to(previous, "lineno"):
+            if stat.size_diff <= 0:
+                continue
+            growth.append({
+                "where": str(stat.traceback[0]),
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "count_diff": stat.count_diff,
+            })
+            if len(growth) >= self.TOP_N:
+                break
+        return growth
+
+    def sample(self) -> dict:
+        """采样一次，写出报告并返回"""
+        app = QApplication.instance()
+        counts = count_qobjects(app)
+        wrappers = count_wrappers()
+        if self._first_counts is None:
+            self._first_counts = counts
+        previous, self._previous_counts = self._previous_counts, counts
+        class_growth = Counter(counts)
+        class_growth.subtract(previous or counts)
+
+        record = {
+            "time": round(time.time(), 3),
+            "qobjects": sum(counts.values()),
+            "wrappers": sum(wrappers["by_class"].values()),
+            "stale_wrappers": sum(wrappers["stale"].values()),
+            "rss_mb": round(_rss_mb(), 1),
+            "traced_mb": round(tracemalloc.get_traced_memory()[0] / 2 ** 20, 1) if tracemalloc.is_tracing() else None,
+            "class_growth": {name: diff for name, diff in class_growth.most_common(self.TOP_N) if diff > 0},
+            "stale_by_class": dict(wrappers["stale"].most_common(self.TOP_N)),
+            "hidden_parentless": self._hidden_parentless(app),
+            "memory_growth": self._memory_growth(),
+        }
+        self.samples.append(record)
+        record["growth_per_hour"] = self.growth_rates()
+        self._write(record)
+        return record
+
+    def growth_rates(self) -> Dict[str, Any]:
+        """第一次到最近一次采样之间，各项指标每小时的增长量"""
+        if len(self.samples) < 2:
+            return {}
+        first, last = self.samples[0], self.samples[-1]
+        hours = (last["time"] - first["time"]) / 3600
+        if hours <= 0:
+            return {}
+        rates = {
+            key: round((last[key] - first[key]) / hours, 1)
+            for key in ("qobjects", "wrappers", "stale_wrappers", "rss_mb", "traced_mb")
+            if last[key] is not None and first[key] is not None
+        }
+        class_growth = Counter(self._previous_counts)
+        class_growth.subtract(self._first_counts)
+        rates["by_class"] = {
+            name: round(diff / hours, 1) for name, diff in class_growth.most_common(self.TOP_N) if diff > 0
+        }
+        return rates
+
+    def watch_teardown(self, panel: QObject, label: str = ""):
+        """
+        登记即将删除的面板。面板被销毁后（下一轮事件循环中）检查它的子对象：
+        - survivors：没有随面板一起销毁，通常是被移到了其他父对象下
+        - stale：C++ 对象已经销毁，但 Python 包装对象仍被引用
+        """
+        label = label or _describe(panel)
+        alive = {}
+        refs = []
+        for index, obj in enumerate([panel] + panel.findChildren(QObject)):
+            alive[index] = _describe(obj)
+            obj.destroyed.connect(lambda *_, index=index: alive.pop(index, None))
+            refs.append(weakref.ref(obj))
+        panel.destroyed.connect(
+            lambda *_: QTimer.singleShot(0, lambda: self._check_teardown(label, alive, refs)))
+
+    def _check_teardown(self, label: str, alive: Dict[int, str], refs: List[weakref.ref]):
+        stale = Counter()
+        for ref in refs:
+            obj = ref()
+            if obj is not None and not shiboken6.isValid(obj):
+                stale[type(obj).__name__] += 1
+        if not alive and not stale:
+            return
+        record = {
+            "time": round(time.time(), 3),
+            "teardown": label,
+            "survivors": sorted(alive.values())[:self.TOP_N],
+            "survivor_count": len(alive),
+            "stale": dict(stale),
+        }
+        self.teardowns.append(record)
+        self._write(record)
+
+    def _write(self, record: dict):
+        if self.report_path is not None:
+            with open(self.report_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return
+        if "teardown" in record:
+            print(f"[leaks] 面板 {record['teardown']} 删除后仍有 {record['survivor_count']} 个子对象存活，"
+                  f"stale 包装对象 {record['stale']}：{record['survivors']}", file=sys.stderr)
+            return
+        line = (f"[leaks] QObject {record['qobjects']}  包装对象 {record['wrappers']}"
+                f"（stale {record['stale_wrappers']}）  RSS {record['rss_mb']} MB")
+        if record["traced_mb"] is not None:
+            line += f"  Python 堆 {record['traced_mb']} MB"
+        print(line, file=sys.stderr)
+        if record["class_growth"]:
+            print(f"[leaks]   新增: {record['class_growth']}", file=sys.stderr)
+        if record["hidden_parentless"]:
+            print(f"[leaks]   隐藏的无父控件: {record['hidden_parentless']}", file=sys.stderr)
+        for item in record["memory_growth"][:3]:
+            print(f"[leaks]   +{item['size_diff_kb']} KB  {item['where']}", file=sys.stderr)
+        rates = {key: value for key, value in record["growth_per_hour"].items() if key != "by_class"}
+        if rates:
+            print(f"[leaks]   每小时增长: {rates}", file=sys.stderr)
+
+    def finish(self):
+        """最后采样一次（可以重复调用，只执行一次）"""
+        if self._finished:
+            return
+        self._finished = True
+        self.stop()
+        self.sample()
+
+
+_tracker: Optional[LeakTracker] = None
+
+
+def install(app: Optional[QApplication] = None, environ=None) -> Optional[LeakTracker]:
+    """
+    环境变量启用时为 QApplication 安装跟踪器并开始采样，
+    应用退出前最后采样一次。重复调用返回同一个跟踪器。
+    """
+    global _tracker
+    if _tracker is None:
+        app = app or QApplication.instance()
+        _tracker = LeakTracker.from_environ(environ, parent=app)
+        if _tracker is not None:
+            app.aboutToQuit.connect(_tracker.finish)
+            _tracker.start()
+    return _tracker
+
+
+def tracker() -> Optional[LeakTracker]:
+    """已安装的跟踪器，未启用时为 None"""
+    return _tracker
+
+
+def delete_later(widget: QWidget):
+    """
+    删除控件（deleteLater）。跟踪器已启用时先登记，
+    删除后检查子对象是否全部随之销毁。
+    """
+    if _tracker is not None:
+        _tracker.watch_teardown(widget)
+    widget.deleteLater()
@@ -0,0 +1,255 @@
+"""
+高吞吐的只追加日志视图
+
+QTextBrowser.setPlainText / setHtml 每次替换整个文档，重复追加时整个文档
+重新布局，内存也无限增长。LogView 基于 QPlainTextEdit
+（QTextBrowser 的文档布局会布局全部文本，QPlainTextEdit 只布局可见的块）：
+
+- 追加的行先进入缓冲区，每帧合并成一次插入
+- 文档限制为固定数量的块（类似 maximumBlockCount），最旧的行被丢弃；
+  每次刷新用一次选区删除裁掉超出的块，比 maximumBlockCount 逐块删除快得多
+- 按级别着色直接使用 QTextCharFormat，不解析 HTML
+- 只有追加前已经位于底部时才自动滚动，滚动条跳到末尾不需要完整布局
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+from PySide6.QtCore import QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor, QTextOption
+from PySide6.QtWidgets import QPlainTextEdit, QWidget
+
+
+# 级别 -> (前景色, 是否粗体)
+LEVEL_COLORS = {
+    "debug": ("#9CA3AF", False),
+    "info": ("#E5E7EB", False),
+    "warning": ("#F59E0B", False),
+    "error": ("#EF4444", True),
+}
+
+# 从行首附近识别级别
+_LEVEL_RE = re.compile(r"\b(DEBUG|INFO|WARN(?:ING)?|ERROR|FATAL|CRITICAL)\b", re.IGNORECASE)
+_LEVEL_ALIASES = {"warn": "warning", "fatal": "error", "critical": "error"}
+
+
+class LogView(QPlainTextEdit):
+    """
+    只追加的日志视图，可以从同一线程高频调用 append_line / append_lines。
+    """
+
+    # 每帧的合并间隔（毫秒）
+    FRAME_INTERVAL_MS = 16
+
+    # 一次刷新后追加的行数，丢弃的行数
+    flushed = Signal(int, int)
+
+    def __init__(self, parent: Optional[QWidget] = None, max_blocks: int = 10000,
+                 detect_levels: bool = True):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setWordWrapMode(QTextOption.WrapMode.NoWrap)
+        self.max_blocks = max_blocks
+        self.detect_levels = detect_levels
+        self.auto_scroll = True
+        self.total_lines = 0
+        self.dropped_lines = 0
+
+        self._pending = deque()   # (level, text)
+        self._formats: Dict[Optional[str], QTextCharFormat] = {None: QTextCharFormat()}
+        for level, (color, bold) in LEVEL_COLORS.items():
+            self.set_level_color(level, color, bold)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FRAME_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def set_level_color(self, level: str, color: str, bold: bool = False):
+        char_format = QTextCharFormat()
+        char_format.setForeground(QColor(color))
+        if bold:
+            char_format.setFontWeight(QFont.Weight.Bold)
+        self._formats[level] = char_format
+
+    def set_max_blocks(self, max_blocks: int):
+        """设置保留的最大行数，0 表示不限制"""
+        self.max_blocks = max_blocks
+        if max_blocks > 0:
+            self._trim_document(0)
+
+    def set_auto_scroll(self, enabled: bool):
+        """追加前位于底部时是否滚动到末尾"""
+        self.auto_scroll = enabled
+
+    def classify(self, line: str) -> Optional[str]:
+        """识别一行的级别，未识别返回 None"""
+        match = _LEVEL_RE.search(line, 0, 48)
+        if match is None:
+            return None
+        level = match.group(1).lower()
+        return _LEVEL_ALIASES.get(level, level)
+
+    def append_line(self, text: str, level: Optional[str] = None):
+        """追加一行（下一帧显示）"""
+        self._pending.append((level, text))
+        self._schedule()
+
+    def append_lines(self, lines: Iterable[str], level: Optional[str] = None):
+        """追加多行"""
+        self._pending.extend((level, line) for line in lines)
+        self._schedule()
+
+    def append_text(self, text: str, level: Optional[str] = None):
+        """追加一段文本，按换行拆分成行（供 MoonBit 端一次传入多行）"""
+        self.append_lines(text.split("\n"), level)
+
+    def _schedule(self):
+        limit = self.max_blocks
+        if limit > 0 and len(self._pending) > 2 * limit:
+            # 缓冲区中超出块数上限的旧行无论如何都会被丢弃
+            self._trim_pending(limit)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _trim_pending(self, limit: int):
+        excess = len(self._pending) - limit
+        for _ in range(excess):
+            self._pending.popleft()
+        self.dropped_lines += excess
+
+    def flush(self):
+        """立即把缓冲区中的行插入文档"""
+        self._timer.stop()
+        if not self._pending:
+            return
+        dropped_before = self.dropped_lines
+        limit = self.max_blocks
+        if limit > 0 and len(self._pending) > limit:
+            self._trim_pending(limit)
+        pending, self._pending = self._pending, deque()
+
+        scroll_bar = self.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+
+        document = self.document()
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        if limit > 0:
+            self._trim_document(len(pending), cursor)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        # 同一格式的连续行合并成一次 insertText
+        separator = "" if document.isEmpty() else "\n"
+        run = []
+        run_format = None
+        formats = self._formats
+        classify = self.classify if self.detect_levels else None
+        for level, text in pending:
+            if level is None and classify is not None:
+                level = classify(text)
+            char_format = formats.get(level, formats[None])
+            if char_format is not run_format and run:
+                cursor.insertText(separator + "\n".join(run), run_format)
+                separator = "\n"
+                run = []
+            run_format = char_format
+            run.append(text)
+        if run:
+            cursor.insertText(separator + "\n".join(run), run_format)
+        cursor.endEditBlock()
+
+        count = len(pending)
+        self.total_lines += count
+        if self.auto_scroll and at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+        self.flushed.emit(count, self.dropped_lines - dropped_before)
+
+    def _trim_document(self, incoming: int, cursor: Optional[QTextCursor] = None):
+        """删除最旧的块，为 incoming 行腾出位置"""
+        document = self.document()
+        if document.isEmpty():
+            return
+        blocks = document.blockCount()
+        excess = min(blocks, blocks + incoming - self.max_blocks)
+        if excess <= 0:
+            return
+        cursor = cursor or QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        if excess == blocks:
+            cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+        else:
+            end = document.findBlockByNumber(excess)
+            cursor.setPosition(end.position(), QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        self.dropped_lines += excess
+
+    def clear(self):
+        self._pending.clear()
+        self._timer.stop()
+        super().clear()
+
+    def line_count(self) -> int:
+        """文档中当前保留的行数"""
+        return 0 if self.document().isEmpty() else self.document().blockCount()
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * 4096 / 2 ** 20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    from PySide6.QtWidgets import QApplication
+
+    parser = argparse.ArgumentParser(description="LogView 持续写入测试")
+    parser.add_argument("--rate", type=int, default=50000, help="每秒写入的行数")
+    parser.add_argument("--duration", type=float, default=5.0, help="测试时长（秒）")
+    parser.add_argument("--max-blocks", type=int, default=10000, help="保留的最大行数")
+    options = parser.parse_args()
+
+    app = QApplication([])
+    view = LogView(max_blocks=options.max_blocks)
+    view.resize(900, 600)
+    view.show()
+
+    sent = 0
+    rss = []
+    start = time.perf_counter()
+    next_sample = start
+    while True:
+        now = time.perf_counter()
+        elapsed = now - start
+        if elapsed >= options.duration:
+            break
+        target = int(elapsed * options.rate)
+        view.append_lines(
+            f"[{i}] {'ERROR' if i % 100 == 0 else 'INFO'} compiling module_{i % 300}.mbt"
+            for i in range(sent, target)
+        )
+        sent = target
+        app.processEvents()
+        if now >= next_sample:
+            rss.append(round(_rss_mb(), 1))
+            next_sample = now + 0.5
+    view.flush()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "lines": sent,
+        "lines_per_second": round(sent / elapsed),
+        "inserted": view.total_lines,
+        "dropped": view.dropped_lines,
+        "kept": view.line_count(),
+        "rss_mb": rss,
+    }, indent=2))
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无界面基准测试套件
+
+在 offscreen 平台下运行，不打开窗口、不进入 app.exec()，可以在普通的
+Linux 机器或 CI 上重复执行。测量项：
+
+- window：MoonBitMainWindow 的构建耗时（立即构建 / 延迟构建）和 show 耗时
+- highlight：highlight_syntax 的吞吐量随输入大小的变化（绕过 HTML 缓存）
+- fonts：字体解析的冷启动耗时和缓存命中后的单次耗时
+- signals：经过 SignalSlotManager 连接的信号分发速率
+- bridge：每次按名称查找类和方法（绑定层原来的做法）与使用缓存的对比，
+  方法调用按 MoonBit 绑定经 C API 实际走的路径测量
+- paint：数百个特性卡片和按钮组成的网格，样式表版本与自绘版本（painted.py）的重绘和滚动耗时
+- memory：进程的峰值 RSS
+
+结果以 JSON 输出；指定 --baseline 时与保存的结果对比，
+超过阈值的变化标记为回退（--fail-on-regression 时返回非零退出码）。
+
+用法：
+    python3 benchmark.py --output results.json
+    python3 benchmark.py --baseline results.json --fail-on-regression
+"""
+
+import argparse
+import ctypes
+import datetime
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, _HERE)
+sys.path.insert(0, os.path.dirname(_HERE))   # signal_slot_manager.py 位于 src/
+
+import PySide6
+from PySide6.QtCore import QEvent, Qt, qVersion
+from PySide6.QtGui import QFont, QPixmap
+from PySide6.QtWidgets import (QApplication, QFrame, QGridLayout, QLabel, QPushButton, QScrollArea,
+                               QVBoxLayout, QWidget)
+
+import font_utils
+import main
+from highlighter import get_highlighter
+from painted import FeatureCard, PaintedButton
+from signal_slot_manager import SignalSlotManager
+from widget_factory import WidgetFactory
+
+
+# 高亮测试的输入样本，按需重复到目标大小
+SAMPLE_CODE = '''fn fibonacci(n : Int) -> Int {
+  // 递归计算斐波那契数
+  if n <= 1 {
+    n
+  } else {
+    fibonacci(n - 1) + fibonacci(n - 2)
+  }
+}
+
+/* 块注释
+   跨越多行 */
+pub fn main {
+  let values = [1, 2, 3, 4, 5]
+  for i = 0; i < values.length(); i = i + 1 {
+    println("fib(\\{values[i]}) = \\{fibonacci(values[i])}")
+  }
+}
+'''
+
+HIGHLIGHT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# 指标名后缀 -> 数值越大越好？
+_HIGHER_IS_BETTER = ("_per_s",)
+_LOWER_IS_BETTER = ("_ms", "_us", "_mb")
+
+
+def _median_ms(func, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _dispose(widget):
+    widget.close()
+    widget.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+def bench_window(rounds):
+    """主窗口的构建和显示耗时（毫秒，取中位数）"""
+    app = QApplication.instance()
+    result = {}
+    for label, lazy in (("eager", False), ("lazy", True)):
+        build, show = [], []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            window = main.MoonBitMainWindow(lazy_sections=lazy)
+            built = time.perf_counter()
+            window.show()
+            for widget in [window] + window.findChildren(QWidget):
+                widget.ensurePolished()
+            app.processEvents()
+            shown = time.perf_counter()
+            _dispose(window)
+            build.append((built - start) * 1000)
+            show.append((shown - built) * 1000)
+        result[f"{label}_build_ms"] = statistics.median(build)
+        result[f"{label}_show_ms"] = statistics.median(show)
+    return result
+
+
+def bench_highlight(rounds, sizes=HIGHLIGHT_SIZES):
+    """不同输入大小下的高亮耗时和吞吐量"""
+    widget = main.CodeDisplayWidget()
+    highlighter = get_highlighter("moonbit")
+    result = {}
+    for size in sizes:
+        code = (SAMPLE_CODE * (size // len(SAMPLE_CODE) + 1))[:size]
+
+        def run():
+            highlighter.clear_cache()
+            widget.highlight_syntax(code, "moonbit")
+
+        elapsed = _median_ms(run, rounds if size < 1_000_000 else max(1, rounds // 2))
+        result[f"{size}_chars_ms"] = elapsed
+        result[f"{size}_chars_per_s"] = size / (elapsed / 1000) if elapsed > 0 else 0.0
+    _dispose(widget)
+    return result
+
+
+def bench_fonts(rounds, lookups=100_000):
+    """字体解析：冷启动（新注册表）和缓存命中"""
+    def cold():
+        registry = font_utils.FontRegistry()
+        for role in registry.ROLES:
+            registry.font(role, 12)
+
+    registry = font_utils.registry
+    registry.font("chinese", 12)
+    start = time.perf_counter()
+    for _ in range(lookups):
+        font_utils.get_chinese_font(12)
+    warm = time.perf_counter() - start
+    return {
+        "cold_resolve_ms": _median_ms(cold, rounds),
+        "cached_lookup_us": warm / lookups * 1e6,
+    }
+
+
+def bench_signals(emits=100_000):
+    """经过 SignalSlotManager 连接后，每秒能分发的信号数"""
+    manager = SignalSlotManager()
+    parent = QWidget()
+    result = {}
+
+    button, label = QPushButton(parent), QLabel(parent)
+    manager.connect_button_to_label(button, label, "clicked")
+    start = time.perf_counter()
+    for _ in range(emits):
+        button.clicked.emit()
+    result["set_text_per_s"] = emits / (time.perf_counter() - start)
+
+    button, label = QPushButton(parent), QLabel("0", parent)
+    manager.connect_button_to_increment_label(button, label, "", "")
+    start = time.perf_counter()
+    for _ in range(emits):
+        button.clicked.emit()
+    result["counter_per_s"] = emits / (time.perf_counter() - start)
+
+    _dispose(parent)
+    return result
+
+
+def _c_api():
+    """绑定层（MoonBit 经 C API）实际调用的几个函数"""
+    api = ctypes.pythonapi
+    get_attr = api.PyObject_GetAttrString
+    get_attr.argtypes = [ctypes.py_object, ctypes.c_char_p]
+    get_attr.restype = ctypes.py_object
+    call_object = api.PyObject_CallObject
+    call_object.argtypes = [ctypes.py_object, ctypes.py_object]
+    call_object.restype = ctypes.py_object
+    type_name = api._PyType_Name
+    type_name.argtypes = [ctypes.c_void_p]
+    type_name.restype = ctypes.c_char_p
+    return get_attr, call_object, type_name
+
+
+def bench_bridge(rounds, count=20_000):
+    """
+    绑定层的查找开销：按名称导入模块、查找类再构造，
+    与通过 WidgetFactory 缓存的类构造对比；方法调用按 MoonBit 绑定实际走的
+    C API 路径模拟（每次 PyObject_GetAttrString 取绑定方法再调用，与按类型名
+    查缓存的未绑定方法、以对象为第一个参数调用对比）。
+
+    两种做法在每一轮中交替运行，取各轮速率的中位数，避免顺序带来的偏差。
+    """
+    parent = QWidget()
+    factory = WidgetFactory()
+    get_attr, call_object, type_name = _c_api()
+
+    def uncached_create(owner):
+        cls = getattr(importlib.import_module("PySide6.QtWidgets"), "QLabel")
+        return cls(owner)
+
+    def cached_create(owner):
+        return factory.create("QLabel", owner)
+
+    def create_rate(create, per_owner=1_000):
+        # 每个父控件只挂 per_owner 个子控件：子控件的移除和销毁都随兄弟数量线性变慢
+        owners = [QWidget() for _ in range(-(-count // per_owner))]
+        start = time.perf_counter()
+        for index in range(count):
+            create(owners[index // per_owner])
+        rate = count / (time.perf_counter() - start)
+        for owner in owners:
+            _dispose(owner)
+        return rate
+
+    label = QLabel(parent)
+    label_type = id(type(label))   # Py_TYPE 只是读字段，不计入
+    calls = count * 5
+    methods = {}
+
+    def uncached_call():
+        args = ("x",)
+        for _ in range(calls):
+            call_object(get_attr(label, b"setText"), args)
+
+    def cached_call():
+        args = (label, "x")
+        for _ in range(calls):
+            key = type_name(label_type) + b".setText"
+            method = methods.get(key)
+            if method is None:
+                method = methods[key] = factory.methods.method(label, "setText")
+            call_object(method, args)
+
+    def call_rate(run):
+        start = time.perf_counter()
+        run()
+        return calls / (time.perf_counter() - start)
+
+    samples = {}
+    for _ in range(rounds):
+        for name, rate in (("uncached_create_per_s", lambda: create_rate(uncached_create)),
+                           ("cached_create_per_s", lambda: create_rate(cached_create)),
+                           ("uncached_call_per_s", lambda: call_rate(uncached_call)),
+                           ("cached_call_per_s", lambda: call_rate(cached_call))):
+            samples.setdefault(name, []).append(rate())
+
+    _dispose(parent)
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def _qss_feature_card(icon, name, description):
+    """样式表版本的特性卡片（自绘之前的实现），用于对比"""
+    card = QFrame()
+    card.setProperty("role", "featureCard")
+    layout = QVBoxLayout(card)
+    layout.setSpacing(15)
+    for text, font, role in ((icon, font_utils.get_emoji_font(32), None),
+                             (name, font_utils.get_chinese_font(16, QFont.Weight.Bold), "title"),
+                             (description, font_utils.get_chinese_font(12), "caption")):
+        label = QLabel(text)
+        label.setFont(font)
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        label.setWordWrap(role == "caption")
+        if role:
+            label.setProperty("role", role)
+        layout.addWidget(label)
+    return card
+
+
+def _qss_button(text):
+    button = QPushButton(text)
+    button.setMinimumHeight(50)
+    button.setFont(font_utils.get_chinese_font(12, QFont.Weight.Bold))
+    button.setProperty("variant", "primary")
+    return button
+
+
+def _painted_feature_card(icon, name, description):
+    fonts = (font_utils.get_emoji_font(32), font_utils.get_chinese_font(16, QFont.Weight.Bold),
+             font_utils.get_chinese_font(12))
+    return FeatureCard(icon, name, description, fonts)
+
+
+def _painted_button(text):
+    button = PaintedButton(text)
+    button.setMinimumHeight(50)
+    button.setFont(font_utils.get_chinese_font(12, QFont.Weight.Bold))
+    return button
+
+
+def bench_paint(rounds, cards=400, columns=4):
+    """
+    卡片网格的重绘耗时：样式表版本与自绘版本
+
+    每个单元格是一张特性卡片加一个按钮，窗口大小 1200x800。
+    测量视口的完整重绘和逐步滚动（每步 120 像素）的单帧耗时。
+    """
+    app = QApplication.instance()
+    result = {}
+    for label, make_card, make_button in (("qss", _qss_feature_card, _qss_button),
+                                          ("painted", _painted_feature_card, _painted_button)):
+        area = QScrollArea()
+        area.setWidgetResizable(True)
+        grid_widget = QWidget()
+        grid = QGridLayout(grid_widget)
+        start = time.perf_counter()
+        for i in range(cards):
+            cell = QWidget()
+            cell_layout = QVBoxLayout(cell)
+            cell_layout.addWidget(make_card("🚀", f"特性 {i}", "编译速度快，运行效率高，适合大规模项目开发"))
+            cell_layout.addWidget(make_button(f"📥 下载 {i}"))
+            grid.addWidget(cell, i // columns, i % columns)
+        area.setWidget(grid_widget)
+        area.resize(1200, 800)
+        area.show()
+        app.processEvents()
+        result[f"{label}_build_ms"] = (time.perf_counter() - start) * 1000
+
+        # offscreen 平台上窗口不会真正暴露，repaint() 不绘制；直接把视口渲染到同尺寸的图片上
+        viewport = area.viewport()
+        frame = QPixmap(viewport.size())
+
+        def repaint():
+            viewport.render(frame)
+
+        repaint()
+        result[f"{label}_repaint_ms"] = _median_ms(repaint, rounds * 4)
+
+        scroll_bar = area.verticalScrollBar()
+
+        def scroll():
+            for value in range(0, min(scroll_bar.maximum(), 120 * 40), 120):
+                scroll_bar.setValue(value)
+                repaint()
+
+        steps = len(range(0, min(scroll_bar.maximum(), 120 * 40), 120)) or 1
+        result[f"{label}_scroll_frame_ms"] = _median_ms(scroll, rounds) / steps
+        _dispose(area)
+    return result
+
+
+def peak_rss_mb():
+    """进程的峰值 RSS（MB）"""
+    try:
+        import resource
+    except ImportError:   # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+BENCHMARKS = ("window", "highlight", "fonts", "signals", "bridge", "paint")
+
+
+def run(selected, rounds, quick=False):
+    app = QApplication.instance() or QApplication(sys.argv)
+    # 预热：导入、字体族快照、主题样式表
+    _dispose(main.MoonBitMainWindow())
+    gc.collect()
+
+    results = {}
+    if "window" in selected:
+        results["window"] = bench_window(rounds)
+    if "highlight" in selected:
+        sizes = HIGHLIGHT_SIZES[:-1] if quick else HIGHLIGHT_SIZES
+        results["highlight"] = bench_highlight(rounds, sizes)
+    if "fonts" in selected:
+        results["fonts"] = bench_fonts(rounds)
+    if "signals" in selected:
+        results["signals"] = bench_signals(10_000 if quick else 100_000)
+    if "bridge" in selected:
+        results["bridge"] = bench_bridge(rounds, 2_000 if quick else 20_000)
+    if "paint" in selected:
+        results["paint"] = bench_paint(rounds, 100 if quick else 400)
+    results["memory"] = {"peak_rss_mb": peak_rss_mb()}
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pyside6": PySide6.__version__,
+            "qt": qVersion(),
+            "platform": f"{platform.system()} {platform.machine()}",
+            "qpa": app.platformName(),
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def _direction(metric):
+    if metric.endswith(_HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(_LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(current, baseline, threshold):
+    """
+    与基线逐项对比
+
+    Returns:
+        list: [{"metric", "baseline", "current", "change_pct", "status"}]，
+        status 为 improved / regressed / unchanged
+    """
+    rows = []
+    for group, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            old = baseline.get("results", {}).get(group, {}).get(metric)
+            if not isinstance(old, (int, float)) or old == 0:
+                continue
+            change = (value - old) / old * 100
+            direction = _direction(metric)
+            status = "unchanged"
+            if direction and abs(change) > threshold:
+                status = "improved" if change * direction > 0 else "regressed"
+            rows.append({
+                "metric": f"{group}.{metric}",
+                "baseline": old,
+                "current": value,
+                "change_pct": round(change, 1),
+                "status": status,
+            })
+    return rows
+
+
+def _print_comparison(rows, stream):
+    width = max((len(row["metric"]) for row in rows), default=10)
+    for row in rows:
+        marker = {"improved": "+", "regressed": "!", "unchanged": " "}[row["status"]]
+        print(f"{marker} {row['metric']:<{width}}  {row['baseline']:>14.3f} -> {row['current']:>14.3f}"
+              f"  ({row['change_pct']:+.1f}%)", file=stream)
+
+
+def main_entry():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5, help="每项测量的重复次数（取中位数）")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="只运行指定的测试")
+    parser.add_argument("--quick", action="store_true", help="跳过最大的输入，减少分发次数")
+    parser.add_argument("--output", help="结果写入的 JSON 文件（默认输出到 stdout）")
+    parser.add_argument("--baseline", help="用于对比的基线 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=10.0, help="视为变化的百分比阈值")
+    parser.add_argument("--fail-on-regression", action="store_true", help="有回退时返回退出码 1")
+    args = parser.parse_args()
+
+    report = run(args.only or BENCHMARKS, args.rounds, args.quick)
+
+    regressed = False
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        report["comparison"] = {"baseline": args.baseline, "threshold_pct": args.threshold, "metrics": rows}
+        _print_comparison(rows, sys.stderr)
+        regressed = any(row["status"] == "regressed" for row in rows)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_entry())
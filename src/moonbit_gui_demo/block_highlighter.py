@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按块增量高亮模块
+
+仿照 QSyntaxHighlighter 的做法：每个文本块在 userState 中保存行间状态
+（是否处于块注释中），格式通过 QTextLayout.setFormats 附加到块上。
+编辑时只重新高亮被修改的块，以及块注释状态因此改变的后续块。
+大文档的高亮按事件循环时间片推进，首屏内容立即显示。
+
+没有直接继承 QSyntaxHighlighter，因为它在替换整个文档内容时会同步地
+对每个块回调一次 highlightBlock，对十万行的文档来说这本身就会卡顿。
+"""
+
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QTextCharFormat, QTextLayout
+
+from highlighter import STATE_NORMAL, get_highlighter
+
+
+class BlockHighlighter(QObject):
+    """
+    增量语法高亮器
+
+    使用 highlighter.py 中注册的词法分析器逐块着色。
+    编号小于 frontier 的块已经高亮；其余的块由定时器在空闲时逐片推进。
+    """
+
+    # 全部块高亮完成
+    finished = Signal()
+
+    def __init__(self, document, language="moonbit",
+                 first_screen=200, slice_ms=8, parent=None):
+        """
+        Args:
+            document: 要高亮的 QTextDocument
+            language: 语言名称，见 highlighter.register_highlighter
+            first_screen: 同步高亮的首屏块数
+            slice_ms: 每个事件循环时间片的预算（毫秒）
+            parent: 父对象，默认为 document
+        """
+        super().__init__(parent if parent is not None else document)
+        self._document = document
+        self._lexer = get_highlighter(language)
+        self._formats = {}   # Style -> QTextCharFormat
+        self.first_screen = first_screen
+        self.slice_ms = slice_ms
+        self._frontier = 0
+        self._block_count = document.blockCount()
+        self._busy = False
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._advance)
+
+        document.contentsChange.connect(self._on_contents_change)
+
+    def set_language(self, language, rehighlight=True):
+        """
+        切换语言
+
+        Args:
+            language: 语言名称
+            rehighlight: 是否立即重新高亮现有内容
+        """
+        lexer = get_highlighter(language)
+        if lexer is self._lexer:
+            return
+        self._lexer = lexer
+        if rehighlight:
+            self.rehighlight()
+
+    def reset(self):
+        """
+        丢弃高亮进度
+
+        在替换整个文档内容（例如 setPlainText）之前调用，
+        避免内容变化时同步高亮整个新文档；之后调用 rehighlight()。
+        """
+        self._timer.stop()
+        self._frontier = 0
+
+    def rehighlight(self):
+        """同步高亮首屏，其余部分交给时间片"""
+        self._frontier = 0
+        self._block_count = self._document.blockCount()
+        self._highlight_until(self.first_screen, None)
+        if self.is_finished():
+            self._timer.stop()
+            self.finished.emit()
+        else:
+            self._timer.start()
+
+    def is_finished(self):
+        """是否所有块都已高亮"""
+        return self._frontier >= self._document.blockCount()
+
+    def _format_for(self, style):
+        char_format = self._formats.get(style)
+        if char_format is None:
+            char_format = QTextCharFormat()
+            char_format.setForeground(QColor(style.color))
+            if style.bold:
+                char_format.setFontWeight(QFont.Weight.Bold)
+            if style.italic:
+                char_format.setFontItalic(True)
+            self._formats[style] = char_format
+        return char_format
+
+    def _highlight_block(self, block, state):
+        """
+        高亮单个块
+
+        Returns:
+            int: 块结束时的状态
+        """
+        text = block.text()
+        tokens, end_state = self._lexer.tokenize(text, state)
+
+        # QTextLayout 使用 UTF-16 偏移，非 BMP 字符占两个单位
+        ascii_only = text.isascii()
+        ranges = []
+        pos = 0
+        for kind, token in tokens:
+            length = len(token) if ascii_only else len(token.encode("utf-16-le")) // 2
+            style = self._lexer.style_for(kind, token)
+            if style is not None:
+                format_range = QTextLayout.FormatRange()
+                format_range.start = pos
+                format_range.length = length
+                format_range.format = self._format_for(style)
+                ranges.append(format_range)
+            pos += length
+
+        block.layout().setFormats(ranges)
+        block.setUserState(end_state)
+        return end_state
+
+    def _previous_state(self, block):
+        previous = block.previous()
+        if not previous.isValid() or previous.userState() < 0:
+            return STATE_NORMAL
+        return previous.userState()
+
+    def _highlight_until(self, limit, deadline):
+        """从 frontier 开始向后高亮，直到第 limit 块或超过 deadline"""
+        document = self._document
+        block = document.findBlockByNumber(self._frontier)
+        if not block.isValid():
+            return
+        start = block.position()
+        state = self._previous_state(block)
+        end = start
+        while block.isValid() and self._frontier < limit:
+            state = self._highlight_block(block, state)
+            end = block.position() + block.length()
+            self._frontier += 1
+            block = block.next()
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self._mark_dirty(start, end)
+
+    def _mark_dirty(self, start, end):
+        if end <= start:
+            return
+        self._busy = True
+        try:
+            self._document.markContentsDirty(start, end - start)
+        finally:
+            self._busy = False
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        if self._busy:
+            return
+        document = self._document
+        block = document.findBlock(position)
+        if not block.isValid():
+            return
+
+        # 在 frontier 之前插入或删除的行会让 frontier 随之移动
+        block_count = document.blockCount()
+        number = block.blockNumber()
+        if number < self._frontier:
+            self._frontier = max(number, self._frontier + block_count - self._block_count)
+        self._block_count = block_count
+
+        last = document.findBlock(position + chars_added)
+        last_number = last.blockNumber() if last.isValid() else block_count - 1
+        start = block.position()
+        end = start
+        state = self._previous_state(block)
+
+        # 重新高亮被修改的块；之后只要结束状态发生变化就继续向后传播，
+        # 传播超过首屏块数时，剩余部分交给时间片
+        propagated = 0
+        while block.isValid() and block.blockNumber() < self._frontier:
+            old_state = block.userState()
+            state = self._highlight_block(block, state)
+            end = block.position() + block.length()
+            number = block.blockNumber()
+            block = block.next()
+            if number >= last_number:
+                if state == old_state:
+                    break
+                propagated += 1
+                if propagated >= self.first_screen:
+                    self._frontier = number + 1
+                    self._timer.start()
+                    break
+
+        self._mark_dirty(start, end)
+
+    def _advance(self):
+        """在一个时间片内推进 frontier"""
+        deadline = time.perf_counter() + self.slice_ms / 1000
+        self._highlight_until(self._document.blockCount(), deadline)
+        if self.is_finished():
+            self._timer.stop()
+            self.finished.emit()
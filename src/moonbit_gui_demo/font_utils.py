@@ -2,11 +2,170 @@
 # -*- coding: utf-8 -*-
 """
 字体工具模块 - 解决中文显示问题
+
+字体解析由进程级的 FontRegistry 负责：每个字体族列表只解析一次，
+解析时使用一次性的 QFontDatabase.families() 快照（转成 set），
+并按 (role, size, weight) 缓存 QFont 实例。
 """
 
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QFontDatabase
 from PySide6.QtWidgets import QApplication
 
+from startup_profiler import profiler
+
+
+# 中文字体优先级列表（支持 emoji）
+CHINESE_FONTS = [
+    "Segoe UI Emoji",       # Windows emoji 字体
+    "Noto Color Emoji",     # Google emoji 字体
+    "Apple Color Emoji",    # macOS emoji 字体
+    "Microsoft YaHei",      # Windows 微软雅黑
+    "SimHei",               # Windows 黑体
+    "PingFang SC",          # macOS 苹方
+    "Hiragino Sans GB",     # macOS 冬青黑体
+    "Noto Sans CJK SC",     # Linux 思源黑体
+    "WenQuanYi Micro Hei",  # Linux 文泉驿微米黑
+    "DejaVu Sans",          # 通用字体
+    "Arial",                # 通用字体
+    "Helvetica",            # 通用字体
+]
+
+# 等宽字体优先级列表
+MONO_FONTS = [
+    "Consolas",             # Windows
+    "Monaco",               # macOS
+    "DejaVu Sans Mono",     # Linux
+    "Courier New",          # 通用
+    "Courier",              # 通用
+]
+
+# emoji 字体优先级列表
+EMOJI_FONTS = [
+    "Segoe UI Emoji",       # Windows emoji 字体
+    "Noto Color Emoji",     # Google emoji 字体
+    "Apple Color Emoji",    # macOS emoji 字体
+    "Twemoji Mozilla",      # Twitter emoji
+    "EmojiOne Color",       # EmojiOne
+    "JoyPixels",            # JoyPixels
+]
+
+
+def _ensure_app():
+    """创建应用实例（如果还没有的话），QFontDatabase 需要它"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+class FontRegistry:
+    """
+    进程级字体注册表
+
+    每个角色（chinese / mono / emoji）对应一个字体族优先级列表，
+    第一次使用时对照系统字体族快照解析出实际可用的字体族，之后直接复用。
+    返回的 QFont 按 (role, size, weight) 缓存，调用方不应修改它们；
+    需要定制时请先复制：QFont(font)。
+    """
+
+    # 角色 -> (字体族列表, 找不到时的回退角色)
+    ROLES = {
+        "chinese": (CHINESE_FONTS, None),
+        "mono": (MONO_FONTS, None),
+        "emoji": (EMOJI_FONTS, "chinese"),
+    }
+
+    def __init__(self):
+        self._families = None   # QFontDatabase.families() 快照
+        self._resolved = {}     # role -> 字体族名称（None 表示系统默认）
+        self._fonts = {}        # (role, size, weight) -> QFont
+
+    def invalidate(self):
+        """
+        丢弃字体族快照和所有缓存的字体
+
+        在运行时添加字体（例如 QFontDatabase.addApplicationFont）之后调用，
+        下一次请求时会重新解析。
+        """
+        self._families = None
+        self._resolved.clear()
+        self._fonts.clear()
+
+    def available_families(self):
+        """
+        获取系统字体族集合（只查询一次 QFontDatabase）
+
+        Returns:
+            frozenset: 可用的字体族名称
+        """
+        if self._families is None:
+            _ensure_app()
+            with profiler.phase("font.families"):
+                self._families = frozenset(QFontDatabase.families())
+        return self._families
+
+    def resolve_family(self, role):
+        """
+        解析某个角色实际使用的字体族
+
+        Args:
+            role: 字体角色，见 ROLES
+
+        Returns:
+            str | None: 字体族名称，None 表示没有可用字体（使用回退）
+        """
+        if role not in self._resolved:
+            with profiler.phase(f"font.resolve.{role}"):
+                candidates, _ = self.ROLES[role]
+                families = self.available_families()
+                self._resolved[role] = next(
+                    (name for name in candidates if name in families), None
+                )
+        return self._resolved[role]
+
+    def font(self, role, size, weight=None):
+        """
+        获取缓存的字体对象
+
+        Args:
+            role: 字体角色，见 ROLES
+            size: 字体大小
+            weight: 字体粗细，None 表示不设置
+
+        Returns:
+            QFont: 配置好的字体对象（共享实例，请勿修改）
+        """
+        key = (role, size, weight)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._build_font(role, size, weight)
+            self._fonts[key] = font
+        return font
+
+    def _build_font(self, role, size, weight):
+        family = self.resolve_family(role)
+        if family is None:
+            _, fallback = self.ROLES[role]
+            if fallback is not None:
+                return self.font(fallback, size, weight)
+
+        font = QFont(family) if family is not None else QFont()
+        font.setPointSize(size)
+        if weight is not None:
+            font.setWeight(weight)
+        if family is None and role == "mono":
+            font.setFamily("monospace")
+        return font
+
+
+# 进程级共享的注册表
+registry = FontRegistry()
+
+
+def invalidate_fonts():
+    """运行时添加字体后调用，使字体缓存失效"""
+    registry.invalidate()
+
 
 def get_chinese_font(size=12, weight=QFont.Weight.Normal):
     """
@@ -19,42 +178,7 @@ def get_chinese_font(size=12, weight=QFont.Weight.Normal):
     Returns:
         QFont: 配置好的字体对象
     """
-    # 中文字体优先级列表（支持 emoji）
-    chinese_fonts = [
-        "Segoe UI Emoji",       # Windows emoji 字体
-        "Noto Color Emoji",     # Google emoji 字体
-        "Apple Color Emoji",    # macOS emoji 字体
-        "Microsoft YaHei",      # Windows 微软雅黑
-        "SimHei",               # Windows 黑体
-        "PingFang SC",          # macOS 苹方
-        "Hiragino Sans GB",     # macOS 冬青黑体
-        "Noto Sans CJK SC",     # Linux 思源黑体
-        "WenQuanYi Micro Hei",  # Linux 文泉驿微米黑
-        "DejaVu Sans",          # 通用字体
-        "Arial",                # 通用字体
-        "Helvetica",            # 通用字体
-    ]
-    
-    # 创建应用实例（如果还没有的话）
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    
-    # 尝试找到可用的中文字体
-    for font_name in chinese_fonts:
-        font = QFont(font_name)
-        font.setPointSize(size)
-        font.setWeight(weight)
-        
-        # 检查字体是否可用
-        if font.exactMatch():
-            return font
-    
-    # 如果都不可用，使用系统默认字体
-    default_font = QFont()
-    default_font.setPointSize(size)
-    default_font.setWeight(weight)
-    return default_font
+    return registry.font("chinese", size, weight)
 
 
 def get_mono_font(size=11):
@@ -67,34 +191,7 @@ def get_mono_font(size=11):
     Returns:
         QFont: 配置好的等宽字体对象
     """
-    # 等宽字体优先级列表
-    mono_fonts = [
-        "Consolas",             # Windows
-        "Monaco",               # macOS
-        "DejaVu Sans Mono",     # Linux
-        "Courier New",          # 通用
-        "Courier",              # 通用
-    ]
-    
-    # 创建应用实例（如果还没有的话）
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    
-    # 尝试找到可用的等宽字体
-    for font_name in mono_fonts:
-        font = QFont(font_name)
-        font.setPointSize(size)
-        
-        # 检查字体是否可用
-        if font.exactMatch():
-            return font
-    
-    # 如果都不可用，使用系统默认字体
-    default_font = QFont()
-    default_font.setPointSize(size)
-    default_font.setFamily("monospace")
-    return default_font
+    return registry.font("mono", size)
 
 
 def get_emoji_font(size=12):
@@ -107,32 +204,8 @@ def get_emoji_font(size=12):
     Returns:
         QFont: 配置好的 emoji 字体对象
     """
-    # emoji 字体优先级列表
-    emoji_fonts = [
-        "Segoe UI Emoji",       # Windows emoji 字体
-        "Noto Color Emoji",     # Google emoji 字体
-        "Apple Color Emoji",    # macOS emoji 字体
-        "Twemoji Mozilla",      # Twitter emoji
-        "EmojiOne Color",       # EmojiOne
-        "JoyPixels",            # JoyPixels
-    ]
-    
-    # 创建应用实例（如果还没有的话）
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    
-    # 尝试找到可用的 emoji 字体
-    for font_name in emoji_fonts:
-        font = QFont(font_name)
-        font.setPointSize(size)
-        
-        # 检查字体是否可用
-        if font.exactMatch():
-            return font
-    
-    # 如果都不可用，使用支持 emoji 的中文字体
-    return get_chinese_font(size)
+    # 如果都不可用，回退到支持 emoji 的中文字体
+    return registry.font("emoji", size)
 
 
 def test_fonts():
@@ -157,4 +230,4 @@ def test_fonts():
 
 
 if __name__ == "__main__":
-    test_fonts() 
\ No newline at end of file
+    test_fonts()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+语法高亮模块
+
+每种语言实现一个 SyntaxHighlighter 子类：tokenize() 对源码做一次线性扫描，
+产出 (类型, 文本) 标记；基类负责把标记渲染成转义后的 HTML，
+并按内容哈希维护一个 LRU 缓存。新语言通过 register_highlighter 注册。
+"""
+
+import hashlib
+import html
+import re
+from collections import OrderedDict, namedtuple
+
+
+# 标记类型
+TEXT = "text"
+KEYWORD = "keyword"
+IDENTIFIER = "identifier"
+STRING = "string"
+NUMBER = "number"
+COMMENT = "comment"
+
+# 行间状态：普通 / 位于未闭合的块注释中
+STATE_NORMAL = 0
+STATE_BLOCK_COMMENT = 1
+
+# 文本样式：颜色、粗体、斜体
+Style = namedtuple("Style", ["color", "bold", "italic"], defaults=(False, False))
+
+
+def style_to_css(style):
+    """
+    把 Style 转换成内联 CSS
+
+    Args:
+        style: Style 对象
+
+    Returns:
+        str: 内联 CSS 字符串
+    """
+    css = f"color: {style.color};"
+    if style.bold:
+        css += " font-weight: bold;"
+    if style.italic:
+        css += " font-style: italic;"
+    return css
+
+
+class SyntaxHighlighter:
+    """
+    语法高亮器基类
+
+    子类需要设置 language，并实现 tokenize()。
+    """
+
+    language = None
+
+    # 标记类型 -> 样式，没有列出的类型按普通文本输出
+    styles = {}
+
+    def __init__(self, cache_size=32):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()   # 内容哈希 -> HTML
+        self._css = {}                # Style -> 内联 CSS
+
+    def tokenize(self, code, state=STATE_NORMAL):
+        """
+        对源码做词法分析
+
+        Args:
+            code: 源码文本
+            state: 起始状态（用于按行/按块增量高亮）
+
+        Returns:
+            tuple: (标记列表 [(类型, 文本), ...], 结束状态)
+        """
+        raise NotImplementedError
+
+    def style_for(self, kind, text):
+        """
+        获取某个标记的样式
+
+        Args:
+            kind: 标记类型
+            text: 标记文本
+
+        Returns:
+            Style | None: 样式，None 表示不着色
+        """
+        return self.styles.get(kind)
+
+    def highlight(self, code):
+        """
+        把源码渲染成高亮 HTML（带缓存）
+
+        Args:
+            code: 源码文本
+
+        Returns:
+            str: HTML 片段
+        """
+        key = hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        rendered = self.render(code)
+        self._cache[key] = rendered
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rendered
+
+    def render(self, code):
+        """
+        把源码渲染成高亮 HTML（不使用缓存）
+
+        Args:
+            code: 源码文本
+
+        Returns:
+            str: HTML 片段，换行和缩进通过 white-space: pre-wrap 保留
+        """
+        tokens, _ = self.tokenize(code)
+        parts = ['<div style="white-space: pre-wrap;">']
+        append = parts.append
+        escape = html.escape
+        plain = []    # 连续的无样式文本，合并后统一转义
+        for kind, text in tokens:
+            style = self.style_for(kind, text)
+            if style is None:
+                plain.append(text)
+                continue
+            if plain:
+                append(escape("".join(plain), quote=False))
+                plain.clear()
+            css = self._css.get(style)
+            if css is None:
+                css = self._css[style] = style_to_css(style)
+            append(f'<span style="{css}">{escape(text, quote=False)}</span>')
+        if plain:
+            append(escape("".join(plain), quote=False))
+        append("</div>")
+        return "".join(parts)
+
+    def clear_cache(self):
+        """清空已渲染的 HTML 缓存"""
+        self._cache.clear()
+
+
+class PlainTextHighlighter(SyntaxHighlighter):
+    """不做高亮，只转义，用于未注册的语言"""
+
+    language = "text"
+
+    def tokenize(self, code, state=STATE_NORMAL):
+        return [(TEXT, code)] if code else [], state
+
+
+class MoonBitHighlighter(SyntaxHighlighter):
+    """MoonBit 语法高亮"""
+
+    language = "moonbit"
+
+    keywords = frozenset([
+        "fn", "let", "mut", "struct", "enum", "impl", "pub", "priv",
+        "trait", "type", "typealias", "if", "else", "match", "while",
+        "for", "in", "loop", "break", "continue", "return", "guard",
+        "is", "try", "catch", "raise", "async", "test", "derive",
+        "extern", "const", "with", "as", "true", "false",
+    ])
+
+    styles = {
+        KEYWORD: Style("#3B82F6", bold=True),
+        STRING: Style("#34D399"),
+        NUMBER: Style("#F472B6"),
+        COMMENT: Style("#6B7280", italic=True),
+    }
+
+    # 个别关键字沿用原来的配色
+    keyword_styles = {
+        "fn": Style("#F59E0B", bold=True),
+        "pub": Style("#F59E0B", bold=True),
+        "let": Style("#10B981", bold=True),
+        "mut": Style("#EF4444", bold=True),
+        "struct": Style("#8B5CF6", bold=True),
+        "enum": Style("#8B5CF6", bold=True),
+        "impl": Style("#8B5CF6", bold=True),
+    }
+
+    # 所有分支合并成一个正则，逐个匹配即为一次线性扫描
+    _token_re = re.compile(r"""
+        (?P<comment>//[^\n]*)
+      | (?P<block>/\*)
+      | (?P<string>"(?:[^"\\\n]|\\.)*"?|[#$]\|[^\n]*|'(?:[^'\\\n]|\\.)')
+      | (?P<number>0[xX][0-9a-fA-F_]+\w*|0[bB][01_]+\w*
+                  |\d[\d_]*(?:\.\d[\d_]*)?(?:[eE][+-]?\d+)?\w*)
+      | (?P<word>[^\W\d]\w*)
+      | (?P<text>[^\w"'/#$]+|.)
+    """, re.VERBOSE | re.DOTALL)
+
+    def tokenize(self, code, state=STATE_NORMAL):
+        tokens = []
+        append = tokens.append
+        pos = 0
+        end = len(code)
+
+        if state == STATE_BLOCK_COMMENT:
+            pos = self._scan_block_comment(code, 0)
+            if pos > 0:
+                append((COMMENT, code[:pos]))
+            if pos < 0:
+                if code:
+                    append((COMMENT, code))
+                return tokens, STATE_BLOCK_COMMENT
+
+        match = self._token_re.match
+        keywords = self.keywords
+        while pos < end:
+            m = match(code, pos)
+            group = m.lastgroup
+            text = m.group()
+            if group == "word":
+                kind = KEYWORD if text in keywords else IDENTIFIER
+            elif group == "block":
+                close = self._scan_block_comment(code, m.end())
+                if close < 0:
+                    append((COMMENT, code[pos:]))
+                    return tokens, STATE_BLOCK_COMMENT
+                text = code[pos:close]
+                kind = COMMENT
+            elif group == "text":
+                kind = TEXT
+            else:
+                kind = group
+            append((kind, text))
+            pos += len(text)
+
+        return tokens, STATE_NORMAL
+
+    @staticmethod
+    def _scan_block_comment(code, start):
+        """返回块注释结束后的位置；未闭合时返回 -1"""
+        close = code.find("*/", start)
+        return -1 if close < 0 else close + 2
+
+    def style_for(self, kind, text):
+        if kind == KEYWORD:
+            return self.keyword_styles.get(text, self.styles[KEYWORD])
+        return self.styles.get(kind)
+
+
+# 语言名称 -> 高亮器类
+HIGHLIGHTERS = {}
+
+# 语言名称 -> 共享的高亮器实例
+_instances = {}
+
+
+def register_highlighter(cls):
+    """
+    注册高亮器类（可作为类装饰器使用）
+
+    Args:
+        cls: SyntaxHighlighter 子类，language 属性作为语言名称
+
+    Returns:
+        type: 原样返回 cls
+    """
+    HIGHLIGHTERS[cls.language] = cls
+    _instances.pop(cls.language, None)
+    return cls
+
+
+def get_highlighter(language):
+    """
+    获取某种语言的共享高亮器实例
+
+    Args:
+        language: 语言名称
+
+    Returns:
+        SyntaxHighlighter: 高亮器，未注册的语言返回纯文本高亮器
+    """
+    if language not in HIGHLIGHTERS:
+        language = PlainTextHighlighter.language
+    highlighter = _instances.get(language)
+    if highlighter is None:
+        highlighter = _instances[language] = HIGHLIGHTERS[language]()
+    return highlighter
+
+
+register_highlighter(PlainTextHighlighter)
+register_highlighter(MoonBitHighlighter)
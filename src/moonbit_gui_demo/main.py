@@ -7,11 +7,17 @@ MoonBit 风格界面演示程序
 
 import sys
 import os
-from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                               QHBoxLayout, QLabel, QPushButton, QTextEdit, 
-                               QScrollArea, QFrame, QSizePolicy, QTextBrowser)
-from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QTimer
-from PySide6.QtGui import QFont, QPixmap, QPainter, QLinearGradient, QColor, QPalette
+
+# 启动阶段分析（必须先于 PySide6 导入）
+from startup_profiler import profiler
+
+with profiler.phase("import.pyside6"):
+    from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+                                   QHBoxLayout, QLabel, QPushButton, QTextEdit, 
+                                   QScrollArea, QFrame, QSizePolicy, QTextBrowser,
+                                   QPlainTextEdit)
+    from PySide6.QtCore import Qt, QSize, QTimer, QEvent
+    from PySide6.QtGui import QFont, QPixmap, QPainter, QLinearGradient, QColor, QPalette
 
 # 导入字体工具
 try:
@@ -33,9 +39,18 @@ except ImportError:
     def get_emoji_font(size=12):
         return get_chinese_font(size)
 
+# 导入语法高亮
+from highlighter import get_highlighter
+from block_highlighter import BlockHighlighter
+
+# 导入主题
+from theme import apply_theme
+from resources import load as load_resources
+from painted import FeatureCard, PaintedButton
+
 
-class MoonBitStyleButton(QPushButton):
-    """MoonBit 风格的按钮"""
+class MoonBitStyleButton(PaintedButton):
+    """MoonBit 风格的按钮（自绘，外观与 QPushButton[variant="primary"] 相同）"""
     
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
@@ -45,26 +60,6 @@ class MoonBitStyleButton(QPushButton):
         """设置按钮样式"""
         self.setMinimumHeight(50)
         self.setFont(get_chinese_font(12, QFont.Weight.Bold))
-        self.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #8B5CF6, stop:1 #A855F7);
-                border: none;
-                border-radius: 25px;
-                color: white;
-                padding: 10px 30px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #7C3AED, stop:1 #9333EA);
-                transform: scale(1.05);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #6D28D9, stop:1 #7C3AED);
-            }
-        """)
 
 
 class CodeDisplayWidget(QTextBrowser):
@@ -77,16 +72,7 @@ class CodeDisplayWidget(QTextBrowser):
     def setup_style(self):
         """设置代码展示样式"""
         self.setFont(get_mono_font(11))
-        self.setStyleSheet("""
-            QTextBrowser {
-                background-color: #1E1E1E;
-                color: #E5E7EB;
-                border: 2px solid #374151;
-                border-radius: 10px;
-                padding: 15px;
-                selection-background-color: #3B82F6;
-            }
-        """)
+        self.setProperty("role", "code")
         self.setOpenExternalLinks(False)
         
     def set_code(self, code, language="moonbit"):
@@ -96,39 +82,103 @@ class CodeDisplayWidget(QTextBrowser):
         self.setHtml(highlighted_code)
         
     def highlight_syntax(self, code, language):
-        """简单的语法高亮"""
-        if language == "moonbit":
-            # MoonBit 语法高亮
-            code = code.replace("fn", "<span style='color: #F59E0B; font-weight: bold;'>fn</span>")
-            code = code.replace("let", "<span style='color: #10B981; font-weight: bold;'>let</span>")
-            code = code.replace("mut", "<span style='color: #EF4444; font-weight: bold;'>mut</span>")
-            code = code.replace("struct", "<span style='color: #8B5CF6; font-weight: bold;'>struct</span>")
-            code = code.replace("enum", "<span style='color: #8B5CF6; font-weight: bold;'>enum</span>")
-            code = code.replace("impl", "<span style='color: #8B5CF6; font-weight: bold;'>impl</span>")
-            code = code.replace("pub", "<span style='color: #F59E0B; font-weight: bold;'>pub</span>")
-            code = code.replace("//", "<span style='color: #6B7280; font-style: italic;'>//")
-            code = code.replace("/*", "<span style='color: #6B7280; font-style: italic;'>/*")
-            code = code.replace("*/", "*/</span>")
-            
-            # 将换行符转换为 HTML 换行
-            code = code.replace("\n", "<br>")
+        """语法高亮，返回 HTML"""
+        return get_highlighter(language).highlight(code)
+
+
+class CodeEditorWidget(QPlainTextEdit):
+    """
+    代码编辑组件（增量高亮模式）
+
+    与 CodeDisplayWidget 外观相同，但不生成 HTML：BlockHighlighter 按块
+    保存高亮状态，编辑时只重新高亮受影响的块，大文档在空闲时间片中完成高亮。
+    适合作为大文件的实时编辑器或日志查看器。
+
+    基于 QPlainTextEdit 而不是 QTextBrowser：后者的文档布局在任何块的格式
+    变化后都会从该块一直重新布局到文档末尾，抵消了按块高亮的收益。
+    """
+    
+    def __init__(self, parent=None, language="moonbit"):
+        super().__init__(parent)
+        self.highlighter = BlockHighlighter(self.document(), language)
+        self.setup_style()
         
-        return code
+    def setup_style(self):
+        """设置代码编辑样式"""
+        self.setFont(get_mono_font(11))
+        self.setProperty("role", "code")
+        
+    def set_code(self, code, language="moonbit"):
+        """设置代码内容：同步高亮首屏，其余部分在空闲时间片中完成"""
+        self.highlighter.set_language(language, rehighlight=False)
+        self.highlighter.reset()
+        self.setPlainText(code)
+        self.highlighter.rehighlight()
+
+
+class LazySection(QWidget):
+    """
+    延迟构建的内容区块
+
+    构建前只是一个保留了高度的空占位，build() 时才调用 builder
+    把真正的区块加到自己的布局中。
+    """
+    
+    def __init__(self, builder, height_hint, parent=None):
+        super().__init__(parent)
+        self.builder = builder
+        self.height_hint = height_hint
+        self.built = False
+        self.section_layout = QVBoxLayout(self)
+        self.section_layout.setContentsMargins(0, 0, 0, 0)
+        self.setMinimumHeight(height_hint)
+        
+    def sizeHint(self):
+        if not self.built:
+            return QSize(0, self.height_hint)
+        return super().sizeHint()
+        
+    def build(self):
+        """构建区块（只会执行一次）"""
+        if self.built:
+            return
+        self.built = True
+        self.builder(self.section_layout)
+        self.setMinimumHeight(0)
+        self.updateGeometry()
 
 
 class MoonBitMainWindow(QMainWindow):
-    """MoonBit 主窗口"""
+    """
+    MoonBit 主窗口
+
+    lazy_sections=True 时主内容区的各个区块先以占位形式加入布局，
+    接近滚动区域可视范围时才构建；首次绘制之后，剩余的区块在空闲时
+    每个事件循环构建一个。
+    """
     
-    def __init__(self):
+    # 区块构建函数名称及其占位高度
+    SECTIONS = [
+        ("create_welcome_section", 370),
+        ("create_features_section", 320),
+        ("create_code_section", 540),
+        ("create_download_section", 260),
+    ]
+    
+    def __init__(self, lazy_sections=False):
         super().__init__()
+        self.lazy_sections = lazy_sections
+        self.lazy_placeholders = []
+        self.sections_tracking = False
         self.init_ui()
         
     def init_ui(self):
         """初始化用户界面"""
         self.setWindowTitle("MoonBit - 现代化的编程语言")
         self.setMinimumSize(1000, 700)
-        self.setup_central_widget()
+        # 先安装主题，控件创建后只需 polish 一次
         self.setup_styles()
+        self.setup_central_widget()
         
     def setup_central_widget(self):
         """设置中央组件"""
@@ -149,17 +199,12 @@ class MoonBitMainWindow(QMainWindow):
         # 底部信息
         self.create_footer(main_layout)
         
+    @profiler.profiled
     def create_header(self, parent_layout):
         """创建顶部导航栏"""
         header = QFrame()
         header.setFixedHeight(80)
-        header.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #8B5CF6, stop:1 #A855F7);
-                border: none;
-            }
-        """)
+        header.setObjectName("header")
         
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(30, 0, 30, 0)
@@ -167,7 +212,7 @@ class MoonBitMainWindow(QMainWindow):
         # Logo 和标题
         title_label = QLabel("🌙 MoonBit")
         title_label.setFont(get_emoji_font(24))
-        title_label.setStyleSheet("color: white;")
+        title_label.setObjectName("headerTitle")
         
         # 导航按钮
         nav_layout = QHBoxLayout()
@@ -177,18 +222,7 @@ class MoonBitMainWindow(QMainWindow):
         for text in nav_buttons:
             btn = QPushButton(text)
             btn.setFont(get_chinese_font(12))
-            btn.setStyleSheet("""
-                QPushButton {
-                    background: transparent;
-                    border: none;
-                    color: white;
-                    padding: 8px 16px;
-                    border-radius: 6px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(255, 255, 255, 0.1);
-                }
-            """)
+            btn.setProperty("variant", "nav")
             nav_layout.addWidget(btn)
         
         header_layout.addWidget(title_label)
@@ -197,62 +231,96 @@ class MoonBitMainWindow(QMainWindow):
         
         parent_layout.addWidget(header)
         
+    @profiler.profiled
     def create_main_content(self, parent_layout):
         """创建主内容区域"""
         # 创建滚动区域
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                background: #F3F4F6;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background: #D1D5DB;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #9CA3AF;
-            }
-        """)
+        scroll_area.setObjectName("mainScroll")
         
         content_widget = QWidget()
         content_layout = QVBoxLayout(content_widget)
         content_layout.setContentsMargins(40, 40, 40, 40)
         content_layout.setSpacing(40)
         
-        # 欢迎区域
-        self.create_welcome_section(content_layout)
-        
-        # 特性展示区域
-        self.create_features_section(content_layout)
-        
-        # 代码展示区域
-        self.create_code_section(content_layout)
-        
-        # 下载区域
-        self.create_download_section(content_layout)
-        
         scroll_area.setWidget(content_widget)
         parent_layout.addWidget(scroll_area)
-        
+        self.scroll_area = scroll_area
+        
+        # 欢迎区域、特性展示区域、代码展示区域、下载区域
+        for builder_name, height_hint in self.SECTIONS:
+            builder = getattr(self, builder_name)
+            if not self.lazy_sections:
+                builder(content_layout)
+                continue
+            placeholder = LazySection(builder, height_hint)
+            content_layout.addWidget(placeholder)
+            self.lazy_placeholders.append(placeholder)
+        
+        if self.lazy_placeholders:
+            scroll_area.viewport().installEventFilter(self)
+            self.idle_build_timer = QTimer(self)
+            self.idle_build_timer.setInterval(0)
+            connect_slot(self.idle_build_timer.timeout, self.build_next_section)
+        
+    def build_visible_sections(self):
+        """构建进入（或接近）可视范围的区块，上下各预取半屏"""
+        viewport = self.scroll_area.viewport()
+        margin = viewport.height() // 2
+        top = self.scroll_area.verticalScrollBar().value() - margin
+        bottom = top + viewport.height() + 2 * margin
+        for placeholder in self.lazy_placeholders:
+            if placeholder.built:
+                continue
+            geometry = placeholder.geometry()
+            if geometry.bottom() >= top and geometry.top() <= bottom:
+                placeholder.build()
+        
+    def build_next_section(self):
+        """空闲时构建下一个尚未构建的区块，全部完成后停止"""
+        for placeholder in self.lazy_placeholders:
+            if not placeholder.built:
+                placeholder.build()
+                return
+        self.idle_build_timer.stop()
+        
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.lazy_placeholders:
+            # 滚动区域此时还没有调整内容控件的尺寸，先手动完成布局，
+            # 确保首帧就包含可视范围内的区块
+            self.centralWidget().layout().activate()
+            viewport = self.scroll_area.viewport()
+            content_widget = self.scroll_area.widget()
+            content_widget.resize(
+                viewport.width(),
+                max(content_widget.sizeHint().height(), viewport.height()),
+            )
+            content_widget.layout().activate()
+            self.build_visible_sections()
+            
+            # 布局完成之后才跟踪滚动，之前占位的位置都还无效
+            if not self.sections_tracking:
+                self.sections_tracking = True
+                scroll_bar = self.scroll_area.verticalScrollBar()
+                connect_slot(scroll_bar.valueChanged, self.build_visible_sections)
+                connect_slot(scroll_bar.rangeChanged, self.build_visible_sections)
+        
+    def eventFilter(self, watched, event):
+        if (self.lazy_placeholders and event.type() == QEvent.Type.Paint
+                and watched is self.scroll_area.viewport()
+                and not self.idle_build_timer.isActive()
+                and not all(p.built for p in self.lazy_placeholders)):
+            # 首次绘制之后开始空闲构建
+            self.idle_build_timer.start()
+        return super().eventFilter(watched, event)
+        
+    @profiler.profiled
     def create_welcome_section(self, parent_layout):
         """创建欢迎区域"""
         welcome_frame = QFrame()
-        welcome_frame.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #F8FAFC, stop:1 #F1F5F9);
-                border-radius: 20px;
-                padding: 20px;
-            }
-        """)
+        welcome_frame.setObjectName("welcomeSection")
         
         welcome_layout = QVBoxLayout(welcome_frame)
         welcome_layout.setSpacing(20)
@@ -260,13 +328,13 @@ class MoonBitMainWindow(QMainWindow):
         # 主标题
         title = QLabel("欢迎使用 MoonBit")
         title.setFont(get_chinese_font(36, QFont.Weight.Bold))
-        title.setStyleSheet("color: #1F2937; text-align: center;")
+        title.setProperty("role", "title")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # 副标题
         subtitle = QLabel("现代化的编程语言，专为高性能和易用性而设计")
         subtitle.setFont(get_chinese_font(18))
-        subtitle.setStyleSheet("color: #6B7280; text-align: center;")
+        subtitle.setProperty("role", "subtitle")
         subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # 描述
@@ -279,7 +347,7 @@ class MoonBitMainWindow(QMainWindow):
         • 强大工具链：提供完整的开发工具和包管理系统
         """)
         description.setFont(get_chinese_font(14))
-        description.setStyleSheet("color: #374151; line-height: 1.6;")
+        description.setProperty("role", "body")
         description.setWordWrap(True)
         
         welcome_layout.addWidget(title)
@@ -288,16 +356,11 @@ class MoonBitMainWindow(QMainWindow):
         
         parent_layout.addWidget(welcome_frame)
         
+    @profiler.profiled
     def create_features_section(self, parent_layout):
         """创建特性展示区域"""
         features_frame = QFrame()
-        features_frame.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 20px;
-                border: 1px solid #E5E7EB;
-            }
-        """)
+        features_frame.setObjectName("featuresSection")
         
         features_layout = QVBoxLayout(features_frame)
         features_layout.setContentsMargins(30, 30, 30, 30)
@@ -306,7 +369,7 @@ class MoonBitMainWindow(QMainWindow):
         # 标题
         title = QLabel("核心特性")
         title.setFont(get_chinese_font(28, QFont.Weight.Bold))
-        title.setStyleSheet("color: #1F2937; text-align: center;")
+        title.setProperty("role", "title")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # 特性网格
@@ -330,59 +393,15 @@ class MoonBitMainWindow(QMainWindow):
         parent_layout.addWidget(features_frame)
         
     def create_feature_card(self, icon, name, description):
-        """创建特性卡片"""
-        card = QFrame()
-        card.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #F8FAFC, stop:1 #F1F5F9);
-                border-radius: 15px;
-                border: 1px solid #E5E7EB;
-                padding: 20px;
-            }
-            QFrame:hover {
-                border: 2px solid #8B5CF6;
-                transform: translateY(-2px);
-            }
-        """)
-        
-        layout = QVBoxLayout(card)
-        layout.setSpacing(15)
-        
-        # 图标
-        icon_label = QLabel(icon)
-        icon_label.setFont(get_emoji_font(32))
-        icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # 名称
-        name_label = QLabel(name)
-        name_label.setFont(get_chinese_font(16, QFont.Weight.Bold))
-        name_label.setStyleSheet("color: #1F2937; text-align: center;")
-        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # 描述
-        desc_label = QLabel(description)
-        desc_label.setFont(get_chinese_font(12))
-        desc_label.setStyleSheet("color: #6B7280; text-align: center; line-height: 1.4;")
-        desc_label.setWordWrap(True)
-        desc_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        layout.addWidget(icon_label)
-        layout.addWidget(name_label)
-        layout.addWidget(desc_label)
-        
-        return card
+        """创建特性卡片（自绘，外观与 QFrame[role="featureCard"] 相同）"""
+        fonts = (get_emoji_font(32), get_chinese_font(16, QFont.Weight.Bold), get_chinese_font(12))
+        return FeatureCard(icon, name, description, fonts)
         
+    @profiler.profiled
     def create_code_section(self, parent_layout):
         """创建代码展示区域"""
         code_frame = QFrame()
-        code_frame.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 20px;
-                border: 1px solid #E5E7EB;
-            }
-        """)
+        code_frame.setObjectName("codeSection")
         
         code_layout = QVBoxLayout(code_frame)
         code_layout.setContentsMargins(30, 30, 30, 30)
@@ -391,7 +410,7 @@ class MoonBitMainWindow(QMainWindow):
         # 标题
         title = QLabel("代码示例")
         title.setFont(get_chinese_font(28, QFont.Weight.Bold))
-        title.setStyleSheet("color: #1F2937; text-align: center;")
+        title.setProperty("role", "title")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # 代码展示
@@ -438,17 +457,11 @@ fn main() {
         
         parent_layout.addWidget(code_frame)
         
+    @profiler.profiled
     def create_download_section(self, parent_layout):
         """创建下载区域"""
         download_frame = QFrame()
-        download_frame.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #8B5CF6, stop:1 #A855F7);
-                border-radius: 20px;
-                padding: 20px;
-            }
-        """)
+        download_frame.setObjectName("downloadSection")
         
         download_layout = QVBoxLayout(download_frame)
         download_layout.setSpacing(20)
@@ -456,13 +469,13 @@ fn main() {
         # 标题
         title = QLabel("立即开始使用 MoonBit")
         title.setFont(get_chinese_font(28, QFont.Weight.Bold))
-        title.setStyleSheet("color: white; text-align: center;")
+        title.setProperty("role", "titleInverse")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # 描述
         desc = QLabel("下载最新版本，开始您的 MoonBit 编程之旅")
         desc.setFont(get_chinese_font(16))
-        desc.setStyleSheet("color: rgba(255, 255, 255, 0.9); text-align: center;")
+        desc.setProperty("role", "subtitleInverse")
         desc.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # 按钮区域
@@ -471,25 +484,13 @@ fn main() {
         
         download_btn = MoonBitStyleButton("📥 下载 MoonBit")
         download_btn.setMinimumWidth(200)
-        download_btn.clicked.connect(self.on_download_clicked)
+        connect_slot(download_btn.clicked, self.on_download_clicked)
         
         docs_btn = QPushButton("📚 查看文档")
         docs_btn.setFont(get_emoji_font(12))
-        docs_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                border: 2px solid white;
-                border-radius: 25px;
-                color: white;
-                padding: 10px 30px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: rgba(255, 255, 255, 0.1);
-            }
-        """)
+        docs_btn.setProperty("variant", "outline")
         docs_btn.setMinimumWidth(200)
-        docs_btn.clicked.connect(self.on_docs_clicked)
+        connect_slot(docs_btn.clicked, self.on_docs_clicked)
         
         button_layout.addStretch()
         button_layout.addWidget(download_btn)
@@ -502,16 +503,12 @@ fn main() {
         
         parent_layout.addWidget(download_frame)
         
+    @profiler.profiled
     def create_footer(self, parent_layout):
         """创建底部信息"""
         footer = QFrame()
         footer.setFixedHeight(60)
-        footer.setStyleSheet("""
-            QFrame {
-                background: #1F2937;
-                border: none;
-            }
-        """)
+        footer.setObjectName("footer")
         
         footer_layout = QHBoxLayout(footer)
         footer_layout.setContentsMargins(30, 0, 30, 0)
@@ -519,7 +516,7 @@ fn main() {
         # 版权信息
         copyright_label = QLabel("© 2024 MoonBit. 保留所有权利。")
         copyright_label.setFont(get_chinese_font(12))
-        copyright_label.setStyleSheet("color: #9CA3AF;")
+        copyright_label.setObjectName("copyright")
         
         # 链接
         links_layout = QHBoxLayout()
@@ -529,17 +526,7 @@ fn main() {
         for link in links:
             link_btn = QPushButton(link)
             link_btn.setFont(get_chinese_font(12))
-            link_btn.setStyleSheet("""
-                QPushButton {
-                    background: transparent;
-                    border: none;
-                    color: #9CA3AF;
-                    padding: 5px 10px;
-                }
-                QPushButton:hover {
-                    color: white;
-                }
-            """)
+            link_btn.setProperty("variant", "footerLink")
             links_layout.addWidget(link_btn)
         
         footer_layout.addWidget(copyright_label)
@@ -549,13 +536,8 @@ fn main() {
         parent_layout.addWidget(footer)
         
     def setup_styles(self):
-        """设置全局样式"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #F8FAFC, stop:1 #F1F5F9);
-            }
-        """)
+        """设置全局样式（应用级主题样式表）"""
+        apply_theme()
         
     def on_download_clicked(self):
         """下载按钮点击事件"""
@@ -568,21 +550,75 @@ fn main() {
         # 这里可以添加打开文档的逻辑
 
 
+# 已安装的卡顿监视器（见 install_diagnostics）
+_lag_monitor = None
+
+
+def install_diagnostics(app):
+    """
+    安装由环境变量启用的诊断工具（位于 src/）
+
+    - MOONBIT_GUI_LEAKS：定期报告控件和内存增长（leak_tracker.py）
+    - MOONBIT_GUI_LAG：事件循环延迟和慢槽函数（lag_monitor.py），
+      需要在创建窗口之前安装，之后通过 connect_slot 建立的连接才会计时
+    """
+    global _lag_monitor
+    if all(os.environ.get(name, "") in ("", "0") for name in ("MOONBIT_GUI_LEAKS", "MOONBIT_GUI_LAG")):
+        return
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import lag_monitor
+    import leak_tracker
+    leak_tracker.install(app)
+    _lag_monitor = lag_monitor.install(app)
+
+
+def connect_slot(signal, slot):
+    """连接信号和槽；启用卡顿监视器时记录槽函数的耗时"""
+    signal.connect(slot if _lag_monitor is None else _lag_monitor.wrap(slot))
+
+
+def run_event_loop(app):
+    """
+    运行事件循环
+
+    设置环境变量 MOONBIT_GUI_ASYNCIO=1 时使用集成了 asyncio 的事件循环
+    （见 src/async_loop.py），槽函数可以是协程函数。
+    """
+    if os.environ.get("MOONBIT_GUI_ASYNCIO", "") not in ("", "0"):
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from async_loop import exec_async
+        return exec_async(app)
+    return app.exec()
+
+
 def main():
     """主函数"""
-    app = QApplication(sys.argv)
+    with profiler.phase("qapplication"):
+        app = QApplication(sys.argv)
+
+    # 注册编译好的资源包（python resources.py 生成），不存在时使用零散的文件
+    with profiler.phase("resources"):
+        load_resources()
     
     # 设置应用程序信息
     app.setApplicationName("MoonBit GUI Demo")
     app.setApplicationVersion("1.0.0")
     app.setOrganizationName("MoonBit")
+
+    install_diagnostics(app)
     
     # 创建主窗口
-    window = MoonBitMainWindow()
-    window.show()
+    with profiler.phase("window"):
+        window = MoonBitMainWindow(lazy_sections=True)
+    with profiler.phase("show"):
+        window.show()
+    profiler.watch_first_paint(window)
     
     # 运行应用程序
-    sys.exit(app.exec())
+    status = run_event_loop(app)
+    # 首帧之前就退出时也输出已记录的阶段
+    profiler.finish()
+    sys.exit(status)
 
 
 if __name__ == "__main__":
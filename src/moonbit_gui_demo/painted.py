@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自绘控件
+
+主按钮和特性卡片的渐变、圆角和悬停效果原来完全来自样式表，
+每次重绘都要经过样式表引擎（QStyleSheetStyle）计算规则和绘制背景。
+这里用 QPainter 画出相同的外观：
+
+- 渐变画刷使用 ObjectBoundingMode，和控件尺寸无关，按颜色缓存
+- 每种状态（普通 / 悬停 / 按下 / 禁用）的背景预先渲染成 QPixmap，
+  按 (种类, 状态, 尺寸, 设备像素比, 调色板版本) 在所有实例之间共享；
+  尺寸或设备像素比变化时控件丢弃自己持有的背景，重新从缓存中取
+- 卡片的文字用 QStaticText，只在宽度或字体变化时重新排版
+
+颜色来自 theme.active_tokens()，apply_theme 覆盖调色板后缓存自动失效。
+"""
+
+import re
+from collections import OrderedDict
+from functools import lru_cache
+
+from PySide6.QtCore import QEvent, QPointF, QRectF, QSize, Qt
+from PySide6.QtGui import (QBrush, QColor, QFont, QFontMetrics, QLinearGradient, QPainter, QPen,
+                           QPixmap, QStaticText, QTextOption)
+from PySide6.QtWidgets import QPushButton, QSizePolicy, QWidget
+
+import theme
+
+
+_RGBA_RE = re.compile(r"rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*([\d.]+)\s*)?\)")
+
+# 共享的背景缓存最多保留的图片数量
+BACKGROUND_CACHE_SIZE = 64
+_backgrounds = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def color(value):
+    """把调色板令牌（#RRGGBB、颜色名或 rgba(...)）转换为 QColor"""
+    match = _RGBA_RE.fullmatch(value.strip())
+    if match:
+        red, green, blue, alpha = match.groups()
+        alpha = float(alpha) if alpha is not None else 1.0
+        return QColor(int(red), int(green), int(blue), round(alpha * 255))
+    return QColor(value)
+
+
+@lru_cache(maxsize=None)
+def gradient_brush(start, stop, horizontal=True):
+    """和尺寸无关的线性渐变画刷（ObjectBoundingMode）"""
+    gradient = QLinearGradient(0, 0, 1, 0) if horizontal else QLinearGradient(0, 0, 0, 1)
+    gradient.setCoordinateMode(QLinearGradient.CoordinateMode.ObjectBoundingMode)
+    gradient.setColorAt(0, color(start))
+    gradient.setColorAt(1, color(stop))
+    return QBrush(gradient)
+
+
+def background(kind, state, size, dpr, render):
+    """
+    取共享的背景图片，不存在时调用 render(painter, rect, state) 渲染
+
+    Args:
+        kind: 控件种类（同一种类、状态和尺寸的控件共用一张图片）
+        state: 状态名
+        size: QSize
+        dpr: 设备像素比
+        render: 绘制函数
+    """
+    key = (kind, state, size.width(), size.height(), dpr, theme.palette_version())
+    pixmap = _backgrounds.get(key)
+    if pixmap is not None:
+        _backgrounds.move_to_end(key)
+        return pixmap
+    pixmap = QPixmap(size * dpr)
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    render(painter, QRectF(0, 0, size.width(), size.height()), state)
+    painter.end()
+    _backgrounds[key] = pixmap
+    while len(_backgrounds) > BACKGROUND_CACHE_SIZE:
+        _backgrounds.popitem(last=False)
+    return pixmap
+
+
+def clear_cache():
+    _backgrounds.clear()
+
+
+class _CachedBackgroundMixin:
+    """按状态持有背景图片；尺寸或设备像素比变化时丢弃"""
+
+    KIND = ""
+
+    def _init_background(self):
+        self._pixmaps = {}
+        self._pixmap_key = None
+        self.setAttribute(Qt.WidgetAttribute.WA_Hover)
+
+    def _background(self, state):
+        key = (self.size(), self.devicePixelRatioF(), theme.palette_version())
+        if key != self._pixmap_key:
+            self._pixmaps.clear()
+            self._pixmap_key = key
+        pixmap = self._pixmaps.get(state)
+        if pixmap is None:
+            pixmap = background(self.KIND, state, self.size(), key[1], self.render_background)
+            self._pixmaps[state] = pixmap
+        return pixmap
+
+
+class PaintedButton(_CachedBackgroundMixin, QPushButton):
+    """
+    自绘的主按钮，外观与样式表中的 QPushButton[variant="primary"] 相同
+    """
+
+    KIND = "primaryButton"
+    RADIUS = 25
+    PADDING = (30, 10)
+
+    # 状态 -> (渐变起点令牌, 终点令牌)
+    GRADIENTS = {
+        "normal": ("primary", "primary_light"),
+        "hover": ("primary_hover", "primary_hover_light"),
+        "pressed": ("primary_pressed", "primary_hover"),
+        "disabled": ("primary", "primary_light"),
+    }
+
+    def __init__(self, text="", parent=None):
+        super().__init__(text, parent)
+        self._init_background()
+
+    def state(self):
+        if not self.isEnabled():
+            return "disabled"
+        if self.isDown():
+            return "pressed"
+        if self.underMouse():
+            return "hover"
+        return "normal"
+
+    def render_background(self, painter, rect, state):
+        tokens = theme.active_tokens()
+        start, stop = self.GRADIENTS[state]
+        radius = min(self.RADIUS, rect.height() / 2)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(gradient_brush(tokens[start], tokens[stop]))
+        painter.drawRoundedRect(rect, radius, radius)
+
+    def paintEvent(self, event):
+        state = self.state()
+        painter = QPainter(self)
+        if state == "disabled":
+            painter.setOpacity(0.5)
+        painter.drawPixmap(0, 0, self._background(state))
+        painter.setPen(color(theme.active_tokens()["text_inverse"]))
+        painter.setFont(self.font())
+        painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.text())
+
+    def sizeHint(self):
+        metrics = self.fontMetrics()
+        horizontal, vertical = self.PADDING
+        return QSize(metrics.horizontalAdvance(self.text()) + horizontal * 2,
+                     max(metrics.height() + vertical * 2, self.minimumHeight()))
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def event(self, event):
+        # 悬停状态只影响背景，进入 / 离开时重绘
+        if event.type() in (QEvent.Type.HoverEnter, QEvent.Type.HoverLeave):
+            self.update()
+        return super().event(event)
+
+
+class FeatureCard(_CachedBackgroundMixin, QWidget):
+    """
+    自绘的特性卡片：图标、名称和描述居中排列，
+    外观与样式表中的 QFrame[role="featureCard"] 相同
+    """
+
+    KIND = "featureCard"
+    RADIUS = 15
+    PADDING = 30
+    SPACING = 15
+
+    def __init__(self, icon, name, description, fonts=None, parent=None):
+        """
+        Args:
+            icon: 图标文本（emoji）
+            name: 名称
+            description: 描述，按宽度自动换行
+            fonts: (图标字体, 名称字体, 描述字体)，默认使用控件字体
+        """
+        super().__init__(parent)
+        self._init_background()
+        self._texts = (icon, name, description)
+        self._fonts = tuple(fonts) if fonts else (QFont(self.font()),) * 3
+        self._static = None
+        self._layout_width = -1
+        policy = QSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
+        policy.setHeightForWidth(True)
+        self.setSizePolicy(policy)
+
+    def set_fonts(self, icon_font, name_font, description_font):
+        self._fonts = (icon_font, name_font, description_font)
+        self._layout_width = -1
+        self.updateGeometry()
+        self.update()
+
+    def text(self, index):
+        return self._texts[index]
+
+    def state(self):
+        return "hover" if self.underMouse() else "normal"
+
+    def render_background(self, painter, rect, state):
+        tokens = theme.active_tokens()
+        width = 2 if state == "hover" else 1
+        painter.setPen(QPen(color(tokens["primary" if state == "hover" else "border"]), width))
+        painter.setBrush(gradient_brush(tokens["surface_top"], tokens["surface_bottom"], horizontal=False))
+        inset = width / 2
+        painter.drawRoundedRect(rect.adjusted(inset, inset, -inset, -inset), self.RADIUS, self.RADIUS)
+
+    def _text_heights(self, width):
+        flags = Qt.AlignmentFlag.AlignHCenter | Qt.TextFlag.TextWordWrap
+        return [
+            QFontMetrics(font).boundingRect(0, 0, max(1, width), 100000, flags, text).height()
+            for text, font in zip(self._texts, self._fonts)
+        ]
+
+    def _prepare(self):
+        """按当前宽度排版文字，宽度不变时直接复用"""
+        width = self.width() - self.PADDING * 2
+        if width == self._layout_width:
+            return
+        option = QTextOption(Qt.AlignmentFlag.AlignHCenter)
+        option.setWrapMode(QTextOption.WrapMode.WordWrap)
+        self._static = []
+        for text, font in zip(self._texts, self._fonts):
+            static = QStaticText(text)
+            static.setTextFormat(Qt.TextFormat.PlainText)
+            static.setTextOption(option)
+            static.setTextWidth(max(1, width))
+            static.prepare(font=font)
+            self._static.append(static)
+        self._heights = self._text_heights(width)
+        self._layout_width = width
+
+    def hasHeightForWidth(self):
+        return True
+
+    def heightForWidth(self, width):
+        heights = self._text_heights(width - self.PADDING * 2)
+        return sum(heights) + self.SPACING * (len(heights) - 1) + self.PADDING * 2
+
+    def sizeHint(self):
+        return QSize(220, self.heightForWidth(220))
+
+    def minimumSizeHint(self):
+        return QSize(160, self.heightForWidth(160))
+
+    def paintEvent(self, event):
+        self._prepare()
+        tokens = theme.active_tokens()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._background(self.state()))
+        pens = (tokens["text_title"], tokens["text_title"], tokens["text_muted"])
+        y = self.PADDING
+        for static, font, pen, height in zip(self._static, self._fonts, pens, self._heights):
+            painter.setFont(font)
+            painter.setPen(color(pen))
+            painter.drawStaticText(QPointF(self.PADDING, y), static)
+            y += height + self.SPACING
+
+    def event(self, event):
+        kind = event.type()
+        if kind in (QEvent.Type.HoverEnter, QEvent.Type.HoverLeave):
+            self.update()
+        elif kind == QEvent.Type.FontChange:
+            self._layout_width = -1
+        return super().event(event)
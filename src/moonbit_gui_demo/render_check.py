@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离屏渲染计时与基准图片对比
+
+在 offscreen 平台下按多个窗口尺寸和设备像素比（DPR）渲染 MoonBitMainWindow，
+分别测量：
+
+- build：构建窗口（立即构建全部区块，保证每次渲染的内容相同）
+- polish：对所有控件 ensurePolished（样式表匹配）
+- layout：resize + show 后激活布局并处理所有 LayoutRequest
+- paint：grab() 渲染整个窗口（多次取中位数）
+
+渲染结果与保存的基准图片（golden/main_window_<宽>x<高>@<DPR>x.png）比较：
+逐像素比较 RGB 通道，差值超过 --tolerance 的通道所占比例大于 --max-diff（百分比）
+时判定为视觉回退，实际图片和放大后的差异图写入 --artifacts 目录。
+--update 时用本次渲染结果覆盖基准图片。
+
+基准图片依赖系统字体和 Qt 版本，应在 CI 使用的同一镜像上生成。
+每个 DPR 在单独的子进程中运行（QT_SCALE_FACTOR 只能在创建 QApplication 之前设置）。
+计时结果的格式与 benchmark.py 相同，可以用 --baseline 对比。
+
+用法：
+    python3 render_check.py --update                     # 生成基准图片
+    python3 render_check.py --output render.json         # 检查并保存计时
+    python3 render_check.py --baseline render.json --fail-on-regression
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_SIZES = ("1000x700", "1280x800", "1600x1000")
+DEFAULT_DPRS = ("1", "2")
+DEFAULT_GOLDEN = os.path.join(_HERE, "golden")
+DEFAULT_ARTIFACTS = os.path.join(_HERE, "render_artifacts")
+
+
+def golden_name(width, height, dpr):
+    return f"main_window_{width}x{height}@{dpr:g}x.png"
+
+
+def parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def compare_images(actual, expected, tolerance):
+    """
+    比较两张图片
+
+    Returns:
+        tuple: (差异比例（百分比），差异图 QImage 或 None)；尺寸不同时比例为 100
+    """
+    from PySide6.QtGui import QImage, QPainter
+
+    if actual.size() != expected.size():
+        return 100.0, None
+    diff = expected.convertToFormat(QImage.Format.Format_RGB32)
+    painter = QPainter(diff)
+    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Difference)
+    painter.drawImage(0, 0, actual.convertToFormat(QImage.Format.Format_RGB32))
+    painter.end()
+
+    # 差异图的每个通道为 |a - b|；转换为 RGB888 去掉 alpha，
+    # 用 translate 把超过容差的字节映射为 1 后计数
+    rgb = diff.convertToFormat(QImage.Format.Format_RGB888)
+    table = bytes(1 if value > tolerance else 0 for value in range(256))
+    bits = rgb.constBits()
+    stride, row_bytes = rgb.bytesPerLine(), rgb.width() * 3
+    over = 0
+    for y in range(rgb.height()):
+        over += bytes(bits[y * stride:y * stride + row_bytes]).translate(table).count(1)
+    ratio = over / (row_bytes * rgb.height()) * 100
+    return ratio, diff if over else None
+
+
+def _amplify(diff):
+    """把差异放大便于查看：非零通道拉到最大"""
+    from PySide6.QtGui import QImage
+    amplified = diff.convertToFormat(QImage.Format.Format_RGB888)
+    table = bytes([0] + [255] * 255)
+    bits = amplified.bits()
+    bits[:] = bytes(bits).translate(table)
+    return amplified
+
+
+def render_dpr(options, dpr):
+    """在当前进程中渲染一个 DPR 下的所有尺寸（子进程入口）"""
+    sys.path.insert(0, _HERE)
+    from PySide6.QtCore import QEvent
+    from PySide6.QtWidgets import QApplication, QWidget
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    import main
+    main.load_resources()
+
+    results, visual = {}, []
+    for size in options.sizes:
+        width, height = parse_size(size)
+        timings = {}
+
+        start = time.perf_counter()
+        window = main.MoonBitMainWindow(lazy_sections=False)
+        timings["build_ms"] = (time.perf_counter() - start) * 1000
+
+        widgets = [window] + window.findChildren(QWidget)
+        start = time.perf_counter()
+        for widget in widgets:
+            widget.ensurePolished()
+        timings["polish_ms"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        window.resize(width, height)
+        window.show()
+        window.layout().activate()
+        QApplication.sendPostedEvents(None, QEvent.Type.LayoutRequest)
+        timings["layout_ms"] = (time.perf_counter() - start) * 1000
+
+        # 清除焦点，避免光标闪烁使渲染结果不稳定
+        app.processEvents()
+        if QApplication.focusWidget() is not None:
+            QApplication.focusWidget().clearFocus()
+        window.scroll_area.verticalScrollBar().setValue(0)
+        app.processEvents()
+
+        pixmap = window.grab()
+        samples = []
+        for _ in range(options.rounds):
+            start = time.perf_counter()
+            pixmap = window.grab()
+            samples.append((time.perf_counter() - start) * 1000)
+        timings["paint_ms"] = statistics.median(samples)
+
+        key = f"{width}x{height}@{dpr:g}x"
+        results[key] = timings
+        check = check_image(options, pixmap.toImage(), golden_name(width, height, dpr), key)
+        check["device_pixel_ratio"] = pixmap.devicePixelRatio()
+        visual.append(check)
+
+        window.close()
+        window.deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+    return {"dpr": dpr, "qpa": app.platformName(), "results": results, "visual": visual}
+
+
+def check_image(options, image, name, key):
+    """与基准图片比较（或更新基准图片），返回检查结果"""
+    from PySide6.QtGui import QImage
+
+    golden_path = os.path.join(options.golden, name)
+    if options.update:
+        os.makedirs(options.golden, exist_ok=True)
+        image.save(golden_path)
+        return {"render": key, "status": "updated", "golden": golden_path}
+    if not os.path.isfile(golden_path):
+        return {"render": key, "status": "missing", "golden": golden_path}
+
+    ratio, diff = compare_images(image, QImage(golden_path), options.tolerance)
+    status = "passed" if ratio <= options.max_diff else "failed"
+    result = {"render": key, "status": status, "diff_pct": round(ratio, 4), "golden": golden_path}
+    if status == "failed":
+        os.makedirs(options.artifacts, exist_ok=True)
+        base = os.path.join(options.artifacts, os.path.splitext(name)[0])
+        image.save(base + ".actual.png")
+        if diff is not None:
+            _amplify(diff).save(base + ".diff.png")
+        result["artifacts"] = base + ".*.png"
+    return result
+
+
+def _child_arguments(options, dpr):
+    args = [sys.executable, os.path.abspath(__file__), "--child", dpr,
+            "--rounds", str(options.rounds), "--golden", options.golden, "--artifacts", options.artifacts,
+            "--tolerance", str(options.tolerance), "--max-diff", str(options.max_diff), "--sizes", *options.sizes]
+    if options.update:
+        args.append("--update")
+    return args
+
+
+def run(options):
+    """每个 DPR 启动一个子进程，合并结果"""
+    results, visual, qpa = {}, [], ""
+    for dpr in options.dpr:
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen", QT_SCALE_FACTOR=dpr)
+        completed = subprocess.run(_child_arguments(options, dpr), env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            sys.stderr.write(completed.stderr)
+            raise RuntimeError(f"DPR {dpr} 的渲染进程失败（退出码 {completed.returncode}）")
+        # 只取最后一行，其他模块在 stdout 上的输出不影响解析
+        report = json.loads(completed.stdout.strip().splitlines()[-1])
+        qpa = report["qpa"]
+        for key, timings in report["results"].items():
+            results[f"render_{key}"] = timings
+        visual.extend(report["visual"])
+
+    import PySide6
+    from PySide6.QtCore import qVersion
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pyside6": PySide6.__version__,
+            "qt": qVersion(),
+            "platform": f"{platform.system()} {platform.machine()}",
+            "qpa": qpa,
+            "rounds": options.rounds,
+        },
+        "results": results,
+        "visual": visual,
+    }
+
+
+def main_entry():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES), help="窗口尺寸，例如 1280x800")
+    parser.add_argument("--dpr", nargs="+", default=list(DEFAULT_DPRS), help="设备像素比")
+    parser.add_argument("--rounds", type=int, default=5, help="paint 的重复次数（取中位数）")
+    parser.add_argument("--golden", default=DEFAULT_GOLDEN, help="基准图片目录")
+    parser.add_argument("--artifacts", default=DEFAULT_ARTIFACTS, help="对比失败时写入实际图片和差异图的目录")
+    parser.add_argument("--update", action="store_true", help="用本次渲染结果更新基准图片")
+    parser.add_argument("--tolerance", type=int, default=16, help="单个通道允许的差值（0-255）")
+    parser.add_argument("--max-diff", type=float, default=0.5, help="允许超过容差的通道比例（百分比）")
+    parser.add_argument("--allow-missing", action="store_true", help="缺少基准图片时不视为失败")
+    parser.add_argument("--output", help="结果写入的 JSON 文件（默认输出到 stdout）")
+    parser.add_argument("--baseline", help="用于对比计时的基线 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=10.0, help="视为变化的百分比阈值")
+    parser.add_argument("--fail-on-regression", action="store_true", help="计时回退时返回退出码 1")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.child:
+        print(json.dumps(render_dpr(options, float(options.child))))
+        return 0
+
+    report = run(options)
+    failed = False
+    for check in report["visual"]:
+        if check["status"] == "failed" or (check["status"] == "missing" and not options.allow_missing):
+            failed = True
+        detail = f"  差异 {check['diff_pct']}%" if "diff_pct" in check else ""
+        print(f"{check['status']:>8}  {check['render']}{detail}", file=sys.stderr)
+
+    if options.baseline:
+        sys.path.insert(0, _HERE)
+        from benchmark import _print_comparison, compare
+        with open(options.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, options.threshold)
+        report["comparison"] = {"baseline": options.baseline, "threshold_pct": options.threshold, "metrics": rows}
+        _print_comparison(rows, sys.stderr)
+        if options.fail_on_regression and any(row["status"] == "regressed" for row in rows):
+            failed = True
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_entry())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Qt 资源包模块
+
+构建步骤把图片和字体打包成一个二进制资源文件
+（pyside6-rcc --binary）；运行时用 QResource.registerResource 注册，
+Qt 会内存映射这个文件，之后通过 ":/" 路径访问其中的资源：
+
+    :/images/MoonBit_GUI_Demo.png
+    :/fonts/<字体文件>
+
+冷启动时只打开一个文件，而不是逐个读取零散的小文件
+（在网络挂载的 home 目录上差别明显）。资源包不存在时回退到原来的方式。
+
+主题样式表不打包：theme.py 中编译模板比从资源包读取再校验是否过期更快。
+
+构建：
+    python3 resources.py [--output resources.rcc] [--assets DIR] [--fonts DIR]
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from xml.sax.saxutils import escape
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 默认的资源包路径（构建产物，不纳入版本控制）
+DEFAULT_BUNDLE = os.path.join(_HERE, "resources.rcc")
+DEFAULT_ASSETS = os.path.normpath(os.path.join(_HERE, "..", "..", "assets"))
+
+IMAGE_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.svg", "*.ico", "*.gif", "*.webp")
+FONT_PATTERNS = ("*.ttf", "*.otf", "*.ttc")
+
+# 已注册的资源包路径
+_registered = set()
+
+
+def _collect(directory, patterns):
+    if not directory or not os.path.isdir(directory):
+        return []
+    files = []
+    for pattern in patterns:
+        files.extend(glob.glob(os.path.join(directory, "**", pattern), recursive=True))
+    return sorted(files)
+
+
+def _find_rcc():
+    """查找 pyside6-rcc，找不到时使用 PySide6 自带的 rcc"""
+    rcc = shutil.which("pyside6-rcc")
+    if rcc:
+        return [rcc]
+    import PySide6
+    for name in ("rcc", "rcc.exe"):
+        for subdir in (os.path.join("Qt", "libexec"), ""):
+            candidate = os.path.join(os.path.dirname(PySide6.__file__), subdir, name)
+            if os.path.isfile(candidate):
+                return [candidate]
+    raise FileNotFoundError("找不到 pyside6-rcc，请确认已安装 PySide6")
+
+
+def write_qrc(path, entries):
+    """
+    生成 .qrc 文件
+
+    Args:
+        path: 输出路径
+        entries: {前缀: [(别名, 文件绝对路径), ...]}
+    """
+    lines = ["<!DOCTYPE RCC>", '<RCC version="1.0">']
+    for prefix, files in entries.items():
+        if not files:
+            continue
+        lines.append(f'  <qresource prefix="{escape(prefix)}">')
+        for alias, file_path in files:
+            lines.append(f'    <file alias="{escape(alias)}">{escape(file_path)}</file>')
+        lines.append("  </qresource>")
+    lines.append("</RCC>")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def build(output=DEFAULT_BUNDLE, assets_dir=DEFAULT_ASSETS, fonts_dir=None):
+    """
+    构建二进制资源包
+
+    Args:
+        output: 输出的 .rcc 路径
+        assets_dir: 图片目录（递归收集），别名为相对路径
+        fonts_dir: 字体目录，默认为 assets_dir/fonts
+
+    Returns:
+        dict: 各前缀下打包的文件数量
+    """
+    fonts_dir = fonts_dir or os.path.join(assets_dir or "", "fonts")
+    fonts = _collect(fonts_dir, FONT_PATTERNS)
+    images = [path for path in _collect(assets_dir, IMAGE_PATTERNS) if path not in fonts]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        entries = {
+            "/images": [(os.path.relpath(path, assets_dir).replace(os.sep, "/"), path) for path in images],
+            "/fonts": [(os.path.basename(path), path) for path in fonts],
+        }
+
+        qrc_path = os.path.join(temp_dir, "resources.qrc")
+        write_qrc(qrc_path, entries)
+        subprocess.run(_find_rcc() + ["--binary", "-o", os.path.abspath(output), qrc_path], check=True)
+    return {prefix: len(files) for prefix, files in entries.items()}
+
+
+def load(path=DEFAULT_BUNDLE, register_fonts=True):
+    """
+    注册资源包（重复调用无副作用）
+
+    Args:
+        path: .rcc 路径
+        register_fonts: 是否把 :/fonts 下的字体加入应用字体库
+
+    Returns:
+        bool: 资源包是否可用
+    """
+    path = os.path.abspath(path)
+    if path in _registered:
+        return True
+    if not os.path.isfile(path):
+        return False
+
+    from PySide6.QtCore import QDir, QResource
+    if not QResource.registerResource(path):
+        return False
+    _registered.add(path)
+
+    if register_fonts:
+        from PySide6.QtGui import QFontDatabase
+        fonts = QDir(":/fonts").entryList(QDir.Filter.Files)
+        for name in fonts:
+            QFontDatabase.addApplicationFont(f":/fonts/{name}")
+        if fonts:
+            from font_utils import invalidate_fonts
+            invalidate_fonts()
+    return True
+
+
+def unload(path=DEFAULT_BUNDLE):
+    """注销资源包"""
+    path = os.path.abspath(path)
+    if path not in _registered:
+        return False
+    from PySide6.QtCore import QResource
+    _registered.discard(path)
+    return QResource.unregisterResource(path)
+
+
+def main_entry():
+    parser = argparse.ArgumentParser(description="构建 Qt 二进制资源包")
+    parser.add_argument("--output", default=DEFAULT_BUNDLE, help="输出的 .rcc 文件")
+    parser.add_argument("--assets", default=DEFAULT_ASSETS, help="图片目录")
+    parser.add_argument("--fonts", help="字体目录（默认为 <assets>/fonts）")
+    args = parser.parse_args()
+
+    counts = build(args.output, args.assets, args.fonts)
+    summary = "，".join(f"{prefix} {count} 个" for prefix, count in counts.items())
+    print(f"已生成 {args.output}（{os.path.getsize(args.output)} 字节）：{summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_entry())
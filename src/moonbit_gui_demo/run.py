@@ -10,8 +10,11 @@ import os
 # 添加当前目录到 Python 路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from startup_profiler import profiler
+
 try:
-    from main import main
+    with profiler.phase("import.main"):
+        from main import main
     main()
 except ImportError as e:
     print(f"导入错误: {e}")
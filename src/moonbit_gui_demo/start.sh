@@ -18,6 +18,10 @@ fi
 echo "🧪 运行字体测试..."
 python3 test_fonts.py
 
+# 构建资源包（图片和字体打包为 resources.rcc）
+echo "📦 构建资源包..."
+python3 resources.py || echo "⚠️ 资源包构建失败，将直接读取零散文件"
+
 # 启动主程序
 echo "🎯 启动主程序..."
 python3 main.py 
\ No newline at end of file
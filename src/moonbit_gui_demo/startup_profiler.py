@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动阶段分析模块
+
+记录启动过程中各个阶段（PySide6 导入、QApplication 创建、字体解析、
+各个 create_* 区块构建、show() 和首次绘制）的高精度时间戳，
+生成 JSON 报告，并可选地导出 Chrome trace 格式的文件
+（在 chrome://tracing 或 https://ui.perfetto.dev 中打开）。
+
+通过环境变量启用：
+    MOONBIT_GUI_PROFILE=1             报告输出到 stderr
+    MOONBIT_GUI_PROFILE=report.json   报告写入文件
+    MOONBIT_GUI_TRACE=trace.json      同时导出 Chrome trace
+
+本模块不能在顶层导入 PySide6，否则无法测量 PySide6 自身的导入耗时。
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+PROFILE_ENV = "MOONBIT_GUI_PROFILE"
+TRACE_ENV = "MOONBIT_GUI_TRACE"
+
+# 关闭时所有阶段共享的空上下文
+_NULL_PHASE = nullcontext()
+
+
+class StartupProfiler:
+    """
+    启动阶段记录器
+
+    phase() 记录一段有开始和结束的阶段，可以嵌套；mark() 记录一个时间点。
+    时间以毫秒为单位，相对于本模块被导入的时刻。
+    关闭时 phase() 返回共享的空上下文，profiled 装饰器原样返回函数。
+    """
+
+    def __init__(self, enabled=False, report_path=None, trace_path=None):
+        """
+        Args:
+            enabled: 是否记录
+            report_path: JSON 报告路径，None 表示输出到 stderr
+            trace_path: Chrome trace 路径，None 表示不导出
+        """
+        self.enabled = enabled
+        self.report_path = report_path
+        self.trace_path = trace_path
+        self.origin = time.perf_counter_ns()
+        self.wall_origin = time.time()
+        self.phases = []   # [name, start_ns, end_ns, depth]
+        self.marks = []    # [name, time_ns]
+        self._depth = 0
+        self._finished = False
+        self._paint_watcher = None
+
+    @classmethod
+    def from_environ(cls, environ=None):
+        """
+        根据环境变量创建记录器
+
+        Args:
+            environ: 环境变量映射，默认为 os.environ
+
+        Returns:
+            StartupProfiler: 记录器
+        """
+        environ = os.environ if environ is None else environ
+        value = environ.get(PROFILE_ENV, "").strip()
+        trace_path = environ.get(TRACE_ENV, "").strip() or None
+        if value.lower() in ("", "0", "false", "no", "off"):
+            # 只设置了 trace 路径时也启用
+            return cls(enabled=trace_path is not None, trace_path=trace_path)
+        report_path = None if value.lower() in ("1", "true", "yes", "on", "-") else value
+        return cls(enabled=True, report_path=report_path, trace_path=trace_path)
+
+    def phase(self, name):
+        """
+        记录一个阶段
+
+        Args:
+            name: 阶段名称
+
+        Returns:
+            上下文管理器，with 块的执行时间即为阶段耗时
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name):
+        record = [name, time.perf_counter_ns(), None, self._depth]
+        self.phases.append(record)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record[2] = time.perf_counter_ns()
+
+    def mark(self, name):
+        """
+        记录一个时间点
+
+        Args:
+            name: 时间点名称
+        """
+        if self.enabled:
+            self.marks.append([name, time.perf_counter_ns()])
+
+    def profiled(self, func=None, *, name=None):
+        """
+        把函数的每次调用记录为一个阶段（装饰器）
+
+        Args:
+            func: 被装饰的函数
+            name: 阶段名称，默认为函数的 __qualname__
+        """
+        if func is None:
+            return functools.partial(self.profiled, name=name)
+        if not self.enabled:
+            return func
+        phase_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self._phase(phase_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def watch_first_paint(self, widget):
+        """
+        等待窗口的首次绘制，完成后记录 first_paint 并输出报告
+
+        Args:
+            widget: 顶层窗口
+        """
+        if not self.enabled or self._paint_watcher is not None:
+            return
+        self.mark("show.done")
+        self._paint_watcher = _make_paint_watcher(self, widget)
+
+    def _on_first_paint(self, start_ns):
+        from PySide6.QtCore import QTimer
+
+        # 绘制事件处理完之后再结束，首帧的实际绘制耗时包含在内
+        def done():
+            self.phases.append(["first_paint", start_ns, time.perf_counter_ns(), 0])
+            self.mark("first_frame")
+            self.finish()
+        QTimer.singleShot(0, done)
+
+    def _ms(self, ns):
+        return round((ns - self.origin) / 1e6, 3)
+
+    def report(self):
+        """
+        生成报告
+
+        Returns:
+            dict: 各阶段和时间点，时间单位为毫秒
+        """
+        now = time.perf_counter_ns()
+        phases = []
+        for name, start, end, depth in self.phases:
+            end = now if end is None else end
+            phases.append({
+                "name": name,
+                "start_ms": self._ms(start),
+                "duration_ms": round((end - start) / 1e6, 3),
+                "depth": depth,
+            })
+        marks = [{"name": name, "time_ms": self._ms(t)} for name, t in self.marks]
+        first_frame = next((m["time_ms"] for m in marks if m["name"] == "first_frame"), None)
+        return {
+            "version": 1,
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "started_at": self.wall_origin,
+            "time_to_first_frame_ms": first_frame,
+            "total_ms": self._ms(now),
+            "phases": phases,
+            "marks": marks,
+        }
+
+    def chrome_trace(self):
+        """
+        生成 Chrome trace 格式的事件
+
+        Returns:
+            dict: {"traceEvents": [...]}，时间单位为微秒
+        """
+        pid = os.getpid()
+        tid = threading.get_ident()
+        now = time.perf_counter_ns()
+        events = []
+        for name, start, end, _ in self.phases:
+            end = now if end is None else end
+            events.append({
+                "name": name, "cat": "startup", "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - self.origin) / 1e3, "dur": (end - start) / 1e3,
+            })
+        for name, t in self.marks:
+            events.append({
+                "name": name, "cat": "startup", "ph": "i", "s": "p", "pid": pid,
+                "tid": tid, "ts": (t - self.origin) / 1e3,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def finish(self):
+        """输出报告和 trace（只执行一次）"""
+        if not self.enabled or self._finished:
+            return
+        self._finished = True
+        report = json.dumps(self.report(), ensure_ascii=False, indent=2)
+        if self.report_path is None:
+            print(report, file=sys.stderr)
+        else:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                f.write(report + "\n")
+        if self.trace_path is not None:
+            with open(self.trace_path, "w", encoding="utf-8") as f:
+                json.dump(self.chrome_trace(), f)
+
+
+def _make_paint_watcher(profiler, widget):
+    """创建监听首次绘制的应用级事件过滤器（用到时才导入 PySide6）"""
+    from PySide6.QtCore import QEvent, QObject
+    from PySide6.QtWidgets import QApplication
+
+    class FirstPaintWatcher(QObject):
+        def eventFilter(self, watched, event):
+            if (event.type() == QEvent.Type.Paint and watched.isWidgetType()
+                    and (watched is widget or widget.isAncestorOf(watched))):
+                QApplication.instance().removeEventFilter(self)
+                profiler._on_first_paint(time.perf_counter_ns())
+            return False
+
+    watcher = FirstPaintWatcher(widget)
+    QApplication.instance().installEventFilter(watcher)
+    return watcher
+
+
+# 进程级共享的记录器
+profiler = StartupProfiler.from_environ()
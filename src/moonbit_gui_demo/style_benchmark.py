@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+样式开销测量脚本
+
+对比两种方式构建 MoonBitMainWindow 时的样式表解析次数和 polish 耗时：
+- theme：应用级主题样式表（当前实现），只解析一次
+- per-widget：改用主题之前的做法，每个控件各自 setStyleSheet
+  （LEGACY_STYLESHEETS 中为当时 main.py 里的样式表原文）
+
+解析次数是实际测得的：测量期间包装 QWidget.setStyleSheet 和
+QApplication.setStyleSheet，统计设置非空样式表的次数（每次设置都会在下次
+polish 时重新解析）。
+
+用法：
+    QT_QPA_PLATFORM=offscreen python3 style_benchmark.py [--rounds N]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtCore import QEvent, Qt
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QApplication, QFrame, QLabel, QPlainTextEdit, QVBoxLayout, QWidget
+
+import main
+import theme
+from font_utils import get_chinese_font, get_emoji_font
+
+
+# 改用主题之前 main.py 中各控件的样式表
+_PRIMARY_BUTTON = """
+            QPushButton {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #8B5CF6, stop:1 #A855F7);
+                border: none;
+                border-radius: 25px;
+                color: white;
+                padding: 10px 30px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #7C3AED, stop:1 #9333EA);
+                transform: scale(1.05);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #6D28D9, stop:1 #7C3AED);
+            }
+        """
+_CODE_VIEW = """
+            {type} {{
+                background-color: #1E1E1E;
+                color: #E5E7EB;
+                border: 2px solid #374151;
+                border-radius: 10px;
+                padding: 15px;
+                selection-background-color: #3B82F6;
+            }}
+        """
+_WHITE_SECTION = """
+            QFrame {
+                background: white;
+                border-radius: 20px;
+                border: 1px solid #E5E7EB;
+            }
+        """
+_GRADIENT_SECTION = """
+            QFrame {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #8B5CF6, stop:1 #A855F7);
+                border-radius: 20px;
+                padding: 20px;
+            }
+        """
+
+LEGACY_STYLESHEETS = {
+    # 按 objectName
+    "#window": """
+            QMainWindow {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #F8FAFC, stop:1 #F1F5F9);
+            }
+        """,
+    "#header": """
+            QFrame {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #8B5CF6, stop:1 #A855F7);
+                border: none;
+            }
+        """,
+    "#headerTitle": "color: white;",
+    "#mainScroll": """
+            QScrollArea {
+                border: none;
+                background: transparent;
+            }
+            QScrollBar:vertical {
+                background: #F3F4F6;
+                width: 12px;
+                border-radius: 6px;
+            }
+            QScrollBar::handle:vertical {
+                background: #D1D5DB;
+                border-radius: 6px;
+                min-height: 20px;
+            }
+            QScrollBar::handle:vertical:hover {
+                background: #9CA3AF;
+            }
+        """,
+    "#welcomeSection": """
+            QFrame {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #F8FAFC, stop:1 #F1F5F9);
+                border-radius: 20px;
+                padding: 20px;
+            }
+        """,
+    "#featuresSection": _WHITE_SECTION,
+    "#codeSection": _WHITE_SECTION,
+    "#downloadSection": _GRADIENT_SECTION,
+    "#footer": """
+            QFrame {
+                background: #1F2937;
+                border: none;
+            }
+        """,
+    "#copyright": "color: #9CA3AF;",
+    # 按 role / variant 属性
+    "title": "color: #1F2937; text-align: center;",
+    "subtitle": "color: #6B7280; text-align: center;",
+    "body": "color: #374151; line-height: 1.6;",
+    "caption": "color: #6B7280; text-align: center; line-height: 1.4;",
+    "titleInverse": "color: white; text-align: center;",
+    "subtitleInverse": "color: rgba(255, 255, 255, 0.9); text-align: center;",
+    "featureCard": """
+            QFrame {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #F8FAFC, stop:1 #F1F5F9);
+                border-radius: 15px;
+                border: 1px solid #E5E7EB;
+                padding: 20px;
+            }
+            QFrame:hover {
+                border: 2px solid #8B5CF6;
+                transform: translateY(-2px);
+            }
+        """,
+    "code": _CODE_VIEW,
+    "nav": """
+                QPushButton {
+                    background: transparent;
+                    border: none;
+                    color: white;
+                    padding: 8px 16px;
+                    border-radius: 6px;
+                }
+                QPushButton:hover {
+                    background-color: rgba(255, 255, 255, 0.1);
+                }
+            """,
+    "primary": _PRIMARY_BUTTON,
+    "outline": """
+            QPushButton {
+                background: transparent;
+                border: 2px solid white;
+                border-radius: 25px;
+                color: white;
+                padding: 10px 30px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background: rgba(255, 255, 255, 0.1);
+            }
+        """,
+    "footerLink": """
+                QPushButton {
+                    background: transparent;
+                    border: none;
+                    color: #9CA3AF;
+                    padding: 5px 10px;
+                }
+                QPushButton:hover {
+                    color: white;
+                }
+            """,
+}
+
+# 主题样式表中按 id 选择的 objectName
+THEME_IDS = frozenset(re.findall(r"\w#([A-Za-z_]\w*)", theme.STYLESHEET_TEMPLATE))
+
+
+def _styled_widgets(window):
+    """会被主题选中的控件：objectName 是样式表中的 id，或带 role / variant 属性"""
+    widgets = [window] + window.findChildren(QWidget)
+    return [
+        widget for widget in widgets
+        if widget is window
+        or (widget.objectName() and widget.objectName() in THEME_IDS)
+        or widget.property("role") is not None
+        or widget.property("variant") is not None
+    ]
+
+
+def _legacy_stylesheet(widget):
+    """控件在改用主题之前的样式表，没有时为 None"""
+    if isinstance(widget, main.MoonBitStyleButton):
+        return LEGACY_STYLESHEETS["primary"]
+    name = widget.objectName()
+    if name and f"#{name}" in LEGACY_STYLESHEETS:
+        return LEGACY_STYLESHEETS[f"#{name}"]
+    key = widget.property("role") or widget.property("variant")
+    if key == "code":
+        kind = "QPlainTextEdit" if isinstance(widget, QPlainTextEdit) else "QTextBrowser"
+        return _CODE_VIEW.format(type=kind)
+    return LEGACY_STYLESHEETS.get(key) if key else None
+
+
+class LegacyStyledWindow(main.MoonBitMainWindow):
+    """每个控件各自设置样式表的主窗口（改用主题之前的做法）"""
+
+    def setup_styles(self):
+        self.setObjectName("window")
+
+    def setup_central_widget(self):
+        super().setup_central_widget()
+        for widget in [self] + self.findChildren(QWidget):
+            stylesheet = _legacy_stylesheet(widget)
+            if stylesheet:
+                widget.setStyleSheet(stylesheet)
+
+    def create_feature_card(self, icon, name, description):
+        # 自绘卡片之前的实现：QFrame + 三个 QLabel
+        card = QFrame()
+        card.setProperty("role", "featureCard")
+        layout = QVBoxLayout(card)
+        layout.setSpacing(15)
+        labels = (
+            (icon, get_emoji_font(32), None),
+            (name, get_chinese_font(16, QFont.Weight.Bold), "title"),
+            (description, get_chinese_font(12), "caption"),
+        )
+        for text, font, role in labels:
+            label = QLabel(text)
+            label.setFont(font)
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            if role:
+                label.setProperty("role", role)
+            layout.addWidget(label)
+        return card
+
+
+@contextmanager
+def count_stylesheet_parses():
+    """
+    统计期间设置非空样式表的次数
+
+    Yields:
+        list: 只有一个元素的计数器
+    """
+    counter = [0]
+    originals = {cls: cls.setStyleSheet for cls in (QWidget, QApplication)}
+
+    def wrap(original):
+        def set_style_sheet(self, stylesheet):
+            if stylesheet:
+                counter[0] += 1
+            original(self, stylesheet)
+        return set_style_sheet
+
+    for cls, original in originals.items():
+        cls.setStyleSheet = wrap(original)
+    try:
+        yield counter
+    finally:
+        for cls, original in originals.items():
+            cls.setStyleSheet = original
+
+
+def measure(mode):
+    """
+    构建并显示一次主窗口
+
+    Returns:
+        dict: 解析次数、带样式的控件数、构建、polish 和合计耗时（毫秒）
+    """
+    app = QApplication.instance()
+    app.setStyleSheet("")
+    window_class = main.MoonBitMainWindow if mode == "theme" else LegacyStyledWindow
+
+    with count_stylesheet_parses() as parses:
+        start = time.perf_counter()
+        window = window_class()
+        built = time.perf_counter()
+
+        window.show()
+        for widget in [window] + window.findChildren(QWidget):
+            widget.ensurePolished()
+        app.processEvents()
+        polished = time.perf_counter()
+
+    styled = len(_styled_widgets(window))
+    window.close()
+    window.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    return {
+        "qss_parse_count": parses[0],
+        "styled_widgets": styled,
+        "build_ms": (built - start) * 1000,
+        "polish_ms": (polished - built) * 1000,
+        "total_ms": (polished - start) * 1000,
+    }
+
+
+def main_entry():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    QApplication.instance() or QApplication(sys.argv)
+    measure("theme")   # 预热字体、高亮缓存
+
+    # 两种方式交替运行，避免顺序带来的偏差
+    runs = {"per-widget": [], "theme": []}
+    for _ in range(args.rounds):
+        for mode in runs:
+            runs[mode].append(measure(mode))
+
+    report = {}
+    for mode, results in runs.items():
+        report[mode] = {
+            "qss_parse_count": statistics.median(run["qss_parse_count"] for run in results),
+            "styled_widgets": results[0]["styled_widgets"],
+            "build_ms": statistics.median(run["build_ms"] for run in results),
+            "polish_ms": statistics.median(run["polish_ms"] for run in results),
+            "total_ms": statistics.median(run["total_ms"] for run in results),
+        }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_entry())
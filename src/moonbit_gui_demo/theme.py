@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+主题模块
+
+调色板令牌只定义一次，编译成一份应用级样式表，由 QApplication 统一解析。
+控件不再各自调用 setStyleSheet，而是通过 objectName（唯一的区域）
+或动态属性 role / variant（重复出现的元素）被样式表选中。
+"""
+
+from functools import lru_cache
+from string import Template
+
+from PySide6.QtWidgets import QApplication
+
+
+# 调色板令牌
+PALETTE = {
+    "primary": "#8B5CF6",
+    "primary_light": "#A855F7",
+    "primary_hover": "#7C3AED",
+    "primary_hover_light": "#9333EA",
+    "primary_pressed": "#6D28D9",
+    "surface": "white",
+    "surface_top": "#F8FAFC",
+    "surface_bottom": "#F1F5F9",
+    "border": "#E5E7EB",
+    "text_title": "#1F2937",
+    "text_body": "#374151",
+    "text_muted": "#6B7280",
+    "text_inverse": "white",
+    "text_inverse_muted": "rgba(255, 255, 255, 0.9)",
+    "overlay_hover": "rgba(255, 255, 255, 0.1)",
+    "footer": "#1F2937",
+    "footer_text": "#9CA3AF",
+    "scroll_track": "#F3F4F6",
+    "scroll_handle": "#D1D5DB",
+    "scroll_handle_hover": "#9CA3AF",
+    "code_background": "#1E1E1E",
+    "code_text": "#E5E7EB",
+    "code_border": "#374151",
+    "selection": "#3B82F6",
+}
+
+# 当前生效的令牌（apply_theme 时更新），自绘控件（painted.py）从这里取颜色
+_active_tokens = dict(PALETTE)
+_active_version = 0
+
+# 样式表模板，${token} 引用 PALETTE 中的颜色
+STYLESHEET_TEMPLATE = """
+QMainWindow {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 ${surface_top}, stop:1 ${surface_bottom});
+}
+
+/* 顶部导航栏 */
+QFrame#header {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 ${primary}, stop:1 ${primary_light});
+    border: none;
+}
+QLabel#headerTitle {
+    color: ${text_inverse};
+}
+QPushButton[variant="nav"] {
+    background: transparent;
+    border: none;
+    color: ${text_inverse};
+    padding: 8px 16px;
+    border-radius: 6px;
+}
+QPushButton[variant="nav"]:hover {
+    background-color: ${overlay_hover};
+}
+
+/* 主内容滚动区域 */
+QScrollArea#mainScroll {
+    border: none;
+    background: transparent;
+}
+QScrollArea#mainScroll QScrollBar:vertical {
+    background: ${scroll_track};
+    width: 12px;
+    border-radius: 6px;
+}
+QScrollArea#mainScroll QScrollBar::handle:vertical {
+    background: ${scroll_handle};
+    border-radius: 6px;
+    min-height: 20px;
+}
+QScrollArea#mainScroll QScrollBar::handle:vertical:hover {
+    background: ${scroll_handle_hover};
+}
+
+/* 内容区块 */
+QFrame#welcomeSection {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 ${surface_top}, stop:1 ${surface_bottom});
+    border-radius: 20px;
+    padding: 20px;
+}
+QFrame#featuresSection, QFrame#codeSection {
+    background: ${surface};
+    border-radius: 20px;
+    border: 1px solid ${border};
+}
+QFrame#downloadSection {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 ${primary}, stop:1 ${primary_light});
+    border-radius: 20px;
+    padding: 20px;
+}
+QFrame[role="featureCard"] {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 ${surface_top}, stop:1 ${surface_bottom});
+    border-radius: 15px;
+    border: 1px solid ${border};
+    padding: 20px;
+}
+QFrame[role="featureCard"]:hover {
+    border: 2px solid ${primary};
+}
+
+/* 文本 */
+QLabel[role="title"] {
+    color: ${text_title};
+}
+QLabel[role="subtitle"], QLabel[role="caption"] {
+    color: ${text_muted};
+}
+QLabel[role="body"] {
+    color: ${text_body};
+}
+QLabel[role="titleInverse"] {
+    color: ${text_inverse};
+}
+QLabel[role="subtitleInverse"] {
+    color: ${text_inverse_muted};
+}
+
+/* 按钮 */
+QPushButton[variant="primary"] {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 ${primary}, stop:1 ${primary_light});
+    border: none;
+    border-radius: 25px;
+    color: ${text_inverse};
+    padding: 10px 30px;
+    font-weight: bold;
+}
+QPushButton[variant="primary"]:hover {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 ${primary_hover}, stop:1 ${primary_hover_light});
+}
+QPushButton[variant="primary"]:pressed {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 ${primary_pressed}, stop:1 ${primary_hover});
+}
+QPushButton[variant="outline"] {
+    background: transparent;
+    border: 2px solid ${text_inverse};
+    border-radius: 25px;
+    color: ${text_inverse};
+    padding: 10px 30px;
+    font-weight: bold;
+}
+QPushButton[variant="outline"]:hover {
+    background: ${overlay_hover};
+}
+
+/* 代码展示 */
+QTextBrowser[role="code"], QPlainTextEdit[role="code"] {
+    background-color: ${code_background};
+    color: ${code_text};
+    border: 2px solid ${code_border};
+    border-radius: 10px;
+    padding: 15px;
+    selection-background-color: ${selection};
+}
+
+/* 底部信息 */
+QFrame#footer {
+    background: ${footer};
+    border: none;
+}
+QLabel#copyright {
+    color: ${footer_text};
+}
+QPushButton[variant="footerLink"] {
+    background: transparent;
+    border: none;
+    color: ${footer_text};
+    padding: 5px 10px;
+}
+QPushButton[variant="footerLink"]:hover {
+    color: ${text_inverse};
+}
+"""
+
+
+@lru_cache(maxsize=None)
+def _compile(items):
+    return Template(STYLESHEET_TEMPLATE).substitute(dict(items))
+
+
+def compile_stylesheet(palette=None):
+    """
+    把调色板编译成应用级样式表
+
+    Args:
+        palette: 覆盖默认 PALETTE 的部分令牌
+
+    Returns:
+        str: 样式表文本
+    """
+    tokens = dict(PALETTE)
+    if palette:
+        tokens.update(palette)
+    return _compile(tuple(sorted(tokens.items())))
+
+
+def active_tokens():
+    """当前生效的调色板令牌"""
+    return _active_tokens
+
+
+def palette_version():
+    """调色板每次变化时递增，用于使自绘控件的缓存失效"""
+    return _active_version
+
+
+def _set_active_tokens(palette):
+    global _active_tokens, _active_version
+    tokens = dict(PALETTE)
+    if palette:
+        tokens.update(palette)
+    if tokens != _active_tokens:
+        _active_tokens = tokens
+        _active_version += 1
+
+
+def apply_theme(app=None, palette=None):
+    """
+    把主题安装为应用级样式表
+
+    样式表没有变化时不会重复设置，避免触发全局重新 polish。
+
+    Args:
+        app: QApplication，默认为当前实例
+        palette: 覆盖默认 PALETTE 的部分令牌
+    """
+    app = app or QApplication.instance()
+    _set_active_tokens(palette)
+    stylesheet = compile_stylesheet(palette)
+    if app.styleSheet() != stylesheet:
+        app.setStyleSheet(stylesheet)
@@ -0,0 +1,229 @@
+"""
+异步、带缓存的图片加载
+
+QPixmap(path) 在 GUI 线程中同步解码，大图或图库会阻塞绘制。PixmapLoader：
+
+- 在 QThreadPool 的工作线程中用 QImageReader 解码为 QImage，
+  指定目标尺寸时直接按比例缩小解码（JPEG 等格式可以跳过大部分像素）
+- 解码结果通过排队信号回到 GUI 线程，转换为 QPixmap 后交给回调
+- 缓存键为 "路径 | 修改时间 | 尺寸"，文件被替换后自动失效；
+  按像素字节数统计内存，超出上限时淘汰最久未使用的项，
+  同时写入 QPixmapCache，其他代码可以用同一个键查找
+- 同一个键的并发请求只解码一次
+
+QImage 可以在任意线程中使用，QPixmap 只能在 GUI 线程中创建。
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import shiboken6
+from PySide6.QtCore import QFileInfo, QObject, QRunnable, QSize, Qt, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap, QPixmapCache
+from PySide6.QtWidgets import QLabel
+
+
+def cache_key(path: str, width: int = 0, height: int = 0) -> str:
+    """缓存键：路径、修改时间（毫秒）和目标尺寸"""
+    info = QFileInfo(path)
+    mtime = info.lastModified().toMSecsSinceEpoch() if info.exists() else 0
+    return f"{info.absoluteFilePath()}|{mtime}|{width}x{height}"
+
+
+def read_image(path: str, width: int = 0, height: int = 0) -> Tuple[QImage, str]:
+    """
+    解码图片，可以在工作线程中调用。
+
+    width / height 大于 0 时按比例缩放到不超过该尺寸（只缩小不放大），
+    只给一个时另一个按比例计算。返回 (图片, 错误信息)。
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    if width > 0 or height > 0:
+        size = reader.size()
+        if size.isValid() and not size.isEmpty():
+            bound = QSize(width if width > 0 else size.width(), height if height > 0 else size.height())
+            if size.width() > bound.width() or size.height() > bound.height():
+                reader.setScaledSize(size.scaled(bound, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return image, reader.errorString()
+    return image, ""
+
+
+class _DecodeRunnable(QRunnable):
+    def __init__(self, loader: "PixmapLoader", key: str, path: str, width: int, height: int):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.path = path
+        self.width = width
+        self.height = height
+
+    def run(self):
+        image, error = read_image(self.path, self.width, self.height)
+        # loader 属于 GUI 线程，跨线程发出的信号排队到 GUI 线程处理
+        self.loader._decoded.emit(self.key, image, error)
+
+
+class PixmapLoader(QObject):
+    """
+    回调的签名为 callback(pixmap)，失败时 pixmap.isNull() 为 True。
+
+    缓存命中时回调立即（同步）执行，否则在解码完成后的事件循环中执行。
+    """
+
+    # 解码完成（键），失败（路径，错误信息）
+    loaded = Signal(str)
+    failed = Signal(str, str)
+
+    _decoded = Signal(str, QImage, str)
+
+    def __init__(self, cache_limit_kb: int = 64 * 1024, max_threads: int = 0, parent: QObject = None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        if max_threads > 0:
+            self.thread_pool.setMaxThreadCount(max_threads)
+        self.cache_limit = cache_limit_kb * 1024
+        self.cache_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, QPixmap]" = OrderedDict()
+        self._pending: Dict[str, Tuple[str, List[Callable]]] = {}
+        self._decoded.connect(self._on_decoded)
+        if QPixmapCache.cacheLimit() < cache_limit_kb:
+            QPixmapCache.setCacheLimit(cache_limit_kb)
+
+    @staticmethod
+    def _pixmap_bytes(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def cached(self, path: str, width: int = 0, height: int = 0) -> Optional[QPixmap]:
+        """查找缓存，未命中返回 None"""
+        return self._lookup(cache_key(path, width, height))
+
+    def _lookup(self, key: str) -> Optional[QPixmap]:
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            self._cache.move_to_end(key)
+            return pixmap
+        # 其他代码（或被本缓存淘汰后）仍留在 QPixmapCache 中的项
+        pixmap = QPixmap()
+        if QPixmapCache.find(key, pixmap):
+            self._store(key, pixmap)
+            return pixmap
+        return None
+
+    def _store(self, key: str, pixmap: QPixmap):
+        size = self._pixmap_bytes(pixmap)
+        if size > self.cache_limit:
+            return
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self.cache_bytes -= self._pixmap_bytes(old)
+        self._cache[key] = pixmap
+        self.cache_bytes += size
+        QPixmapCache.insert(key, pixmap)
+        self._evict()
+
+    def _evict(self):
+        while self.cache_bytes > self.cache_limit and self._cache:
+            key, pixmap = self._cache.popitem(last=False)
+            self.cache_bytes -= self._pixmap_bytes(pixmap)
+            QPixmapCache.remove(key)
+
+    def load(self, path: str, callback: Callable[[QPixmap], None], width: int = 0, height: int = 0) -> bool:
+        """
+        请求加载图片，返回是否命中缓存（命中时回调已经执行）。
+        """
+        key = cache_key(path, width, height)
+        pixmap = self._lookup(key)
+        if pixmap is not None:
+            self.hits += 1
+            callback(pixmap)
+            return True
+
+        self.misses += 1
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending[1].append(callback)
+            return False
+        self._pending[key] = (path, [callback])
+        self.thread_pool.start(_DecodeRunnable(self, key, path, width, height))
+        return False
+
+    def _on_decoded(self, key: str, image: QImage, error: str):
+        path, callbacks = self._pending.pop(key, ("", []))
+        if image.isNull():
+            pixmap = QPixmap()
+            self.failed.emit(path, error)
+        else:
+            pixmap = QPixmap.fromImage(image)
+            self._store(key, pixmap)
+            self.loaded.emit(key)
+        for callback in callbacks:
+            callback(pixmap)
+
+    def load_into_label(self, label: QLabel, path: str, width: int = 0, height: int = 0,
+                        placeholder: str = "") -> bool:
+        """
+        异步设置标签的图片。加载完成前显示 placeholder 文本；
+        同一个标签的后续请求会取代尚未完成的请求，标签被销毁后不再更新。
+        """
+        request = cache_key(path, width, height)
+        label.setProperty("pixmap_request", request)
+
+        def deliver(pixmap: QPixmap):
+            if not shiboken6.isValid(label) or label.property("pixmap_request") != request:
+                return
+            if pixmap.isNull():
+                label.setText(placeholder)
+            else:
+                label.setPixmap(pixmap)
+
+        hit = self.load(path, deliver, width, height)
+        if not hit and label.property("pixmap_request") == request:
+            label.setText(placeholder)
+        return hit
+
+    def set_cache_limit(self, cache_limit_kb: int):
+        self.cache_limit = cache_limit_kb * 1024
+        if QPixmapCache.cacheLimit() < cache_limit_kb:
+            QPixmapCache.setCacheLimit(cache_limit_kb)
+        self._evict()
+
+    def clear_cache(self):
+        for key in self._cache:
+            QPixmapCache.remove(key)
+        self._cache.clear()
+        self.cache_bytes = 0
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """等待所有解码结束（结果仍需事件循环投递）"""
+        return self.thread_pool.waitForDone(msecs)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._cache),
+            "bytes": self.cache_bytes,
+            "limit": self.cache_limit,
+            "hits": self.hits,
+            "misses": self.misses,
+            "pending": len(self._pending),
+        }
+
+
+_loader: Optional[PixmapLoader] = None
+
+
+def loader() -> PixmapLoader:
+    """共享的加载器，第一次使用时创建"""
+    global _loader
+    if _loader is None:
+        _loader = PixmapLoader()
+    return _loader
+
+
+def load_into_label(label: QLabel, path: str, width: int = 0, height: int = 0, placeholder: str = "") -> bool:
+    """使用共享加载器异步设置标签的图片"""
+    return loader().load_into_label(label, path, width, height, placeholder)
@@ -0,0 +1,240 @@
+"""
+限速的进度报告
+
+在紧凑的循环中逐项调用 QProgressBar.setValue，每次都要跨越一次 MoonBit/Python
+边界，还会请求重绘（QProgressBar 值变化时立即 repaint），即使显示的百分比没有变化。
+ProgressReporter：
+
+- advance(n) 只累加计数并和预先算好的下一个刻度的阈值比较；刻度为进度条上
+  可见的变化（默认为进度条宽度的像素数，至少 100 级），没有跨过阈值时直接返回
+- 刻度变化时最多每帧（interval_ms）更新一次进度条；循环阻塞事件循环时同步更新，
+  否则用单次定时器在帧末投递最后的值
+- throughput（每秒项数，指数平滑）和 eta_seconds（剩余秒数）可以随时读取
+
+计数状态放在普通的 Python 对象中（QObject 子类的属性访问要经过 shiboken，
+逐项调用时开销明显），信号由内部的 QObject 发出。
+只能在 GUI 线程中使用；工作线程的进度通过 Job.progress 信号排队到 GUI 线程
+（worker_pool.py 中 bind_progress_bar 使用本类）。
+"""
+
+import time
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QProgressBar
+
+
+class _ProgressSignals(QObject):
+    # 每次更新进度条后：(已完成, 总数)
+    updated = Signal(int, int)
+    finished = Signal()
+
+
+class ProgressReporter:
+    """
+    把高频的进度调用合并为每帧最多一次的进度条更新。
+    信号 updated(done, total) / finished() 通过同名属性访问。
+    """
+
+    # 吞吐量的指数平滑系数
+    SMOOTHING = 0.3
+
+    def __init__(self, progress_bar: Optional[QProgressBar] = None, total: int = 100,
+                 resolution: int = 0, interval_ms: int = 16, parent: Optional[QObject] = None):
+        """
+        Args:
+            progress_bar: 要更新的进度条，可以为 None（只统计进度和吞吐量）
+            total: 总项数
+            resolution: 可见刻度数，0 表示按进度条宽度（至少 100）
+            interval_ms: 两次更新进度条的最小间隔
+            parent: 内部 QObject（信号和定时器）的父对象
+        """
+        self.signals = _ProgressSignals(parent)
+        self.updated = self.signals.updated
+        self.finished = self.signals.finished
+        self.progress_bar = progress_bar
+        self.interval = interval_ms / 1000
+        self.done = 0
+        self.total = max(0, int(total))
+        self.resolution = resolution or max(100, progress_bar.width() if progress_bar is not None else 0)
+        self.updates = 0
+        self._step = -1
+        self._next = 0   # 刻度变化的下一个 done 值
+        self._shown = -1
+        self._started = time.perf_counter()
+        self._last_flush = 0.0
+        self._sample = (self._started, 0)
+        self._rate = 0.0
+        self._timer = QTimer(self.signals)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        if progress_bar is not None:
+            progress_bar.setRange(0, self.total)
+            progress_bar.setValue(0)
+
+    def advance(self, n: int = 1):
+        """完成 n 项"""
+        self.done += n
+        if self.done >= self._next:
+            self._step_changed()
+
+    def set_done(self, done: int, total: Optional[int] = None):
+        """直接设置已完成的项数（以及总数）"""
+        if total is not None and total != self.total:
+            self.set_total(total)
+        self.done = int(done)
+        self._step_changed()
+
+    def set_total(self, total: int):
+        self.total = max(0, int(total))
+        self._step = -1
+        if self.progress_bar is not None:
+            self.progress_bar.setMaximum(self.total)
+        self._step_changed()
+
+    def _step_changed(self):
+        """重新计算刻度和下一个阈值，刻度变化时安排更新"""
+        total, resolution = self.total, self.resolution
+        if total <= 0:
+            self._next = float("inf")
+            return
+        step = min(self.done, total) * resolution // total
+        # 刻度 step + 1 对应的最小 done：ceil((step + 1) * total / resolution)
+        self._next = -(-(step + 1) * total // resolution) if step < resolution else float("inf")
+        if step != self._step:
+            self._step = step
+            self._schedule()
+
+    def _schedule(self):
+        now = time.perf_counter()
+        remaining = self.interval - (now - self._last_flush)
+        if remaining <= 0:
+            # 循环阻塞事件循环时定时器不会触发，到了帧间隔就同步更新
+            self._timer.stop()
+            self.flush(now)
+        elif not self._timer.isActive():
+            self._timer.start(max(1, int(remaining * 1000)))
+
+    def flush(self, now: Optional[float] = None):
+        """立即把当前进度写入进度条"""
+        now = now or time.perf_counter()
+        self._update_rate(now)
+        self._last_flush = now
+        value = min(self.done, self.total)
+        if value == self._shown:
+            return
+        self._shown = value
+        self.updates += 1
+        if self.progress_bar is not None:
+            self.progress_bar.setValue(value)
+        self.updated.emit(value, self.total)
+
+    def finish(self):
+        """完成：写入最终值并发出 finished"""
+        self._timer.stop()
+        self.flush()
+        self.finished.emit()
+
+    def reset(self, total: Optional[int] = None):
+        self._timer.stop()
+        self.done = 0
+        self._step = -1
+        self._next = 0
+        self._shown = -1
+        self._started = time.perf_counter()
+        self._sample = (self._started, 0)
+        self._rate = 0.0
+        if total is not None:
+            self.set_total(total)
+        self.flush()
+
+    def _update_rate(self, now: float):
+        last_time, last_done = self._sample
+        if now - last_time < 0.05:
+            return
+        rate = (self.done - last_done) / (now - last_time)
+        self._rate = rate if self._rate == 0 else self._rate + self.SMOOTHING * (rate - self._rate)
+        self._sample = (now, self.done)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self._started
+
+    @property
+    def fraction(self) -> float:
+        return min(1.0, self.done / self.total) if self.total > 0 else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """每秒完成的项数（平滑后；样本不足时为平均值）"""
+        if self._rate > 0:
+            return self._rate
+        elapsed = self.elapsed_seconds
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def items_per_second(self) -> int:
+        return round(self.throughput)
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """预计剩余秒数，还无法估计时为 None"""
+        remaining = max(0, self.total - self.done)
+        if remaining == 0:
+            return 0.0
+        rate = self.throughput
+        return remaining / rate if rate > 0 else None
+
+    @property
+    def eta_ms(self) -> int:
+        """预计剩余毫秒数，还无法估计时为 -1"""
+        eta = self.eta_seconds
+        return -1 if eta is None else round(eta * 1000)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from PySide6.QtWidgets import QApplication
+
+    parser = argparse.ArgumentParser(description="逐项 setValue 与 ProgressReporter 的开销对比")
+    parser.add_argument("--items", type=int, default=200_000, help="循环的项数")
+    options = parser.parse_args()
+
+    app = QApplication([])
+    bar = QProgressBar()
+    bar.resize(400, 24)
+    bar.show()
+    app.processEvents()
+
+    def work(i):
+        return sum(range(200 + i % 100))
+
+    def run(mode):
+        bar.setRange(0, options.items)
+        reporter = ProgressReporter(bar, options.items) if mode == "reporter" else None
+        start = time.perf_counter()
+        for i in range(options.items):
+            work(i)
+            if mode == "set_value":
+                bar.setValue(i + 1)
+            elif mode == "reporter":
+                reporter.advance()
+        if reporter is not None:
+            reporter.finish()
+        return time.perf_counter() - start, reporter
+
+    baseline, _ = run("none")
+    direct, _ = run("set_value")
+    throttled, reporter = run("reporter")
+    print(json.dumps({
+        "items": options.items,
+        "no_progress_ms": round(baseline * 1000, 1),
+        "set_value_ms": round(direct * 1000, 1),
+        "reporter_ms": round(throttled * 1000, 1),
+        "set_value_overhead_pct": round((direct - baseline) / baseline * 100, 1),
+        "reporter_overhead_pct": round((throttled - baseline) / baseline * 100, 1),
+        "reporter_updates": reporter.updates,
+        "items_per_second": reporter.items_per_second,
+    }, indent=2))
@@ -1,6 +1,157 @@
-from PySide6.QtCore import QObject
+from typing import Any, Callable, List, Sequence
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
 from PySide6.QtWidgets import QPushButton, QLabel
 
+import lag_monitor
+
+
+class CounterModel(QObject):
+    """
+    计数器模型，整数状态保存在模型中，变化时渲染到标签上，
+    不再每次点击都从标签文本中解析数字。
+    """
+
+    valueChanged = Signal(int)
+
+    def __init__(self, label: QLabel, prefix: str = "", suffix: str = "", value: int = 0, step: int = 1, parent: QObject = None):
+        super().__init__(parent)
+        self.label = label
+        self.prefix = prefix
+        self.suffix = suffix
+        self.step = step
+        self._value = value
+
+    def value(self) -> int:
+        return self._value
+
+    def set_value(self, value: int):
+        """设置计数值，值变化时更新标签并发出 valueChanged。"""
+        if value == self._value:
+            return
+        self._value = value
+        self.render()
+        self.valueChanged.emit(value)
+
+    @Slot()
+    def increment(self):
+        """按 step 递增，可以直接连接到按钮的 clicked 信号。"""
+        self.set_value(self._value + self.step)
+
+    def render(self):
+        self.label.setText(f"{self.prefix}{self._value}{self.suffix}")
+
+    @staticmethod
+    def parse(text: str, prefix: str, suffix: str, default: int) -> int:
+        """
+        从 "前缀 + 数字 + 后缀" 形式的文本中解析数字，
+        格式不符时返回 default。
+        """
+        if text.startswith(prefix) and text.endswith(suffix) and len(text) >= len(prefix) + len(suffix):
+            value_str = text[len(prefix):len(text) - len(suffix)]
+            try:
+                return int(value_str)
+            except ValueError:
+                pass
+        return default
+
+
+class RateLimitedConnection(QObject):
+    """
+    限流的信号连接，用于滑块、输入框等连续发出信号的控件。
+
+    模式：
+    - throttle：最多每 interval_ms 投递一次（0 表示每帧一次），
+      第一次立即投递，间隔内的后续信号只保留最新一个，在间隔结束时投递
+    - debounce：信号停止 interval_ms 后才投递最新一个（尾沿）
+    - coalesce：同一轮事件循环内的信号合并，事件循环空闲时投递最新一个
+
+    delivered / dropped 统计已投递和被合并丢弃的信号数量。
+    """
+
+    THROTTLE = "throttle"
+    DEBOUNCE = "debounce"
+    COALESCE = "coalesce"
+
+    # 按帧限流时的间隔（约 60 fps）
+    FRAME_INTERVAL_MS = 16
+
+    def __init__(self, signal: Any, slot: Callable, mode: str, interval_ms: int = 0, parent: QObject = None):
+        super().__init__(parent)
+        if mode not in (self.THROTTLE, self.DEBOUNCE, self.COALESCE):
+            raise ValueError(f"未知的连接模式: {mode}")
+        if mode == self.THROTTLE and interval_ms <= 0:
+            interval_ms = self.FRAME_INTERVAL_MS
+        if mode == self.COALESCE:
+            interval_ms = 0
+
+        self.signal = signal
+        monitor = lag_monitor.monitor()
+        if monitor is not None:
+            slot = monitor.wrap(slot, f"{mode}[{getattr(slot, '__qualname__', repr(slot))}]")
+        self.slot = slot
+        self.mode = mode
+        self.delivered = 0
+        self.dropped = 0
+        self._pending = None   # 等待投递的最新参数
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_timeout)
+        signal.connect(self._on_signal)
+
+    def _on_signal(self, *args):
+        if self._pending is not None:
+            self.dropped += 1
+
+        if self.mode == self.THROTTLE and not self._timer.isActive():
+            # 前沿立即投递，开始一个限流间隔
+            self._pending = None
+            self._deliver(args)
+            self._timer.start()
+            return
+
+        self._pending = args
+        if self.mode == self.DEBOUNCE:
+            self._timer.start()
+        elif not self._timer.isActive():
+            self._timer.start()
+
+    def _on_timeout(self):
+        if self._pending is None:
+            return
+        args, self._pending = self._pending, None
+        self._deliver(args)
+        if self.mode == self.THROTTLE:
+            self._timer.start()
+
+    def _deliver(self, args: tuple):
+        self.delivered += 1
+        self.slot(*args)
+
+    def flush(self):
+        """立即投递等待中的信号"""
+        self._timer.stop()
+        if self._pending is not None:
+            args, self._pending = self._pending, None
+            self._deliver(args)
+
+    def close(self):
+        """断开连接，丢弃等待中的信号"""
+        self._timer.stop()
+        if self._pending is not None:
+            self._pending = None
+            self.dropped += 1
+        try:
+            self.signal.disconnect(self._on_signal)
+        except (RuntimeError, TypeError):
+            pass
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "delivered": self.delivered, "dropped": self.dropped}
+
+
 class SignalSlotManager(QObject):
     def __init__(self):
         super().__init__()
@@ -10,21 +161,71 @@ class SignalSlotManager(QObject):
         使用 lambda 函数连接按钮的 clicked 信号到标签的 setText 槽，
         当按钮被点击时，标签的文本将被更新为指定的文本。
         """
-        button.clicked.connect(lambda: label.setText(text))
+        slot = lambda: label.setText(text)
+        monitor = lag_monitor.monitor()
+        if monitor is not None:
+            slot = monitor.wrap(slot, f"connect_button_to_label[{button.text()}]")
+        button.clicked.connect(slot)
 
-    def connect_button_to_increment_label(self, button: QPushButton, label: QLabel, prefix: str, suffix: str, initial_value: int = 0):
+    def connect_button_to_increment_label(self, button: QPushButton, label: QLabel, prefix: str, suffix: str, initial_value: int = 0) -> CounterModel:
         """
-        使用 lambda 函数连接按钮的 clicked 信号到标签的 setText 槽，
-        当按钮被点击时，标签的文本将递增。
+        连接按钮的 clicked 信号到一个计数器模型，
+        当按钮被点击时，标签中的数字将递增。
+
+        标签当前的文本如果已经是 "前缀 + 数字 + 后缀" 的形式，
+        从这个数字开始计数，否则从 initial_value 开始。
+        """
+        value = CounterModel.parse(label.text(), prefix, suffix, initial_value)
+        counter = CounterModel(label, prefix, suffix, value, parent=self)
+        monitor = lag_monitor.monitor()
+        if monitor is None:
+            # 直接连接 @Slot 绑定方法，counter 销毁时 Qt 自动断开
+            button.clicked.connect(counter.increment)
+        else:
+            button.clicked.connect(monitor.wrap(
+                counter.increment, f"connect_button_to_increment_label[{button.text()}]"))
+        return counter
+
+    def connect_buttons_to_labels(self, buttons: Sequence[QPushButton], labels: Sequence[QLabel], texts: Sequence[str]):
+        """
+        批量连接：第 i 个按钮被点击时，第 i 个标签的文本被设置为 texts[i]。
+        """
+        if not len(buttons) == len(labels) == len(texts):
+            raise ValueError("buttons、labels 和 texts 的长度必须相同")
+        # 监视器未安装时不生成名称、不包装
+        monitor = lag_monitor.monitor()
+        for button, label, text in zip(buttons, labels, texts):
+            slot = lambda *_, label=label, text=text: label.setText(text)
+            if monitor is not None:
+                slot = monitor.wrap(slot, f"connect_buttons_to_labels[{button.text()}]")
+            button.clicked.connect(slot)
+
+    def connect_buttons_to_increment_labels(self, buttons: Sequence[QPushButton], labels: Sequence[QLabel], prefix: str, suffix: str, initial_value: int = 0) -> List[CounterModel]:
+        """
+        批量连接：第 i 个按钮递增第 i 个标签的计数器，
+        返回计数器模型列表。
+        """
+        if len(buttons) != len(labels):
+            raise ValueError("buttons 和 labels 的长度必须相同")
+        return [
+            self.connect_button_to_increment_label(button, label, prefix, suffix, initial_value)
+            for button, label in zip(buttons, labels)
+        ]
+
+    def connect_throttled(self, signal: Any, slot: Callable, interval_ms: int = 0) -> RateLimitedConnection:
+        """
+        限流连接：最多每 interval_ms 投递一次，0 表示每帧一次。
+        """
+        return RateLimitedConnection(signal, slot, RateLimitedConnection.THROTTLE, interval_ms, parent=self)
+
+    def connect_debounced(self, signal: Any, slot: Callable, interval_ms: int = 200) -> RateLimitedConnection:
+        """
+        防抖连接：信号停止 interval_ms 后投递最新一个。
         """
-        # 使用 lambda 函数递增标签中的数字
-        button.clicked.connect(lambda: self._increment_label(label, prefix, suffix, initial_value))
+        return RateLimitedConnection(signal, slot, RateLimitedConnection.DEBOUNCE, interval_ms, parent=self)
 
-    def _increment_label(self, label: QLabel, prefix: str, suffix: str, value: int):
+    def connect_coalesced(self, signal: Any, slot: Callable) -> RateLimitedConnection:
         """
-        内部方法，用于递增标签中的数字。
+        合并连接：同一轮事件循环内的信号只投递最新一个。
         """
-        value_str = label.text().lstrip(prefix).rstrip(suffix)
-        value_int = int(value_str) if value_str.isdigit() else value
-        value_int += 1
-        label.setText(f"{prefix}{value_int}{suffix}")
+        return RateLimitedConnection(signal, slot, RateLimitedConnection.COALESCE, parent=self)
@@ -0,0 +1,173 @@
+"""
+声明式界面构建器
+
+根据嵌套的 dict / JSON 描述在 Python 端一次构建整棵控件树，
+MoonBit 端只需跨越一次 FFI，而不是每个控件、每个属性各一次。
+
+描述格式：
+
+    {
+        "type": "QWidget",              # 类名（见 widget_factory）
+        "name": "root",                 # 可选，出现在返回的映射中
+        "args": ["文本"],               # 可选，构造参数（parent 自动传入）
+        "properties": {                 # 可选，key 对应 setXxx 方法
+            "geometry": [0, 0, 400, 300],   # 列表按位置参数展开
+            "styleSheet": "color: red;",
+            "objectName": "root"
+        },
+        "layout": {                     # 可选，控件的布局
+            "type": "QVBoxLayout",
+            "spacing": 10,
+            "contentsMargins": [10, 10, 10, 10],
+            "items": [
+                {"type": "QLabel", "name": "label", "args": ["Hello"]},
+                {"stretch": 1},
+                {"layout": {"type": "QHBoxLayout", "items": [...]}}
+            ]
+        },
+        "children": [...],              # 可选，不放进布局、只设置父控件的子控件
+        "connections": [                # 可选，在整棵树构建完成后连接
+            {"signal": "clicked", "target": "label",
+             "slot": "setText", "args": ["clicked"]},
+            {"signal": "clicked", "handler": "on_click"}
+        ]
+    }
+
+connections 中的 target 按名称引用树中的任意对象（可以在后面才出现），
+handler 引用 build() 传入的 handlers 中的 Python 可调用对象。
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from PySide6 import QtWidgets
+
+from widget_factory import factory
+
+
+# 布局属性，其余的 key（type / name / items）不是 setter
+_LAYOUT_KEYS = ("type", "name", "items")
+
+
+class UiBuildError(Exception):
+    """界面描述不合法"""
+
+
+class UiBuilder:
+    def __init__(self, handlers: Optional[Dict[str, Callable]] = None):
+        self.handlers = handlers or {}
+        self.objects: Dict[str, Any] = {}
+        self._connections: List[tuple] = []
+
+    def build(self, spec: Union[dict, str], parent: Any = None) -> Dict[str, Any]:
+        """
+        构建整棵控件树。
+
+        spec 可以是 dict 或 JSON 字符串。parent 是 QMainWindow 时
+        根控件被设置为其中央控件，否则作为根控件的父控件。
+
+        返回名称到对象的映射，根控件总是可以通过 "root" 访问。
+        """
+        if isinstance(spec, str):
+            spec = json.loads(spec)
+        if not isinstance(spec, dict):
+            raise UiBuildError("界面描述必须是一个对象")
+
+        if isinstance(parent, QtWidgets.QMainWindow):
+            root = self._build_widget(spec, None)
+            parent.setCentralWidget(root)
+        else:
+            root = self._build_widget(spec, parent)
+        self.objects.setdefault("root", root)
+
+        for source, connection in self._connections:
+            self._connect(source, connection)
+        self._connections.clear()
+        return self.objects
+
+    def _class(self, name: str) -> type:
+        cls = factory.class_for(name)
+        if cls is None:
+            raise UiBuildError(f"未知的控件类型: {name}")
+        return cls
+
+    def _register(self, spec: dict, obj: Any):
+        name = spec.get("name")
+        if name is not None:
+            if name in self.objects:
+                raise UiBuildError(f"重复的名称: {name}")
+            self.objects[name] = obj
+
+    def _apply_properties(self, obj: Any, properties: dict):
+        for key, value in properties.items():
+            setter = getattr(obj, "set" + key[:1].upper() + key[1:], None)
+            if setter is None:
+                raise UiBuildError(f"{type(obj).__name__} 没有属性 {key}")
+            if isinstance(value, list):
+                setter(*value)
+            else:
+                setter(value)
+
+    def _build_widget(self, spec: dict, parent: Any) -> Any:
+        if "type" not in spec:
+            raise UiBuildError(f"缺少 type: {spec!r}")
+        cls = self._class(spec["type"])
+        args = spec.get("args", [])
+        widget = cls(*args, parent) if parent is not None else cls(*args)
+        self._register(spec, widget)
+        self._apply_properties(widget, spec.get("properties", {}))
+
+        if "layout" in spec:
+            widget.setLayout(self._build_layout(spec["layout"], widget))
+        for child in spec.get("children", []):
+            self._build_widget(child, widget)
+        for connection in spec.get("connections", []):
+            self._connections.append((widget, connection))
+        return widget
+
+    def _build_layout(self, spec: dict, owner: Any) -> Any:
+        layout = self._class(spec.get("type", "QVBoxLayout"))()
+        self._register(spec, layout)
+        self._apply_properties(
+            layout, {k: v for k, v in spec.items() if k not in _LAYOUT_KEYS}
+        )
+        for item in spec.get("items", []):
+            stretch = item.get("stretch", 0)
+            if "layout" in item:
+                layout.addLayout(self._build_layout(item["layout"], owner), stretch)
+            elif "spacing" in item and "type" not in item:
+                layout.addSpacing(item["spacing"])
+            elif "type" in item:
+                layout.addWidget(self._build_widget(item, owner), stretch)
+            else:
+                layout.addStretch(stretch)
+        return layout
+
+    def _connect(self, source: Any, connection: dict):
+        signal = getattr(source, connection["signal"], None)
+        if signal is None:
+            raise UiBuildError(f"{type(source).__name__} 没有信号 {connection['signal']}")
+
+        if "handler" in connection:
+            handler = self.handlers.get(connection["handler"])
+            if handler is None:
+                raise UiBuildError(f"未知的处理函数: {connection['handler']}")
+            signal.connect(handler)
+            return
+
+        target = self.objects.get(connection.get("target"))
+        if target is None:
+            raise UiBuildError(f"未知的连接目标: {connection.get('target')}")
+        slot = getattr(target, connection["slot"])
+        args = connection.get("args")
+        if args is None:
+            signal.connect(slot)
+        else:
+            # 固定参数，忽略信号自身的参数
+            signal.connect(lambda *_, slot=slot, args=tuple(args): slot(*args))
+
+
+def build(spec: Union[dict, str], parent: Any = None,
+          handlers: Optional[Dict[str, Callable]] = None) -> Dict[str, Any]:
+    """构建控件树，返回名称到对象的映射。"""
+    return UiBuilder(handlers).build(spec, parent)
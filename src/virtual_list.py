@@ -0,0 +1,231 @@
+"""
+虚拟化的列表和下拉框
+
+QComboBox.addItems 为每一项在控件内部创建一个 QStandardItem，
+十万到百万项时内存和耗时都不可接受。这里的控件由模型驱动：
+
+- StringTable：把所有字符串存成一块 UTF-8 字节加一个偏移数组，
+  每项只有 8 字节的额外开销，访问时才解码
+- SequenceListModel：包装任意序列，通过 canFetchMore / fetchMore 分页暴露行，
+  data() 只为视图实际请求的（可见的）行生成字符串
+- VirtualListView / VirtualComboBox：使用统一行高，不逐行测量尺寸
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Iterable, Optional, Sequence
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+from PySide6.QtWidgets import QComboBox, QListView, QWidget
+
+
+class StringTable(Sequence):
+    """
+    只读的紧凑字符串序列。
+
+    第 i 项是 blob[offsets[i] : offsets[i + 1] - gap]，gap 是项之间
+    分隔符的字节数（由 from_text 构建时分隔符留在 blob 中，省去一次复制）。
+    """
+
+    __slots__ = ("_blob", "_offsets", "_gap")
+
+    def __init__(self, strings: Iterable[str] = ()):
+        encoded = [s.encode("utf-8") for s in strings]
+        self._blob = b"".join(encoded)
+        self._offsets = array("Q", accumulate(map(len, encoded), initial=0))
+        self._gap = 0
+
+    @classmethod
+    def from_text(cls, text: str, separator: str = "\n") -> "StringTable":
+        """
+        从用分隔符连接的文本构建。MoonBit 端只需传一个字符串，
+        不必为每一项创建一个 Python 对象。空文本得到空表。
+        """
+        table = cls()
+        if not text:
+            return table
+        sep = separator.encode("utf-8")
+        gap = len(sep)
+        blob = text.encode("utf-8")
+        lengths = map(len, blob.split(sep))
+        table._offsets = array("Q", accumulate(map(gap.__add__, lengths), initial=0))
+        table._blob = blob
+        table._gap = gap
+        return table
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StringTable 索引越界")
+        offsets = self._offsets
+        return self._blob[offsets[index]:offsets[index + 1] - self._gap].decode("utf-8")
+
+    def index_of(self, text: str, start: int = 0) -> int:
+        """
+        查找完全相等的项，找不到返回 -1。
+
+        不逐项解码：在 blob 中用 bytes.find 搜索编码后的文本，命中位置用二分查找
+        映射到行，只接受恰好从行首开始、在行尾结束的命中。
+        """
+        count = len(self)
+        start = max(start, 0)
+        if start >= count:
+            return -1
+        needle = text.encode("utf-8")
+        blob, offsets, gap = self._blob, self._offsets, self._gap
+        pos = offsets[start]
+        while True:
+            hit = blob.find(needle, pos)
+            if hit < 0:
+                return -1
+            if needle:
+                row = bisect_right(offsets, hit) - 1
+            else:
+                # 从同一位置开始的多行中只有前面的可能是空行
+                row = max(bisect_left(offsets, hit), start)
+            if row >= count:
+                return -1
+            if hit == offsets[row] and hit + len(needle) == offsets[row + 1] - gap:
+                return row
+            # 有效的命中只能从行首开始，从下一行继续
+            pos = offsets[row + 1]
+
+    def nbytes(self) -> int:
+        """占用的字节数（数据加偏移数组）"""
+        return len(self._blob) + self._offsets.itemsize * len(self._offsets)
+
+
+class SequenceListModel(QAbstractListModel):
+    """
+    由序列驱动的只读列表模型。
+
+    初始只暴露 page_size 行，视图滚动到底部时通过 fetchMore 再暴露一页；
+    page_size 为 0 时一次暴露全部行（统一行高的视图同样只绘制可见行）。
+    """
+
+    # 新暴露的行数变化（已加载行数，总行数）
+    loadedChanged = Signal(int, int)
+
+    def __init__(self, sequence: Sequence = (), page_size: int = 1000, parent: Optional[Any] = None):
+        super().__init__(parent)
+        self.page_size = page_size
+        self._sequence: Sequence = ()
+        self._loaded = 0
+        self.set_sequence(sequence)
+
+    def set_sequence(self, sequence: Sequence):
+        """替换数据，重置模型"""
+        self.beginResetModel()
+        self._sequence = sequence
+        total = len(sequence)
+        self._loaded = total if self.page_size <= 0 else min(total, self.page_size)
+        self.endResetModel()
+        self.loadedChanged.emit(self._loaded, total)
+
+    def sequence(self) -> Sequence:
+        return self._sequence
+
+    def total_count(self) -> int:
+        return len(self._sequence)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole):
+            row = index.row()
+            if index.isValid() and 0 <= row < self._loaded:
+                return str(self._sequence[row])
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self._sequence)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        if parent.isValid():
+            return
+        self.ensure_loaded(self._loaded + max(self.page_size, 1) - 1)
+
+    def ensure_loaded(self, row: int):
+        """保证第 row 行已经暴露（例如在设置当前项之前）"""
+        total = len(self._sequence)
+        target = min(total, row + 1)
+        if target <= self._loaded:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, target - 1)
+        self._loaded = target
+        self.endInsertRows()
+        self.loadedChanged.emit(self._loaded, total)
+
+
+def _as_sequence(items: Any, separator: str = "\n") -> Sequence:
+    if isinstance(items, str):
+        return StringTable.from_text(items, separator)
+    if isinstance(items, (StringTable, range)):
+        return items
+    return StringTable(items)
+
+
+class VirtualListView(QListView):
+    def __init__(self, parent: Optional[QWidget] = None, page_size: int = 1000):
+        super().__init__(parent)
+        self.setUniformItemSizes(True)
+        self.list_model = SequenceListModel(page_size=page_size, parent=self)
+        self.setModel(self.list_model)
+
+    def set_items(self, items: Any, separator: str = "\n"):
+        """
+        设置数据。items 可以是序列、可迭代的字符串，
+        或用 separator 连接的单个字符串。
+        """
+        self.list_model.set_sequence(_as_sequence(items, separator))
+
+    def current_row(self) -> int:
+        return self.currentIndex().row()
+
+    def set_current_row(self, row: int):
+        self.list_model.ensure_loaded(row)
+        index = self.list_model.index(row, 0)
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+
+
+class VirtualComboBox(QComboBox):
+    def __init__(self, parent: Optional[QWidget] = None, page_size: int = 1000):
+        super().__init__(parent)
+        self.list_model = SequenceListModel(page_size=page_size, parent=self)
+        self.setModel(self.list_model)
+        view = QListView(self)
+        view.setUniformItemSizes(True)
+        self.setView(view)
+        # 弹出窗口的宽度不再根据所有项计算
+        self.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        self.setMinimumContentsLength(20)
+
+    def set_items(self, items: Any, separator: str = "\n"):
+        """参数同 VirtualListView.set_items"""
+        self.list_model.set_sequence(_as_sequence(items, separator))
+
+    def total_count(self) -> int:
+        return self.list_model.total_count()
+
+    def set_current_row(self, row: int):
+        self.list_model.ensure_loaded(row)
+        self.setCurrentIndex(row)
+
+    def find_item(self, text: str) -> int:
+        """在全部数据（包括尚未暴露的行）中查找，找不到返回 -1"""
+        sequence = self.list_model.sequence()
+        if isinstance(sequence, StringTable):
+            return sequence.index_of(text)
+        try:
+            return list(sequence).index(text)
+        except ValueError:
+            return -1
@@ -0,0 +1,158 @@
+"""
+控件类和方法的查找缓存
+
+MoonBit 绑定的构造函数每次都 pyimport 模块再按名称 get_attr 类，
+每次方法调用也重新按名称取绑定方法。这里集中缓存：
+
+- 类表：类名 -> 类，按顺序在 PySide6 的 QtWidgets / QtGui / QtCore 中查找，
+  本项目的自定义控件（VirtualListView、LogView 等）按需导入所在模块
+- 方法表：(类型, 方法名) -> 未绑定的方法，调用时把对象作为第一个参数传入，
+  不再每次创建绑定方法；批量执行器（batch_executor.py）共用这张表
+- prewarm()：启动时一次导入并解析常用的类和方法，
+  之后第一次构建控件时不再有查找开销
+
+MoonBit 端在 widget_factory.mbt 中另外缓存类的句柄，构造函数不再经过 pyimport。
+"""
+
+import importlib
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+# 按顺序查找类的模块
+MODULES = ("PySide6.QtWidgets", "PySide6.QtGui", "PySide6.QtCore")
+
+# 自定义控件：类名 -> 模块
+CUSTOM_CLASSES = {
+    "VirtualListView": "virtual_list",
+    "VirtualComboBox": "virtual_list",
+    "LogView": "log_view",
+    "LazyTabWidget": "lazy_tab_widget",
+}
+
+# prewarm 默认解析的类和方法（MoonBit 绑定中使用的）
+_WIDGET_METHODS = ("setGeometry", "setStyleSheet", "setEnabled", "show", "hide", "setVisible",
+                   "isVisible", "deleteLater", "setFont", "setToolTip")
+PREWARM = {
+    "QApplication": ("exec", "setApplicationName", "setApplicationVersion", "setOrganizationName"),
+    "QMainWindow": ("setWindowTitle", "setCentralWidget", "resize") + _WIDGET_METHODS,
+    "QWidget": _WIDGET_METHODS + ("setLayout",),
+    "QLabel": _WIDGET_METHODS + ("setText", "text", "setPixmap", "setAlignment", "setWordWrap"),
+    "QPushButton": _WIDGET_METHODS + ("setText", "text"),
+    "QLineEdit": _WIDGET_METHODS + ("setText", "text", "setPlaceholderText"),
+    "QTextEdit": _WIDGET_METHODS + ("setPlainText", "toPlainText", "setHtml"),
+    "QTextBrowser": _WIDGET_METHODS + ("setPlainText", "setHtml", "setOpenExternalLinks"),
+    "QComboBox": _WIDGET_METHODS + ("addItem", "addItems", "setCurrentIndex", "currentIndex", "currentText"),
+    "QCheckBox": _WIDGET_METHODS + ("setChecked", "isChecked", "setText"),
+    "QRadioButton": _WIDGET_METHODS + ("setChecked", "isChecked", "setText"),
+    "QSlider": _WIDGET_METHODS + ("setRange", "setValue", "value", "setOrientation"),
+    "QProgressBar": _WIDGET_METHODS + ("setRange", "setValue", "value", "setMaximum", "setMinimum"),
+    "QFrame": _WIDGET_METHODS + ("setFrameShape", "setFrameShadow"),
+    "QScrollArea": _WIDGET_METHODS + ("setWidget", "setWidgetResizable"),
+    "QTabWidget": _WIDGET_METHODS + ("addTab", "setCurrentIndex", "currentIndex"),
+    "QVBoxLayout": ("addWidget", "addLayout", "setSpacing", "setContentsMargins"),
+    "QHBoxLayout": ("addWidget", "addLayout", "setSpacing", "setContentsMargins"),
+    "QPixmap": ("scaled",),
+}
+
+
+class MethodTable:
+    """按 (类型, 方法名) 缓存的未绑定方法"""
+
+    def __init__(self):
+        self._methods: Dict[Tuple[type, str], Callable] = {}
+
+    def resolve(self, cls: type, name: str) -> Optional[Callable]:
+        """在类上查找方法并缓存，找不到或不可调用时返回 None"""
+        key = (cls, name)
+        method = self._methods.get(key)
+        if method is None:
+            method = getattr(cls, name, None)
+            if not callable(method):
+                return None
+            self._methods[key] = method
+        return method
+
+    def method(self, target: Any, name: str) -> Callable:
+        """
+        返回以对象为第一个参数调用的方法。
+        类上找不到（例如实例属性）时返回包装了绑定方法的函数，不缓存。
+        """
+        method = self._methods.get((type(target), name))
+        if method is not None:
+            return method
+        method = self.resolve(type(target), name)
+        if method is None:
+            bound = getattr(target, name)
+            return lambda _target, *args: bound(*args)
+        return method
+
+    def clear(self):
+        self._methods.clear()
+
+    def __len__(self) -> int:
+        return len(self._methods)
+
+
+class WidgetFactory:
+    def __init__(self, modules: Iterable[str] = MODULES, custom: Optional[Dict[str, str]] = None):
+        self.modules = tuple(modules)
+        self.custom = dict(CUSTOM_CLASSES if custom is None else custom)
+        self.methods = MethodTable()
+        self._classes: Dict[str, type] = {}
+
+    def class_for(self, name: str) -> Optional[type]:
+        """按名称查找类并缓存，找不到时返回 None"""
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+        module_names = (self.custom[name],) if name in self.custom else self.modules
+        for module_name in module_names:
+            cls = getattr(importlib.import_module(module_name), name, None)
+            if isinstance(cls, type):
+                self._classes[name] = cls
+                return cls
+        return None
+
+    def create(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        """按类名创建对象"""
+        cls = self.class_for(name)
+        if cls is None:
+            raise LookupError(f"未知的类: {name}")
+        return cls(*args, **kwargs)
+
+    def create_tuple(self, name: str, args: tuple) -> Any:
+        """参数以元组传入的 create，供 MoonBit 端调用"""
+        return self.create(name, *args)
+
+    def call(self, target: Any, name: str, *args: Any) -> Any:
+        """通过方法表调用对象的方法"""
+        return self.methods.method(target, name)(target, *args)
+
+    def prewarm(self, classes: Optional[Dict[str, Iterable[str]]] = None) -> int:
+        """
+        导入模块并解析类和方法，返回解析成功的类数量。
+
+        找不到的类和方法直接跳过（不同 PySide6 版本之间可能有差异）。
+        """
+        classes = PREWARM if classes is None else classes
+        resolved = 0
+        for name, methods in classes.items():
+            cls = self.class_for(name)
+            if cls is None:
+                continue
+            resolved += 1
+            for method in methods:
+                self.methods.resolve(cls, method)
+        return resolved
+
+    def stats(self) -> dict:
+        return {"classes": len(self._classes), "methods": len(self.methods)}
+
+
+# 进程级共享的工厂
+factory = WidgetFactory()
+
+
+def prewarm(classes: Optional[Dict[str, Iterable[str]]] = None) -> int:
+    """使用共享工厂预热，返回解析成功的类数量"""
+    return factory.prewarm(classes)
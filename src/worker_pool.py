@@ -0,0 +1,238 @@
+"""
+后台任务池
+
+任务在 QThreadPool 的工作线程中运行（CPU 密集的纯 Python 任务可以选择
+进程池）。工作线程不能直接操作控件：进度、结果和错误都通过 Job 上的
+信号发出，Job 在 GUI 线程中创建，跨线程发出的信号自动排队到 GUI 线程执行。
+
+线程任务的函数签名为 fn(job, *args)，通过 job.report_progress(value)
+报告进度，长时间运行时应定期检查 job.is_cancelled()。
+进程任务的函数签名为 fn(*args)，必须可以被 pickle，只在开始和结束时报告进度。
+"""
+
+import itertools
+import threading
+import traceback
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtWidgets import QProgressBar
+
+from progress_reporter import ProgressReporter
+
+
+class Job(QObject):
+    """
+    一个已提交的任务。
+
+    信号（总是在 GUI 线程中处理）：
+    - started()
+    - progress(value, maximum)
+    - result(object)
+    - error(str)：异常的 traceback 文本
+    - cancelled()
+    - finished()：无论成功、失败还是取消，最后都会发出
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    started = Signal()
+    progress = Signal(int, int)
+    result = Signal(object)
+    error = Signal(str)
+    cancelled = Signal()
+    finished = Signal()
+
+    def __init__(self, job_id: int, maximum: int = 100, parent: QObject = None):
+        super().__init__(parent)
+        self.id = job_id
+        self.maximum = maximum
+        self.state = self.PENDING
+        self.value = None
+        self._cancel_event = threading.Event()
+        self._last_progress = None
+        self._future = None   # 进程任务的 Future
+
+    def is_cancelled(self) -> bool:
+        """任务函数应定期检查，返回 True 时尽快退出"""
+        return self._cancel_event.is_set()
+
+    def is_done(self) -> bool:
+        return self.state in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def cancel(self):
+        """
+        请求取消。尚未开始的任务不会运行；正在运行的线程任务需要自己
+        检查 is_cancelled()。
+        """
+        self._cancel_event.set()
+        if self._future is not None:
+            self._future.cancel()
+
+    def report_progress(self, value: int, maximum: Optional[int] = None):
+        """
+        在工作线程中报告进度，值没有变化时不发信号，
+        避免逐项报告时淹没 GUI 线程的事件队列。
+        """
+        if maximum is not None:
+            self.maximum = maximum
+        current = (int(value), int(self.maximum))
+        if current != self._last_progress:
+            self._last_progress = current
+            self.progress.emit(*current)
+
+    def bind_progress_bar(self, progress_bar: QProgressBar) -> ProgressReporter:
+        """
+        把进度绑定到进度条（排队连接，在 GUI 线程中更新），
+        进度条最多每帧更新一次，见 progress_reporter.py
+        """
+        reporter = ProgressReporter(progress_bar, self.maximum, parent=self)
+        self.progress_reporter = reporter   # 保持引用，连接不会因为 reporter 被回收而断开
+        self.progress.connect(reporter.set_done)
+        self.finished.connect(reporter.finish)
+        return reporter
+
+
+class _JobRunnable(QRunnable):
+    def __init__(self, job: Job, fn: Callable, args: tuple, process_pool: Optional[ProcessPoolExecutor]):
+        super().__init__()
+        self.job = job
+        self.fn = fn
+        self.args = args
+        self.process_pool = process_pool
+
+    def run(self):
+        job = self.job
+        if job.is_cancelled():
+            self._finish(Job.CANCELLED)
+            return
+        job.state = Job.RUNNING
+        job.started.emit()
+        try:
+            if self.process_pool is None:
+                value = self.fn(job, *self.args)
+                if not job.is_cancelled():
+                    job.report_progress(job.maximum)
+            else:
+                job.report_progress(0)
+                job._future = self.process_pool.submit(self.fn, *self.args)
+                if job.is_cancelled():
+                    job._future.cancel()
+                value = job._future.result()
+                job.report_progress(job.maximum)
+        except CancelledError:
+            self._finish(Job.CANCELLED)
+            return
+        except Exception:
+            self._finish(Job.FAILED, traceback.format_exc())
+            return
+
+        if job.is_cancelled():
+            self._finish(Job.CANCELLED)
+            return
+        job.value = value
+        job.state = Job.DONE
+        job.result.emit(value)
+        job.finished.emit()
+
+    def _finish(self, state: str, message: str = ""):
+        job = self.job
+        job.state = state
+        if state == Job.FAILED:
+            job.error.emit(message)
+        else:
+            job.cancelled.emit()
+        job.finished.emit()
+
+
+class WorkerPool(QObject):
+    def __init__(self, max_threads: int = 0, max_processes: int = 0, parent: QObject = None):
+        """
+        max_threads 为 0 时使用 QThreadPool 的默认值（CPU 核数）；
+        进程池在第一次提交进程任务时才创建，max_processes 为 0 时使用 CPU 核数。
+        """
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        if max_threads > 0:
+            self.thread_pool.setMaxThreadCount(max_threads)
+        self.max_processes = max_processes
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._ids = itertools.count(1)
+        self.jobs: Dict[int, Job] = {}
+
+    def _process_executor(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(self.max_processes or None)
+        return self._process_pool
+
+    def submit(self, fn: Callable, *args: Any, on_result: Callable = None, on_error: Callable = None,
+               on_progress: Callable = None, progress_bar: QProgressBar = None,
+               maximum: int = 100, use_process: bool = False) -> Job:
+        """
+        提交任务，必须在 GUI 线程中调用。
+
+        回调通过排队连接在 GUI 线程中执行，可以安全地操作控件。
+        """
+        job = Job(next(self._ids), maximum, parent=self)
+        self.jobs[job.id] = job
+        if on_result is not None:
+            job.result.connect(on_result)
+        if on_error is not None:
+            job.error.connect(on_error)
+        if on_progress is not None:
+            job.progress.connect(on_progress)
+        if progress_bar is not None:
+            job.bind_progress_bar(progress_bar)
+        job.finished.connect(lambda: self._forget(job))
+
+        process_pool = self._process_executor() if use_process else None
+        self.thread_pool.start(_JobRunnable(job, fn, args, process_pool))
+        return job
+
+    def submit_process(self, fn: Callable, *args: Any, **kwargs: Any) -> Job:
+        """提交进程任务，参数同 submit"""
+        return self.submit(fn, *args, use_process=True, **kwargs)
+
+    def submit_tuple(self, fn: Callable, args: tuple, use_process: bool = False, **kwargs: Any) -> Job:
+        """参数以元组传入的 submit，供 MoonBit 端调用"""
+        return self.submit(fn, *args, use_process=use_process, **kwargs)
+
+    def _forget(self, job: Job):
+        self.jobs.pop(job.id, None)
+        job.deleteLater()
+
+    def job(self, job_id: int) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def cancel_all(self):
+        for job in list(self.jobs.values()):
+            job.cancel()
+
+    def active_count(self) -> int:
+        return len(self.jobs)
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """等待所有线程任务结束（排队的信号仍需事件循环处理）"""
+        return self.thread_pool.waitForDone(msecs)
+
+    def shutdown(self, wait: bool = True):
+        """取消所有任务并关闭进程池"""
+        self.cancel_all()
+        if wait:
+            self.thread_pool.waitForDone()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
+            self._process_pool = None
+